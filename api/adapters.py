@@ -0,0 +1,303 @@
+import os
+import socket
+import ssl
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError
+from urllib3.util.connection import allowed_gai_family
+from urllib3.util.ssl_ import is_ipaddress
+from urllib3.util.wait import wait_for_read
+
+from config.settings import Settings
+from utils.logger import logger
+
+
+class ConnectionStats:
+    FIELDS = (
+        "requests",
+        "connections_opened",
+        "warmed_connections",
+        "dns_lookups",
+        "dns_cache_hits",
+        "tls_full_handshakes",
+        "tls_resumed_handshakes",
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters = dict.fromkeys(self.FIELDS, 0)
+
+    def increment(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += value
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            counters = dict(self._counters)
+        counters["reused_connections"] = max(
+            counters["requests"] - counters["connections_opened"], 0
+        )
+        return counters
+
+
+connection_stats = ConnectionStats()
+
+
+class DNSCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+
+    def resolve(self, host: str, port: int) -> Optional[List[str]]:
+        ttl = Settings.DNS_CACHE_TTL
+        if ttl <= 0 or is_ipaddress(host):
+            return None
+
+        key = (host, port)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            connection_stats.increment("dns_cache_hits")
+            return list(entry[1])
+
+        try:
+            addresses = socket.getaddrinfo(
+                host, port, allowed_gai_family(), socket.SOCK_STREAM
+            )
+        except OSError:
+            return None
+        connection_stats.increment("dns_lookups")
+        if not addresses:
+            return None
+
+        addresses = list(dict.fromkeys(address[4][0] for address in addresses))
+        with self._lock:
+            self._entries[key] = (now + ttl, addresses)
+        return list(addresses)
+
+    def prefer(self, host: str, port: int, address: str) -> None:
+        with self._lock:
+            entry = self._entries.get((host, port))
+            if entry is not None and entry[1][0] != address and address in entry[1]:
+                addresses = [address] + [a for a in entry[1] if a != address]
+                self._entries[(host, port)] = (entry[0], addresses)
+
+    def invalidate(self, host: str, port: int) -> None:
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+dns_cache = DNSCache()
+
+
+class SessionReusingSSLContext(ssl.SSLContext):
+    def __init__(self, protocol: int = ssl.PROTOCOL_TLS_CLIENT):
+        super().__init__()
+        self._sessions: Dict[str, ssl.SSLSession] = {}
+        self._sessions_lock = threading.Lock()
+
+    def wrap_socket(
+        self,
+        sock,
+        server_side=False,
+        do_handshake_on_connect=True,
+        suppress_ragged_eofs=True,
+        server_hostname=None,
+        session=None,
+    ):
+        if session is None and server_hostname is not None:
+            with self._sessions_lock:
+                session = self._sessions.get(server_hostname)
+
+        ssl_sock = super().wrap_socket(
+            sock,
+            server_side=server_side,
+            do_handshake_on_connect=do_handshake_on_connect,
+            suppress_ragged_eofs=suppress_ragged_eofs,
+            server_hostname=server_hostname,
+            session=session,
+        )
+        if not server_side and do_handshake_on_connect:
+            connection_stats.increment(
+                "tls_resumed_handshakes"
+                if ssl_sock.session_reused
+                else "tls_full_handshakes"
+            )
+            self.remember_session(ssl_sock, server_hostname)
+        return ssl_sock
+
+    def remember_session(self, ssl_sock, server_hostname: Optional[str]) -> None:
+        session = getattr(ssl_sock, "session", None)
+        if server_hostname and session is not None and session.has_ticket:
+            with self._sessions_lock:
+                self._sessions[server_hostname] = session
+
+
+_ssl_contexts: Dict[str, SessionReusingSSLContext] = {}
+_ssl_contexts_lock = threading.Lock()
+
+
+def get_session_context(ca_bundle: Optional[str] = None) -> SessionReusingSSLContext:
+    ca_bundle = ca_bundle or requests.certs.where()
+    with _ssl_contexts_lock:
+        context = _ssl_contexts.get(ca_bundle)
+        if context is None:
+            context = SessionReusingSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+            context.minimum_version = ssl.TLSVersion.TLSv1_2
+            context.options |= ssl.OP_NO_COMPRESSION
+            if os.path.isdir(ca_bundle):
+                context.load_verify_locations(capath=ca_bundle)
+            else:
+                context.load_verify_locations(cafile=ca_bundle)
+            _ssl_contexts[ca_bundle] = context
+    return context
+
+
+class _TunedConnectionMixin:
+    def _new_conn(self) -> socket.socket:
+        host = self._dns_host
+        addresses = dns_cache.resolve(host, self.port)
+        if addresses is None:
+            sock = super()._new_conn()
+        else:
+            sock = self._connect_any(host, addresses)
+
+        connection_stats.increment("connections_opened")
+        return sock
+
+    def _connect_any(self, host: str, addresses: List[str]) -> socket.socket:
+        # Like urllib3's create_connection: try every resolved address in order,
+        # so a dual-stack host still connects when its first address refuses
+        error = None
+        try:
+            for address in addresses:
+                self._dns_host = address
+                try:
+                    sock = super()._new_conn()
+                except ConnectTimeoutError as e:
+                    error = e
+                    continue
+                dns_cache.prefer(host, self.port, address)
+                return sock
+        finally:
+            self._dns_host = host
+        dns_cache.invalidate(host, self.port)
+        raise error
+
+    def request(self, *args, **kwargs) -> None:
+        connection_stats.increment("requests")
+        return super().request(*args, **kwargs)
+
+
+class TunedHTTPConnection(_TunedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TunedHTTPSConnection(_TunedConnectionMixin, HTTPSConnection):
+    @property
+    def is_connected(self) -> bool:
+        if self.sock is None:
+            return False
+        if not wait_for_read(self.sock, timeout=0.0):
+            return True
+        if not isinstance(self.sock, ssl.SSLSocket):
+            return False
+
+        timeout = self.sock.gettimeout()
+        try:
+            self.sock.settimeout(0.0)
+            self.sock.recv(1)
+            return False
+        except ssl.SSLWantReadError:
+            if isinstance(self.ssl_context, SessionReusingSSLContext):
+                self.ssl_context.remember_session(
+                    self.sock, self.server_hostname or self.host
+                )
+            return True
+        except OSError:
+            return False
+        finally:
+            self.sock.settimeout(timeout)
+
+    def getresponse(self, *args, **kwargs):
+        response = super().getresponse(*args, **kwargs)
+        if isinstance(self.ssl_context, SessionReusingSSLContext):
+            self.ssl_context.remember_session(
+                self.sock, self.server_hostname or self.host
+            )
+        return response
+
+
+class TunedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TunedHTTPConnection
+
+
+class TunedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TunedHTTPSConnection
+
+
+class TunedHTTPAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TunedHTTPConnectionPool,
+            "https": TunedHTTPSConnectionPool,
+        }
+
+    def build_connection_pool_key_attributes(self, request, verify, cert=None):
+        host_params, pool_kwargs = super().build_connection_pool_key_attributes(
+            request, verify, cert
+        )
+        if (
+            Settings.TLS_SESSION_REUSE
+            and host_params["scheme"] == "https"
+            and verify is not False
+            and cert is None
+        ):
+            ca_certs = pool_kwargs.pop("ca_certs", None)
+            ca_cert_dir = pool_kwargs.pop("ca_cert_dir", None)
+            pool_kwargs["ssl_context"] = get_session_context(ca_certs or ca_cert_dir)
+        return host_params, pool_kwargs
+
+    def cert_verify(self, conn, url, verify, cert) -> None:
+        super().cert_verify(conn, url, verify, cert)
+        ssl_context = getattr(conn, "conn_kw", {}).get("ssl_context")
+        if isinstance(ssl_context, SessionReusingSSLContext):
+            conn.ca_certs = None
+            conn.ca_cert_dir = None
+
+    def warm_up(self, url: str, verify, count: int) -> int:
+        request = requests.Request("GET", url).prepare()
+        pool = self.get_connection_with_tls_context(request, verify)
+        self.cert_verify(pool, url, verify, None)
+
+        connections = []
+        try:
+            for _ in range(min(count, self._pool_maxsize)):
+                connection = pool._get_conn()
+                connections.append(connection)
+                connection.connect()
+        except Exception as e:
+            logger.warning(f"Connection warm-up to {url} failed: {str(e)}")
+        finally:
+            for connection in connections:
+                pool._put_conn(connection)
+
+        warmed = sum(1 for connection in connections if connection.sock is not None)
+        connection_stats.increment("warmed_connections", warmed)
+        return warmed
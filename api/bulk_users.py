@@ -0,0 +1,151 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import requests
+
+from api.client import APIClient
+from config.settings import Settings
+from utils.logger import logger
+from utils.retries import retry_until_condition
+
+BULK_ENDPOINTS = ("/createWithList", "/createWithArray")
+
+
+class BulkCreateResult:
+    def __init__(self, users: Sequence[Dict[str, Any]]):
+        self.requested = [user["username"] for user in users]
+        self.created: List[str] = []
+        self.not_visible: List[str] = []
+        self.failed: List[str] = []
+
+    @property
+    def all_created(self) -> bool:
+        return len(self.created) == len(self.requested)
+
+    def __repr__(self) -> str:
+        return (
+            f"BulkCreateResult(requested={len(self.requested)}, "
+            f"created={len(self.created)}, not_visible={len(self.not_visible)}, "
+            f"failed={len(self.failed)})"
+        )
+
+
+def chunked(items: Sequence[Any], size: int) -> List[Sequence[Any]]:
+    if size < 1:
+        raise ValueError(f"Chunk size must be positive, got {size}")
+    return [items[start : start + size] for start in range(0, len(items), size)]
+
+
+def _submit_chunk(
+    user_client: APIClient, endpoint: str, chunk: Sequence[Dict[str, Any]]
+) -> bool:
+    try:
+        response = user_client.post(endpoint, json_data=list(chunk))
+    except requests.RequestException as e:
+        logger.warning(f"Bulk create of {len(chunk)} users failed: {str(e)}")
+        return False
+    if response.status_code != 200:
+        logger.warning(
+            f"Bulk create of {len(chunk)} users failed: {response.status_code} {response.text[:200]}"
+        )
+        return False
+    return True
+
+
+def _is_visible(user_client: APIClient, user: Dict[str, Any]) -> bool:
+    try:
+        response = user_client.get(f"/{user['username']}")
+        if response.status_code != 200:
+            return False
+        return response.json().get("id") == user.get("id")
+    except (requests.RequestException, ValueError):
+        return False
+
+
+def create_users_bulk(
+    user_client: APIClient,
+    users: Sequence[Dict[str, Any]],
+    chunk_size: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    endpoint: str = "/createWithList",
+    verify: bool = True,
+    max_retries: Optional[int] = None,
+) -> BulkCreateResult:
+    if endpoint not in BULK_ENDPOINTS:
+        raise ValueError(f"Endpoint must be one of {BULK_ENDPOINTS}, got {endpoint}")
+    chunk_size = chunk_size or Settings.BULK_CHUNK_SIZE
+    concurrency = concurrency or Settings.BULK_CONCURRENCY
+
+    users = list(users)
+    result = BulkCreateResult(users)
+    chunks = chunked(users, chunk_size)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        submitted = list(
+            executor.map(
+                lambda chunk: _submit_chunk(user_client, endpoint, chunk), chunks
+            )
+        )
+
+        accepted = []
+        for chunk, ok in zip(chunks, submitted):
+            if ok:
+                accepted.extend(chunk)
+            else:
+                result.failed.extend(user["username"] for user in chunk)
+
+        if not verify:
+            result.created = [user["username"] for user in accepted]
+            return result
+
+        pending = dict(enumerate(accepted))
+
+        def read_pending() -> int:
+            batch = list(pending.items())
+            visible = executor.map(
+                lambda item: _is_visible(user_client, item[1]), batch
+            )
+            for (index, _), is_visible in zip(batch, visible):
+                if is_visible:
+                    del pending[index]
+            return len(pending)
+
+        try:
+            retry_until_condition(
+                operation=read_pending,
+                condition=lambda remaining: remaining == 0,
+                max_retries=max_retries,
+                error_message="Users created in bulk are not visible",
+            )
+        except AssertionError:
+            logger.warning(f"{len(pending)} users created in bulk are not visible")
+
+    result.not_visible = [user["username"] for user in pending.values()]
+    result.created = [
+        user["username"] for index, user in enumerate(accepted) if index not in pending
+    ]
+    logger.info(
+        f"Bulk created {len(result.created)}/{len(users)} users "
+        f"in {len(chunks)} chunks via {endpoint}"
+    )
+    return result
+
+
+def delete_users_bulk(
+    user_client: APIClient,
+    usernames: Iterable[str],
+    concurrency: Optional[int] = None,
+) -> List[str]:
+    concurrency = concurrency or Settings.BULK_CONCURRENCY
+
+    def delete(username: str) -> bool:
+        try:
+            response = user_client.delete(f"/{username}", retry_on_404=True)
+        except requests.RequestException:
+            return False
+        return response.status_code == 200
+
+    usernames = list(usernames)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        deleted = list(executor.map(delete, usernames))
+    return [username for username, ok in zip(usernames, deleted) if ok]
@@ -1,12 +1,68 @@
-from typing import Any, Dict, Optional, Union
+from functools import partial
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import urlsplit
 
 import requests
-from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from api.adapters import TunedHTTPAdapter
+from api.compression import compress_request_body
+from api.hedging import HEDGED_METHODS, hedger
+from api.models import Model, encode, is_model_body
+from api.timeouts import timeout_policy
 from config.settings import Settings
+from utils import clock, hooks, tracing
 from utils.logger import logger
 
+JSONBody = Union[Dict[str, Any], List[Any], Model]
+
+STATIC_PATH_SEGMENTS = {
+    "pet",
+    "store",
+    "user",
+    "order",
+    "inventory",
+    "findByStatus",
+    "findByTags",
+    "uploadImage",
+    "login",
+    "logout",
+    "createWithList",
+    "createWithArray",
+}
+
+
+def normalize_endpoint(url: str) -> str:
+    path = urlsplit(url).path
+    base_path = urlsplit(Settings.get_base_url()).path.rstrip("/")
+    if base_path and path.startswith(base_path):
+        path = path[len(base_path) :]
+
+    segments = []
+    for segment in path.strip("/").split("/"):
+        if not segment or segment in STATIC_PATH_SEGMENTS:
+            segments.append(segment)
+        elif segment.isdigit():
+            segments.append("{id}")
+        else:
+            segments.append("{name}")
+    return "/" + "/".join(segment for segment in segments if segment)
+
+
+class TimedRetry(Retry):
+    def sleep(self, response=None) -> None:
+        started = clock.perf_counter()
+        seconds = None
+        if self.respect_retry_after_header and response:
+            seconds = self.get_retry_after(response)
+        if seconds is None:
+            seconds = self.get_backoff_time()
+        with tracing.span("backoff", seconds=seconds):
+            clock.sleep(seconds)
+        hooks.emit(
+            "retry_wait", source="backoff", seconds=clock.perf_counter() - started
+        )
+
 
 class APIClient:
     def __init__(self, base_path: str = ""):
@@ -14,29 +70,56 @@ class APIClient:
         self.base_path = base_path.rstrip("/")
         self.session = requests.Session()
 
-        retry_strategy = Retry(
+        retry_strategy = TimedRetry(
             total=Settings.MAX_RETRIES,
             backoff_factor=Settings.RETRY_DELAY,
             status_forcelist=[429, 502, 503, 504],
             allowed_methods=["GET", "POST", "PUT", "DELETE", "PATCH"],
         )
 
-        retry_strategy_with_404 = Retry(
+        retry_strategy_with_404 = TimedRetry(
             total=Settings.MAX_RETRIES,
             backoff_factor=Settings.RETRY_DELAY,
             status_forcelist=[404, 429, 500, 502, 503, 504],
             allowed_methods=["GET", "POST", "PUT", "DELETE", "PATCH"],
         )
 
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+        if Settings.HTTP_TRANSPORT == "http2":
+            # h2 is only needed when the HTTP/2 transport is selected
+            from api.http2 import HTTP2Adapter, HTTP2Pool
 
-        self.adapter_with_404 = HTTPAdapter(max_retries=retry_strategy_with_404)
+            pool = HTTP2Pool()
+            self.adapter = HTTP2Adapter(pool, max_retries=retry_strategy)
+            self.adapter_with_404 = HTTP2Adapter(
+                pool, max_retries=retry_strategy_with_404
+            )
+        else:
+            self.adapter = TunedHTTPAdapter(max_retries=retry_strategy)
+            self.adapter_with_404 = TunedHTTPAdapter(
+                max_retries=retry_strategy_with_404
+            )
 
-        self.session.headers.update(
-            {"Content-Type": "application/json", "Accept": "application/json"}
-        )
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+        self.session_with_404 = requests.Session()
+        self.session_with_404.mount("http://", self.adapter_with_404)
+        self.session_with_404.mount("https://", self.adapter_with_404)
+
+        for session in (self.session, self.session_with_404):
+            session.headers.update(
+                {"Content-Type": "application/json", "Accept": "application/json"}
+            )
+
+        if Settings.WARMUP_CONNECTIONS > 0:
+            self.warm_up(Settings.WARMUP_CONNECTIONS)
+
+    def warm_up(self, count: int) -> int:
+        verify = self.session.merge_environment_settings(
+            self.base_url, {}, None, None, None
+        )["verify"]
+        warmed = self.adapter.warm_up(self.base_url, verify, count)
+        logger.info(f"Warmed up {warmed} connections to {self.base_url}")
+        return warmed
 
     def _build_url(self, endpoint: str) -> str:
         endpoint = endpoint.lstrip("/")
@@ -74,7 +157,7 @@ class APIClient:
         method: str,
         endpoint: str,
         params: Optional[Dict[str, Any]] = None,
-        json_data: Optional[Dict[str, Any]] = None,
+        json_data: Optional[JSONBody] = None,
         data: Optional[Union[Dict[str, Any], str]] = None,
         files: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
@@ -82,7 +165,17 @@ class APIClient:
         retry_on_404: bool = False,
     ) -> requests.Response:
         url = self._build_url(endpoint)
+        if hooks.has_subscribers("request_start"):
+            hooks.emit(
+                "request_start",
+                method=method,
+                url=url,
+                endpoint=normalize_endpoint(url),
+                json_data=json_data,
+                data=data,
+            )
 
+        started = clock.perf_counter()
         request_headers = self.session.headers.copy()
         if headers:
             request_headers.update(headers)
@@ -91,35 +184,59 @@ class APIClient:
             method, url, params=params, json=json_data, data=data, files=files
         )
 
-        try:
-            if retry_on_404:
-                temp_session = requests.Session()
-                temp_session.headers.update(request_headers)
-                temp_session.mount("http://", self.adapter_with_404)
-                temp_session.mount("https://", self.adapter_with_404)
+        body = data
+        if is_model_body(json_data) or (
+            json_data is not None and Settings.REQUEST_COMPRESSION
+        ):
+            body = encode(json_data)
 
-                response = temp_session.request(
-                    method=method,
-                    url=url,
-                    params=params,
-                    json=json_data,
-                    data=data,
-                    files=files,
-                    headers=request_headers,
-                    timeout=Settings.get_timeout(),
-                )
-                temp_session.close()
+        request_body_size = None
+        if Settings.REQUEST_COMPRESSION and isinstance(body, (bytes, str)):
+            raw = body.encode("utf-8") if isinstance(body, str) else body
+            compressed, encoding = compress_request_body(raw)
+            if encoding is not None:
+                body = compressed
+                request_body_size = len(raw)
+                request_headers["Content-Encoding"] = encoding
+
+        key = None
+        if Settings.HEDGE_REQUESTS or timeout_policy.enabled():
+            key = f"{method} {normalize_endpoint(url)}"
+
+        span = tracing.start_span(method)
+        if span.recording:
+            span.name = f"{method} {normalize_endpoint(url)}"
+            span.update(method=method, url=url, retry_on_404=retry_on_404)
+            request_headers["traceparent"] = span.traceparent
+
+        sent = clock.perf_counter()
+        received = sent
+        response = None
+        try:
+            session = self.session_with_404 if retry_on_404 else self.session
+            timeout = timeout_policy.timeout(key)
+            send = partial(
+                session.request,
+                method=method,
+                url=url,
+                params=params,
+                json=json_data if body is data else None,
+                data=body,
+                files=files,
+                headers=request_headers,
+                timeout=timeout,
+            )
+            if Settings.ADAPTIVE_TIMEOUTS and not retry_on_404:
+                send = partial(timeout_policy.timed, key, send, timeout[1])
+            if (
+                Settings.HEDGE_REQUESTS
+                and method in HEDGED_METHODS
+                and not retry_on_404
+            ):
+                response = hedger.run(key, send)
             else:
-                response = self.session.request(
-                    method=method,
-                    url=url,
-                    params=params,
-                    json=json_data,
-                    data=data,
-                    files=files,
-                    headers=request_headers,
-                    timeout=Settings.get_timeout(),
-                )
+                response = send()
+            received = clock.perf_counter()
 
             self._log_response(response)
 
@@ -132,9 +249,33 @@ class APIClient:
             return response
 
         except requests.RequestException as e:
+            received = clock.perf_counter()
             logger.error(f"Request failed: {method} {url} - {str(e)}")
+            span.set("error", type(e).__name__)
             raise
 
+        finally:
+            if response is not None:
+                span.set("status_code", response.status_code)
+            span.finish()
+            if hooks.has_subscribers("request"):
+                hooks.emit(
+                    "request",
+                    method=method,
+                    url=url,
+                    endpoint=normalize_endpoint(url),
+                    status_code=(
+                        response.status_code if response is not None else None
+                    ),
+                    params=params,
+                    json_data=json_data,
+                    data=data,
+                    response=response,
+                    request_body_size=request_body_size,
+                    elapsed=received - sent,
+                    overhead=(sent - started) + (clock.perf_counter() - received),
+                )
+
     def get(
         self,
         endpoint: str = "",
@@ -155,7 +296,7 @@ class APIClient:
     def post(
         self,
         endpoint: str = "",
-        json_data: Optional[Dict[str, Any]] = None,
+        json_data: Optional[JSONBody] = None,
         data: Optional[Union[Dict[str, Any], str]] = None,
         files: Optional[Dict[str, Any]] = None,
         params: Optional[Dict[str, Any]] = None,
@@ -178,7 +319,7 @@ class APIClient:
     def put(
         self,
         endpoint: str = "",
-        json_data: Optional[Dict[str, Any]] = None,
+        json_data: Optional[JSONBody] = None,
         data: Optional[Union[Dict[str, Any], str]] = None,
         headers: Optional[Dict[str, str]] = None,
         expected_status: Optional[int] = None,
@@ -197,7 +338,7 @@ class APIClient:
     def patch(
         self,
         endpoint: str = "",
-        json_data: Optional[Dict[str, Any]] = None,
+        json_data: Optional[JSONBody] = None,
         data: Optional[Union[Dict[str, Any], str]] = None,
         headers: Optional[Dict[str, str]] = None,
         expected_status: Optional[int] = None,
@@ -230,3 +371,4 @@ class APIClient:
 
     def close(self) -> None:
         self.session.close()
+        self.session_with_404.close()
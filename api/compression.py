@@ -0,0 +1,125 @@
+import gzip
+import threading
+import zlib
+from typing import Any, Dict, Optional, Tuple
+
+from config.settings import Settings
+from utils import hooks
+
+ENCODINGS = ("gzip", "deflate")
+
+
+def compress(body: bytes, encoding: str, level: int = 6) -> bytes:
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=level, mtime=0)
+    if encoding == "deflate":
+        return zlib.compress(body, level)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+def decompress(body: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        return zlib.decompress(body)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+def compress_request_body(
+    body: bytes, encoding: Optional[str] = None, min_size: Optional[int] = None
+) -> Tuple[bytes, Optional[str]]:
+    encoding = Settings.REQUEST_COMPRESSION if encoding is None else encoding
+    min_size = Settings.REQUEST_COMPRESSION_MIN_SIZE if min_size is None else min_size
+    if encoding not in ENCODINGS or len(body) < min_size:
+        return body, None
+    compressed = compress(body, encoding, Settings.REQUEST_COMPRESSION_LEVEL)
+    if len(compressed) >= len(body):
+        return body, None
+    return compressed, encoding
+
+
+def _body_size(body: Any) -> int:
+    if body is None:
+        return 0
+    if isinstance(body, str):
+        return len(body.encode("utf-8"))
+    try:
+        return len(body)
+    except TypeError:
+        return 0
+
+
+class BandwidthStats:
+    FIELDS = (
+        "requests",
+        "request_wire",
+        "request_logical",
+        "response_wire",
+        "response_logical",
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, Dict[str, int]] = {}
+
+    def start(self) -> None:
+        hooks.subscribe("request", self.on_request)
+
+    def stop(self) -> None:
+        hooks.unsubscribe("request", self.on_request)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints = {}
+
+    def on_request(
+        self,
+        method: str,
+        endpoint: str,
+        response: Any,
+        request_body_size: Optional[int] = None,
+        **_: Any,
+    ) -> None:
+        if response is None:
+            return
+        request_wire = _body_size(response.request.body)
+        response_wire = response.raw.tell() if response.raw is not None else 0
+        self.record(
+            f"{method} {endpoint}",
+            request_wire,
+            request_wire if request_body_size is None else request_body_size,
+            response_wire,
+            len(response.content),
+        )
+
+    def record(
+        self,
+        key: str,
+        request_wire: int,
+        request_logical: int,
+        response_wire: int,
+        response_logical: int,
+    ) -> None:
+        with self._lock:
+            counters = self._endpoints.get(key)
+            if counters is None:
+                counters = self._endpoints[key] = dict.fromkeys(self.FIELDS, 0)
+            counters["requests"] += 1
+            counters["request_wire"] += request_wire
+            counters["request_logical"] += request_logical
+            counters["response_wire"] += response_wire
+            counters["response_logical"] += response_logical
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {key: dict(counters) for key, counters in self._endpoints.items()}
+
+    def totals(self) -> Dict[str, int]:
+        totals = dict.fromkeys(self.FIELDS, 0)
+        for counters in self.snapshot().values():
+            for field in self.FIELDS:
+                totals[field] += counters[field]
+        return totals
+
+
+bandwidth_stats = BandwidthStats()
@@ -0,0 +1,171 @@
+import contextvars
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Optional, Tuple
+
+import requests
+
+from config.settings import Settings
+from utils import clock
+from utils.stats import RollingWindow
+
+HEDGED_METHODS = ("GET",)
+WINDOW_SIZE = 200
+BUDGET_BURST = 10.0
+MAX_WORKERS = 256
+
+Attempt = Tuple[requests.Response, float]
+
+
+class HedgeStats:
+    FIELDS = ("requests", "hedged", "hedge_wins", "budget_exhausted")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, Dict[str, float]] = {}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints = {}
+
+    def record(self, key: str, field: str, value: float = 1) -> None:
+        with self._lock:
+            counters = self._endpoints.get(key)
+            if counters is None:
+                counters = self._endpoints[key] = dict.fromkeys(self.FIELDS, 0)
+                counters["saved_seconds"] = 0.0
+            counters[field] += value
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {key: dict(counters) for key, counters in self._endpoints.items()}
+
+    def totals(self) -> Dict[str, float]:
+        totals = dict.fromkeys(self.FIELDS, 0)
+        totals["saved_seconds"] = 0.0
+        for counters in self.snapshot().values():
+            for field, value in counters.items():
+                totals[field] += value
+        return totals
+
+
+hedge_stats = HedgeStats()
+
+
+class HedgeBudget:
+    def __init__(self, ratio: Optional[float] = None, burst: float = BUDGET_BURST):
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = burst
+        self._lock = threading.Lock()
+
+    def earn(self) -> None:
+        ratio = Settings.HEDGE_BUDGET if self.ratio is None else self.ratio
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + ratio)
+
+    def spend(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class Hedger:
+    def __init__(self, budget: Optional[HedgeBudget] = None):
+        self.budget = budget or HedgeBudget()
+        self._lock = threading.Lock()
+        self._windows: Dict[str, RollingWindow] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._windows = {}
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        self.budget = HedgeBudget()
+
+    def observe(self, key: str, seconds: float) -> None:
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None:
+                window = self._windows[key] = RollingWindow(WINDOW_SIZE)
+            window.add(seconds)
+
+    def delay(self, key: str) -> Optional[float]:
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or len(window) < Settings.HEDGE_MIN_SAMPLES:
+                return None
+            delay = max(
+                window.percentile(Settings.HEDGE_PERCENTILE), Settings.HEDGE_MIN_DELAY
+            )
+            # A hedge sent after the delay answers around delay + median, so without
+            # a slower response in the window it cannot win and only costs a thread hop.
+            if window.percentile(100) <= delay + window.percentile(50):
+                return None
+        return delay
+
+    def run(self, key: str, send: Callable[[], requests.Response]) -> requests.Response:
+        hedge_stats.record(key, "requests")
+        self.budget.earn()
+        delay = self.delay(key)
+        if delay is None:
+            return self._attempt(key, send)[0]
+
+        primary = self._submit(key, send)
+        if wait([primary], timeout=delay).done:
+            return primary.result()[0]
+        if not self.budget.spend():
+            hedge_stats.record(key, "budget_exhausted")
+            return primary.result()[0]
+
+        hedge = self._submit(key, send)
+        hedge_stats.record(key, "hedged")
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future, other in ((primary, hedge), (hedge, primary)):
+                if future in done and future.exception() is None:
+                    if future is hedge:
+                        self._record_win(key, hedge, primary)
+                    other.add_done_callback(_close_response)
+                    return future.result()[0]
+        return primary.result()[0]
+
+    def _record_win(self, key: str, hedge: Future, primary: Future) -> None:
+        hedge_stats.record(key, "hedge_wins")
+        answered = hedge.result()[1]
+
+        def record_saving(future: Future) -> None:
+            if future.exception() is None:
+                hedge_stats.record(key, "saved_seconds", future.result()[1] - answered)
+
+        primary.add_done_callback(record_saving)
+
+    def _attempt(self, key: str, send: Callable[[], requests.Response]) -> Attempt:
+        started = clock.perf_counter()
+        response = send()
+        finished = clock.perf_counter()
+        self.observe(key, finished - started)
+        return response, finished
+
+    def _submit(self, key: str, send: Callable[[], requests.Response]) -> Future:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=MAX_WORKERS, thread_name_prefix="hedge"
+                )
+            executor = self._executor
+        context = contextvars.copy_context()
+        return executor.submit(context.run, self._attempt, key, send)
+
+
+def _close_response(future: Future) -> None:
+    if future.exception() is None:
+        future.result()[0].close()
+
+
+hedger = Hedger()
@@ -0,0 +1,566 @@
+import io
+import os
+import socket
+import ssl
+import threading
+from http import HTTPStatus
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import h2.config
+import h2.connection
+import h2.errors
+import h2.events
+import h2.exceptions
+import h2.settings
+import requests
+from requests.exceptions import ConnectTimeout, ReadTimeout, RetryError
+from requests.utils import DEFAULT_CA_BUNDLE_PATH, select_proxy
+from urllib3 import HTTPResponse
+from urllib3._collections import HTTPHeaderDict
+from urllib3.exceptions import (
+    ConnectTimeoutError,
+    MaxRetryError,
+    NewConnectionError,
+    ProtocolError,
+    ReadTimeoutError,
+    ResponseError,
+)
+
+from api.adapters import TunedHTTPAdapter, connection_stats, dns_cache
+from config.settings import Settings
+from utils.logger import logger
+
+WINDOW_SIZE = 4 * 1024 * 1024
+READ_SIZE = 65536
+DEFAULT_PORTS = {"http": 80, "https": 443}
+CONNECTION_HEADERS = {
+    "connection",
+    "host",
+    "keep-alive",
+    "proxy-connection",
+    "transfer-encoding",
+    "upgrade",
+}
+
+Body = Union[bytes, Iterable[Union[bytes, memoryview]]]
+Origin = Tuple[str, str, int]
+
+
+class HTTP2NotNegotiated(Exception):
+    pass
+
+
+class _Stream:
+    __slots__ = ("status", "headers", "chunks", "done", "error")
+
+    def __init__(self):
+        self.status = 0
+        self.headers: List[Tuple[str, str]] = []
+        self.chunks: List[bytes] = []
+        self.done = threading.Event()
+        self.error: Optional[Exception] = None
+
+
+def _connect(host: str, port: int, timeout: Optional[float]) -> socket.socket:
+    addresses = dns_cache.resolve(host, port) or [host]
+    error = None
+    for address in addresses:
+        try:
+            sock = socket.create_connection((address, port), timeout=timeout)
+        except socket.timeout:
+            error = ConnectTimeoutError(
+                None, f"Connection to {host} timed out ({timeout}s)"
+            )
+        except OSError as e:
+            error = NewConnectionError(None, f"Failed to connect to {host}:{port}: {e}")
+        else:
+            dns_cache.prefer(host, port, address)
+            return sock
+    dns_cache.invalidate(host, port)
+    raise error
+
+
+class HTTP2Connection:
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        ssl_context: Optional[ssl.SSLContext],
+        connect_timeout: Optional[float],
+    ):
+        self.host = host
+        self.port = port
+        self.closed = False
+
+        self._h2 = h2.connection.H2Connection(
+            h2.config.H2Configuration(client_side=True, header_encoding="utf-8")
+        )
+        self._lock = threading.Condition()
+        self._streams: Dict[int, _Stream] = {}
+
+        sock = self._sock = _connect(host, port, connect_timeout)
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if ssl_context is not None:
+                sock = self._sock = ssl_context.wrap_socket(sock, server_hostname=host)
+                if sock.selected_alpn_protocol() != "h2":
+                    raise HTTP2NotNegotiated(f"{host}:{port} did not negotiate h2")
+            sock.settimeout(None)
+            with self._lock:
+                self._h2.initiate_connection()
+                self._h2.update_settings(
+                    {
+                        h2.settings.SettingCodes.ENABLE_PUSH: 0,
+                        h2.settings.SettingCodes.INITIAL_WINDOW_SIZE: WINDOW_SIZE,
+                    }
+                )
+                self._h2.increment_flow_control_window(WINDOW_SIZE)
+                self._flush()
+        except BaseException as e:
+            sock.close()
+            if isinstance(e, socket.timeout):
+                raise ConnectTimeoutError(
+                    None, f"HTTP/2 handshake with {host} timed out ({connect_timeout}s)"
+                ) from e
+            if isinstance(e, OSError) and not isinstance(e, ssl.SSLError):
+                raise ProtocolError(f"HTTP/2 handshake failed: {e!r}", e) from e
+            raise
+        connection_stats.increment("connections_opened")
+        threading.Thread(
+            target=self._read_loop, name=f"h2-{host}:{port}", daemon=True
+        ).start()
+
+    @property
+    def active_streams(self) -> int:
+        return len(self._streams)
+
+    def request(
+        self,
+        method: str,
+        scheme: str,
+        authority: str,
+        path: str,
+        headers: Dict[str, str],
+        body: Optional[Body],
+        timeout: Optional[float],
+    ) -> Tuple[int, List[Tuple[str, str]], bytes]:
+        request_headers = [
+            (":method", method),
+            (":scheme", scheme),
+            (":authority", authority),
+            (":path", path),
+        ]
+        request_headers.extend(
+            (name.lower(), value)
+            for name, value in headers.items()
+            if name.lower() not in CONNECTION_HEADERS
+        )
+
+        stream = _Stream()
+        with self._lock:
+            while (
+                not self.closed
+                and len(self._streams)
+                >= self._h2.remote_settings.max_concurrent_streams
+            ):
+                self._lock.wait()
+            if self.closed:
+                raise ProtocolError("HTTP/2 connection is closed")
+            stream_id = self._h2.get_next_available_stream_id()
+            self._streams[stream_id] = stream
+            connection_stats.increment("requests")
+            try:
+                self._h2.send_headers(stream_id, request_headers, end_stream=not body)
+                self._flush()
+                if body:
+                    self._send_body(stream_id, stream, body)
+            except (OSError, h2.exceptions.H2Error) as e:
+                self._streams.pop(stream_id, None)
+                raise ProtocolError(f"Sending the request failed: {e!r}", e)
+
+        if not stream.done.wait(timeout):
+            self._cancel(stream_id)
+            raise ReadTimeoutError(
+                None, path, f"Read timed out. (read timeout={timeout})"
+            )
+        if stream.error is not None:
+            raise stream.error
+        return stream.status, stream.headers, b"".join(stream.chunks)
+
+    def _send_body(self, stream_id: int, stream: _Stream, body: Body) -> None:
+        chunks = [body] if isinstance(body, (bytes, bytearray)) else body
+        for chunk in chunks:
+            with memoryview(chunk) as view:
+                offset = 0
+                while offset < len(view):
+                    if stream.error is not None:
+                        raise stream.error
+                    window = min(
+                        self._h2.local_flow_control_window(stream_id),
+                        self._h2.max_outbound_frame_size,
+                    )
+                    if window <= 0:
+                        self._flush()
+                        self._lock.wait()
+                        continue
+                    self._h2.send_data(
+                        stream_id, view[offset : offset + window].tobytes()
+                    )
+                    offset += window
+            self._flush()
+        self._h2.end_stream(stream_id)
+        self._flush()
+
+    def _cancel(self, stream_id: int) -> None:
+        with self._lock:
+            if self._streams.pop(stream_id, None) is None or self.closed:
+                return
+            try:
+                self._h2.reset_stream(stream_id, h2.errors.ErrorCodes.CANCEL)
+                self._flush()
+            except (OSError, h2.exceptions.H2Error):
+                pass
+            self._lock.notify_all()
+
+    def _flush(self) -> None:
+        data = self._h2.data_to_send()
+        if data:
+            self._sock.sendall(data)
+
+    def _read_loop(self) -> None:
+        error = None
+        try:
+            while True:
+                data = self._sock.recv(READ_SIZE)
+                if not data:
+                    break
+                with self._lock:
+                    for event in self._h2.receive_data(data):
+                        self._handle(event)
+                    self._flush()
+                    self._lock.notify_all()
+        except (OSError, h2.exceptions.H2Error) as e:
+            error = e
+        self._fail(ProtocolError("HTTP/2 connection lost", error))
+
+    def _handle(self, event: h2.events.Event) -> None:
+        if isinstance(event, h2.events.ResponseReceived):
+            stream = self._streams.get(event.stream_id)
+            if stream is not None:
+                for name, value in event.headers:
+                    if name == ":status":
+                        stream.status = int(value)
+                    elif not name.startswith(":"):
+                        stream.headers.append((name, value))
+        elif isinstance(event, h2.events.DataReceived):
+            stream = self._streams.get(event.stream_id)
+            if stream is not None:
+                stream.chunks.append(event.data)
+            self._h2.acknowledge_received_data(
+                event.flow_controlled_length, event.stream_id
+            )
+        elif isinstance(event, h2.events.StreamEnded):
+            stream = self._streams.pop(event.stream_id, None)
+            if stream is not None:
+                stream.done.set()
+        elif isinstance(event, h2.events.StreamReset):
+            stream = self._streams.pop(event.stream_id, None)
+            if stream is not None:
+                stream.error = ProtocolError(
+                    f"Stream reset by the server: {event.error_code!r}"
+                )
+                stream.done.set()
+        elif isinstance(event, h2.events.ConnectionTerminated):
+            self.closed = True
+            for stream_id in [
+                stream_id
+                for stream_id in self._streams
+                if stream_id > (event.last_stream_id or 0)
+            ]:
+                stream = self._streams.pop(stream_id)
+                stream.error = ProtocolError("Connection closed by the server (GOAWAY)")
+                stream.done.set()
+
+    def _fail(self, error: Exception) -> None:
+        with self._lock:
+            self.closed = True
+            for stream in self._streams.values():
+                stream.error = error
+                stream.done.set()
+            self._streams.clear()
+            self._lock.notify_all()
+        self._sock.close()
+
+    def close(self) -> None:
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            try:
+                self._h2.close_connection()
+                self._flush()
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except (OSError, h2.exceptions.H2Error):
+                pass
+
+
+class HTTP2Pool:
+    def __init__(
+        self, max_connections: Optional[int] = None, max_streams: Optional[int] = None
+    ):
+        self.max_connections = max_connections or Settings.HTTP2_MAX_CONNECTIONS
+        self.max_streams = max_streams or Settings.HTTP2_MAX_STREAMS
+        self._lock = threading.Condition()
+        self._connections: Dict[Origin, List[HTTP2Connection]] = {}
+        self._opening: Dict[Origin, int] = {}
+
+    def connection(
+        self,
+        origin: Origin,
+        ssl_context: Optional[ssl.SSLContext],
+        connect_timeout: Optional[float],
+    ) -> HTTP2Connection:
+        with self._lock:
+            while True:
+                connections = self._live(origin)
+                least_busy = min(
+                    connections,
+                    key=lambda connection: connection.active_streams,
+                    default=None,
+                )
+                if least_busy is not None and (
+                    least_busy.active_streams < self.max_streams
+                    or len(connections) >= self.max_connections
+                ):
+                    return least_busy
+                if not self._opening.get(origin):
+                    break
+                # Another thread is already opening a connection to this origin.
+                self._lock.wait()
+            self._opening[origin] = 1
+        return self._open(origin, ssl_context, connect_timeout)
+
+    def open(
+        self,
+        origin: Origin,
+        ssl_context: Optional[ssl.SSLContext],
+        connect_timeout: Optional[float],
+    ) -> Optional[HTTP2Connection]:
+        with self._lock:
+            opening = self._opening.get(origin, 0)
+            if len(self._live(origin)) + opening >= self.max_connections:
+                return None
+            self._opening[origin] = opening + 1
+        return self._open(origin, ssl_context, connect_timeout)
+
+    def _live(self, origin: Origin) -> List[HTTP2Connection]:
+        connections = [
+            connection
+            for connection in self._connections.get(origin, ())
+            if not connection.closed
+        ]
+        self._connections[origin] = connections
+        return connections
+
+    def _open(
+        self,
+        origin: Origin,
+        ssl_context: Optional[ssl.SSLContext],
+        connect_timeout: Optional[float],
+    ) -> HTTP2Connection:
+        scheme, host, port = origin
+        connection = None
+        try:
+            connection = HTTP2Connection(host, port, ssl_context, connect_timeout)
+        finally:
+            with self._lock:
+                self._opening[origin] -= 1
+                if connection is not None:
+                    self._connections.setdefault(origin, []).append(connection)
+                self._lock.notify_all()
+        return connection
+
+    def connection_count(self) -> int:
+        with self._lock:
+            return sum(
+                1
+                for connections in self._connections.values()
+                for connection in connections
+                if not connection.closed
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            connections = [
+                connection
+                for connections in self._connections.values()
+                for connection in connections
+            ]
+            self._connections.clear()
+        for connection in connections:
+            connection.close()
+
+
+_ssl_contexts: Dict[Union[bool, str], ssl.SSLContext] = {}
+_ssl_contexts_lock = threading.Lock()
+
+
+def get_h2_context(verify: Union[bool, str]) -> ssl.SSLContext:
+    with _ssl_contexts_lock:
+        context = _ssl_contexts.get(verify)
+        if context is None:
+            context = ssl.create_default_context()
+            if verify is False:
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+            else:
+                ca_bundle = DEFAULT_CA_BUNDLE_PATH if verify is True else verify
+                if os.path.isdir(ca_bundle):
+                    context.load_verify_locations(capath=ca_bundle)
+                else:
+                    context.load_verify_locations(cafile=ca_bundle)
+            context.set_alpn_protocols(["h2"])
+            _ssl_contexts[verify] = context
+    return context
+
+
+def _timeouts(timeout) -> Tuple[Optional[float], Optional[float]]:
+    if isinstance(timeout, tuple):
+        return timeout
+    return timeout, timeout
+
+
+def _request_error(
+    error: Exception, request: requests.PreparedRequest
+) -> requests.RequestException:
+    if isinstance(error, ReadTimeoutError):
+        return ReadTimeout(error, request=request)
+    reason = error.reason if isinstance(error, MaxRetryError) else error
+    if isinstance(reason, ConnectTimeoutError) and not isinstance(
+        reason, NewConnectionError
+    ):
+        return ConnectTimeout(error, request=request)
+    if isinstance(reason, ResponseError):
+        return RetryError(error, request=request)
+    return requests.ConnectionError(error, request=request)
+
+
+class HTTP2Adapter(TunedHTTPAdapter):
+    def __init__(self, pool: Optional[HTTP2Pool] = None, **kwargs):
+        self.h2_pool = pool or HTTP2Pool()
+        self.http1_origins = set()
+        super().__init__(**kwargs)
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout=None,
+        verify=True,
+        cert=None,
+        proxies=None,
+    ) -> requests.Response:
+        url = urlsplit(request.url)
+        origin = (url.scheme, url.hostname, url.port or DEFAULT_PORTS[url.scheme])
+        if (
+            cert is not None
+            or origin in self.http1_origins
+            or select_proxy(request.url, proxies)
+        ):
+            return super().send(request, stream, timeout, verify, cert, proxies)
+
+        connect_timeout, read_timeout = _timeouts(timeout)
+        ssl_context = get_h2_context(verify) if url.scheme == "https" else None
+        retries = self.max_retries
+        while True:
+            try:
+                connection = self.h2_pool.connection(
+                    origin, ssl_context, connect_timeout
+                )
+                status, headers, content = connection.request(
+                    request.method,
+                    url.scheme,
+                    url.netloc.rpartition("@")[2],
+                    request.path_url,
+                    request.headers,
+                    request.body.encode("utf-8")
+                    if isinstance(request.body, str)
+                    else request.body,
+                    read_timeout,
+                )
+            except HTTP2NotNegotiated as e:
+                logger.info(f"{e}, falling back to HTTP/1.1")
+                self.http1_origins.add(origin)
+                return super().send(request, stream, timeout, verify, cert, proxies)
+            except ssl.SSLError as e:
+                raise requests.exceptions.SSLError(e, request=request)
+            except (ConnectTimeoutError, ReadTimeoutError, ProtocolError) as e:
+                try:
+                    retries = retries.increment(request.method, request.url, error=e)
+                except Exception as error:
+                    raise _request_error(error, request)
+                retries.sleep()
+                continue
+
+            response = HTTPResponse(
+                body=io.BytesIO(content),
+                headers=HTTPHeaderDict(headers),
+                status=status,
+                reason=_reason(status),
+                preload_content=False,
+                decode_content=True,
+                request_method=request.method,
+                request_url=request.url,
+                retries=retries,
+            )
+            if retries.is_retry(
+                request.method, status, "Retry-After" in response.headers
+            ):
+                try:
+                    retries = retries.increment(
+                        request.method, request.url, response=response
+                    )
+                except MaxRetryError as error:
+                    if retries.raise_on_status:
+                        raise _request_error(error, request)
+                    return self.build_response(request, response)
+                retries.sleep(response)
+                continue
+            return self.build_response(request, response)
+
+    def warm_up(self, url: str, verify, count: int) -> int:
+        parts = urlsplit(url)
+        origin = (
+            parts.scheme,
+            parts.hostname,
+            parts.port or DEFAULT_PORTS[parts.scheme],
+        )
+        ssl_context = get_h2_context(verify) if parts.scheme == "https" else None
+        warmed = 0
+        try:
+            for _ in range(count):
+                if (
+                    self.h2_pool.open(origin, ssl_context, Settings.CONNECT_TIMEOUT)
+                    is None
+                ):
+                    break
+                warmed += 1
+        except HTTP2NotNegotiated:
+            self.http1_origins.add(origin)
+            return super().warm_up(url, verify, count)
+        except Exception as e:
+            logger.warning(f"Connection warm-up to {url} failed: {str(e)}")
+        connection_stats.increment("warmed_connections", warmed)
+        return warmed
+
+    def close(self) -> None:
+        super().close()
+        self.h2_pool.close()
+
+
+def _reason(status: int) -> str:
+    try:
+        return HTTPStatus(status).phrase
+    except ValueError:
+        return ""
@@ -0,0 +1,81 @@
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+import requests
+from urllib3.exceptions import ReadTimeoutError
+
+from config.settings import Settings
+from utils import clock
+from utils.stats import RollingWindow
+
+WINDOW_SIZE = 200
+
+
+class TimeoutPolicy:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._windows: Dict[str, RollingWindow] = {}
+
+    @staticmethod
+    def enabled() -> bool:
+        return Settings.ADAPTIVE_TIMEOUTS or bool(Settings.ENDPOINT_TIMEOUTS)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._windows = {}
+
+    def observe(self, key: str, seconds: float) -> None:
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None:
+                window = self._windows[key] = RollingWindow(WINDOW_SIZE)
+            window.add(seconds)
+
+    def timed(
+        self,
+        key: str,
+        send: Callable[[], requests.Response],
+        read_timeout: Optional[float] = None,
+    ) -> requests.Response:
+        started = clock.perf_counter()
+        try:
+            response = send()
+        except requests.RequestException as e:
+            # Every attempt ran into the read timeout: the endpoint is at least that
+            # slow now, so let the window (and the next timeout) grow from it
+            if read_timeout is not None and _read_timed_out(e):
+                self.observe(key, read_timeout)
+            raise
+        finished = clock.perf_counter()
+        retries = getattr(response.raw, "retries", None)
+        if retries is None or not retries.history:
+            self.observe(key, finished - started)
+        return response
+
+    def read_timeout(self, key: str) -> Optional[float]:
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or len(window) < Settings.TIMEOUT_MIN_SAMPLES:
+                return None
+            observed = window.percentile(Settings.TIMEOUT_PERCENTILE)
+        timeout = observed * Settings.TIMEOUT_FACTOR
+        return min(max(timeout, Settings.TIMEOUT_FLOOR), Settings.TIMEOUT_CEILING)
+
+    def timeout(self, key: Optional[str]) -> Tuple[float, float]:
+        if key is None:
+            return Settings.get_timeout()
+        if Settings.ADAPTIVE_TIMEOUTS and Settings.get_endpoint_timeout(key) is None:
+            read_timeout = self.read_timeout(key)
+            if read_timeout is not None:
+                return (Settings.CONNECT_TIMEOUT, read_timeout)
+        return Settings.get_timeout(key)
+
+
+def _read_timed_out(error: requests.RequestException) -> bool:
+    if isinstance(error, requests.exceptions.ReadTimeout):
+        return True
+    reason = getattr(error.args[0] if error.args else None, "reason", None)
+    return isinstance(reason, ReadTimeoutError)
+
+
+timeout_policy = TimeoutPolicy()
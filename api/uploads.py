@@ -0,0 +1,198 @@
+import mimetypes
+import mmap
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import requests
+
+from api.client import APIClient
+from config.settings import Settings
+from utils.logger import logger
+
+
+def _window_size(size: Optional[int]) -> int:
+    size = size or Settings.UPLOAD_WINDOW_SIZE
+    granularity = mmap.ALLOCATIONGRANULARITY
+    return max(granularity, -(-size // granularity) * granularity)
+
+
+class MultipartFileStream:
+    def __init__(
+        self,
+        path: str,
+        field: str = "file",
+        fields: Optional[Dict[str, str]] = None,
+        content_type: Optional[str] = None,
+        window_size: Optional[int] = None,
+    ):
+        self.path = path
+        self.size = os.path.getsize(path)
+        self.window_size = _window_size(window_size)
+        self.boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+
+        filename = os.path.basename(path)
+        file_type = (
+            content_type
+            or mimetypes.guess_type(filename)[0]
+            or "application/octet-stream"
+        )
+        preamble = "".join(
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{name}"\r\n\r\n'
+            f"{value}\r\n"
+            for name, value in (fields or {}).items()
+            if value is not None
+        )
+        preamble += (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+            f"Content-Type: {file_type}\r\n\r\n"
+        )
+        self.preamble = preamble.encode("utf-8")
+        self.epilogue = f"\r\n--{self.boundary}--\r\n".encode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self.preamble) + self.size + len(self.epilogue)
+
+    def __repr__(self) -> str:
+        return f"<MultipartFileStream {self.path} ({self.size} bytes)>"
+
+    def __iter__(self) -> Iterator[Union[bytes, memoryview]]:
+        yield self.preamble
+        with open(self.path, "rb") as f:
+            for offset in range(0, self.size, self.window_size):
+                length = min(self.window_size, self.size - offset)
+                with mmap.mmap(
+                    f.fileno(), length, offset=offset, access=mmap.ACCESS_READ
+                ) as window:
+                    if hasattr(mmap, "MADV_SEQUENTIAL"):
+                        window.madvise(mmap.MADV_SEQUENTIAL)
+                    view = memoryview(window)
+                    try:
+                        yield view
+                    finally:
+                        view.release()
+        yield self.epilogue
+
+
+class UploadResult:
+    def __init__(
+        self,
+        pet_id: int,
+        path: str,
+        size: int,
+        seconds: float,
+        response: Optional[requests.Response] = None,
+        error: Optional[str] = None,
+    ):
+        self.pet_id = pet_id
+        self.path = path
+        self.size = size
+        self.seconds = seconds
+        self.response = response
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.response is not None and self.response.status_code == 200
+
+    @property
+    def throughput(self) -> float:
+        return self.size / self.seconds if self.seconds > 0 else 0.0
+
+
+class UploadReport:
+    def __init__(self, results: List[UploadResult], seconds: float, concurrency: int):
+        self.results = results
+        self.seconds = seconds
+        self.concurrency = concurrency
+
+    @property
+    def failed(self) -> List[UploadResult]:
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(result.size for result in self.results if result.ok)
+
+    @property
+    def throughput(self) -> float:
+        return self.total_bytes / self.seconds if self.seconds > 0 else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        per_upload = sorted(result.throughput for result in self.results if result.ok)
+        return {
+            "uploads": len(self.results),
+            "failed": len(self.failed),
+            "bytes": self.total_bytes,
+            "seconds": round(self.seconds, 3),
+            "concurrency": self.concurrency,
+            "throughput_mb_s": round(self.throughput / 2**20, 2),
+            "slowest_upload_mb_s": round(per_upload[0] / 2**20, 2)
+            if per_upload
+            else None,
+        }
+
+
+def upload_image(
+    pet_client: APIClient,
+    pet_id: int,
+    path: str,
+    additional_metadata: Optional[str] = None,
+    window_size: Optional[int] = None,
+    expected_status: Optional[int] = None,
+    retry_on_404: bool = False,
+) -> UploadResult:
+    stream = MultipartFileStream(
+        path,
+        fields={"additionalMetadata": additional_metadata},
+        window_size=window_size,
+    )
+    started = time.perf_counter()
+    response = pet_client.post(
+        f"/{pet_id}/uploadImage",
+        data=stream,
+        headers={"Content-Type": stream.content_type},
+        expected_status=expected_status,
+        retry_on_404=retry_on_404,
+    )
+    return UploadResult(
+        pet_id, path, stream.size, time.perf_counter() - started, response
+    )
+
+
+def upload_images(
+    pet_client: APIClient,
+    uploads: Iterable[Tuple[int, str]],
+    concurrency: Optional[int] = None,
+    window_size: Optional[int] = None,
+) -> UploadReport:
+    concurrency = concurrency or Settings.UPLOAD_CONCURRENCY
+
+    def upload(item: Tuple[int, str]) -> UploadResult:
+        pet_id, path = item
+        started = time.perf_counter()
+        try:
+            return upload_image(pet_client, pet_id, path, window_size=window_size)
+        except (requests.RequestException, OSError) as e:
+            logger.warning(f"Upload of {path} for pet {pet_id} failed: {str(e)}")
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            return UploadResult(
+                pet_id, path, size, time.perf_counter() - started, error=str(e)
+            )
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(upload, uploads))
+    report = UploadReport(results, time.perf_counter() - started, concurrency)
+
+    summary = report.summary()
+    logger.info(
+        f"Uploaded {summary['bytes']} bytes in {summary['uploads']} files "
+        f"at {summary['throughput_mb_s']} MB/s ({summary['failed']} failed)"
+    )
+    return report
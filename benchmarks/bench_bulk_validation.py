@@ -0,0 +1,61 @@
+import argparse
+import random
+import sys
+import time
+from typing import List
+
+from utils.bulk_validators import validate_pets_bulk
+from utils.validators import PET_STATUSES, validate_pet_data
+
+
+def build_pets(count: int, status: str) -> List[dict]:
+    return [
+        {
+            "id": pet_id,
+            "name": f"pet-{pet_id}",
+            "status": status,
+            "photoUrls": [f"https://example.com/{pet_id}.png"],
+            "tags": [{"id": pet_id % 100, "name": "tag"}],
+        }
+        for pet_id in random.sample(range(1, count * 10), count)
+    ]
+
+
+def validate_one_by_one(pets: List[dict], status: str) -> None:
+    for pet in pets:
+        validate_pet_data(pet)
+        assert pet["status"] == status
+
+
+def measure(function, *args, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.bench_bulk_validation",
+        description="Compare per-pet and bulk validation of findByStatus responses",
+    )
+    parser.add_argument("--pets", type=int, default=50000)
+    args = parser.parse_args(argv)
+
+    status = PET_STATUSES[0]
+    pets = build_pets(args.pets, status)
+
+    loop = measure(validate_one_by_one, pets, status)
+    bulk = measure(lambda: validate_pets_bulk(pets, expected_status=status))
+    print(f"{args.pets} pets, per-pet loop: {loop * 1000:.1f}ms")
+    print(
+        f"{args.pets} pets, bulk (plus id uniqueness): {bulk * 1000:.1f}ms "
+        f"({loop / bulk:.2f}x)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+import argparse
+import sys
+import time
+import uuid
+from typing import Callable, Dict, List
+
+from api.bulk_users import create_users_bulk
+from api.client import APIClient
+from api.compression import bandwidth_stats
+from config.settings import Settings
+from server.runner import StandInServer
+from utils.data_generators import generate_pet_data, generate_users_list
+
+
+def measure(run: Callable[[], None]) -> Dict[str, float]:
+    bandwidth_stats.reset()
+    started = time.perf_counter()
+    run()
+    seconds = time.perf_counter() - started
+    totals = bandwidth_stats.totals()
+    totals["seconds"] = seconds
+    return totals
+
+
+def report(title: str, results: Dict[str, Dict[str, float]], link_mbit: float) -> None:
+    print(title)
+    for mode, totals in results.items():
+        wire = totals["request_wire"] + totals["response_wire"]
+        logical = totals["request_logical"] + totals["response_logical"]
+        transfer = wire * 8 / (link_mbit * 1e6)
+        print(
+            f"  {mode:<9} wire {wire / 2**20:>7.2f} MiB  logical {logical / 2**20:>7.2f} MiB  "
+            f"ratio {wire / logical:.2f}  local {totals['seconds']:>6.2f}s  "
+            f"at {link_mbit:g} Mbit/s ~{transfer:>6.2f}s"
+        )
+
+
+def bulk_users(user_client: APIClient, users: List[dict], encoding: str) -> None:
+    Settings.REQUEST_COMPRESSION = encoding
+    try:
+        result = create_users_bulk(user_client, users, verify=False)
+        assert result.all_created, result.failed
+    finally:
+        Settings.REQUEST_COMPRESSION = ""
+
+
+def find_by_status(pet_client: APIClient, status: str, requests: int, accept: str):
+    for _ in range(requests):
+        pet_client.get(
+            "/findByStatus",
+            params={"status": status},
+            headers={"Accept-Encoding": accept},
+            expected_status=200,
+        )
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.bench_compression",
+        description="Compare plain and compressed bodies against the stand-in server",
+    )
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--pets", type=int, default=2000)
+    parser.add_argument("--searches", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument(
+        "--link-mbit",
+        type=float,
+        default=10.0,
+        help="Link speed used to estimate transfer time on a constrained network",
+    )
+    args = parser.parse_args(argv)
+
+    with StandInServer(workers=args.workers, compress_responses=True) as server:
+        Settings.BASE_URL = server.base_url
+        Settings.LOG_REQUESTS = Settings.LOG_RESPONSES = False
+        user_client = APIClient(base_path="/user")
+        pet_client = APIClient(base_path="/pet")
+        bandwidth_stats.start()
+
+        results = {}
+        for encoding in ("identity", "gzip", "deflate"):
+            users = generate_users_list(args.users)
+            results[encoding] = measure(
+                lambda: bulk_users(
+                    user_client, users, "" if encoding == "identity" else encoding
+                )
+            )
+        report(f"bulk creation of {args.users} users", results, args.link_mbit)
+
+        status = f"bench_{uuid.uuid4().hex[:8]}"
+        for _ in range(args.pets):
+            pet_client.post(json_data=generate_pet_data(status=status))
+        results = {
+            accept: measure(
+                lambda: find_by_status(pet_client, status, args.searches, accept)
+            )
+            for accept in ("identity", "gzip", "deflate")
+        }
+        report(
+            f"{args.searches} findByStatus over {args.pets} pets",
+            results,
+            args.link_mbit,
+        )
+
+        bandwidth_stats.stop()
+        user_client.close()
+        pet_client.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
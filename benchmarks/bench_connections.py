@@ -0,0 +1,175 @@
+import argparse
+import json
+import os
+import socket
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from api.adapters import TunedHTTPAdapter, connection_stats, dns_cache
+from config.settings import Settings
+
+
+class _JSONHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        body = json.dumps({"code": 200, "message": "ok"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class LatencyTLSServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, context: ssl.SSLContext, rtt: float):
+        super().__init__(address, _JSONHandler)
+        self.rtt = rtt
+        self.full_handshakes = 0
+        self.resumed_handshakes = 0
+        self.socket = context.wrap_socket(
+            self.socket, server_side=True, do_handshake_on_connect=False
+        )
+
+    def finish_request(self, request, client_address) -> None:
+        request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        time.sleep(self.rtt)
+        try:
+            request.do_handshake()
+        except (ssl.SSLError, OSError):
+            return
+        if request.session_reused:
+            self.resumed_handshakes += 1
+        else:
+            self.full_handshakes += 1
+            time.sleep(self.rtt)
+        super().finish_request(request, client_address)
+
+
+def generate_certificate(directory: str) -> str:
+    cert_path = os.path.join(directory, "localhost.pem")
+    subprocess.run(
+        [
+            "openssl",
+            "req",
+            "-x509",
+            "-newkey",
+            "rsa:2048",
+            "-nodes",
+            "-days",
+            "1",
+            "-subj",
+            "/CN=localhost",
+            "-addext",
+            "subjectAltName=DNS:localhost,IP:127.0.0.1",
+            "-keyout",
+            cert_path,
+            "-out",
+            cert_path,
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return cert_path
+
+
+def start_server(cert_path: str, rtt: float) -> LatencyTLSServer:
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_path)
+    server = LatencyTLSServer(("127.0.0.1", 0), context, rtt)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_churn(adapter_cls, url: str, cert_path: str, requests_count: int) -> float:
+    started = time.perf_counter()
+    for _ in range(requests_count):
+        session = requests.Session()
+        adapter = adapter_cls()
+        session.mount("https://", adapter)
+        session.get(url, verify=cert_path, timeout=10).raise_for_status()
+        session.close()
+    return time.perf_counter() - started
+
+
+def run_first_request(url: str, cert_path: str, warmup: int) -> Dict[str, float]:
+    session = requests.Session()
+    adapter = TunedHTTPAdapter()
+    session.mount("https://", adapter)
+
+    started = time.perf_counter()
+    if warmup:
+        adapter.warm_up(url, cert_path, warmup)
+    warmed = time.perf_counter()
+    session.get(url, verify=cert_path, timeout=10).raise_for_status()
+    finished = time.perf_counter()
+    session.close()
+    return {"warm_up": warmed - started, "first_request": finished - warmed}
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.bench_connections",
+        description="Measure connection warm-up, DNS caching and TLS session reuse against a local TLS server",
+    )
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument(
+        "--rtt", type=float, default=0.005, help="Simulated round trip in seconds"
+    )
+    parser.add_argument("--warmup", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        cert_path = generate_certificate(directory)
+        server = start_server(cert_path, args.rtt)
+        url = f"https://localhost:{server.server_address[1]}/v2/user/logout"
+
+        try:
+            baseline = run_churn(HTTPAdapter, url, cert_path, args.requests)
+            baseline_full = server.full_handshakes
+            print(
+                f"plain adapter, new pool per request: {baseline:.3f}s, "
+                f"{baseline_full} full TLS handshakes"
+            )
+
+            connection_stats.reset()
+            dns_cache.clear()
+            server.full_handshakes = server.resumed_handshakes = 0
+            Settings.TLS_SESSION_REUSE = True
+            tuned = run_churn(TunedHTTPAdapter, url, cert_path, args.requests)
+            print(
+                f"tuned adapter, new pool per request: {tuned:.3f}s, "
+                f"{server.full_handshakes} full / {server.resumed_handshakes} resumed TLS handshakes "
+                f"({baseline / tuned:.2f}x)"
+            )
+            print(f"client counters: {connection_stats.snapshot()}")
+
+            cold = run_first_request(url, cert_path, warmup=0)
+            warm = run_first_request(url, cert_path, warmup=args.warmup)
+            print(
+                f"first request without warm-up: {cold['first_request'] * 1000:.1f}ms, "
+                f"with {args.warmup} warmed connections: {warm['first_request'] * 1000:.1f}ms "
+                f"(warm-up took {warm['warm_up'] * 1000:.1f}ms)"
+            )
+        finally:
+            server.shutdown()
+            server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
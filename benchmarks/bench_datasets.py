@@ -0,0 +1,72 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+from tools.build_dataset import build_dataset
+from utils.data_generators import generate_pet_data
+from utils.datasets import Dataset
+
+
+def measure(action: Callable[[], object]) -> Tuple[float, int]:
+    started = time.perf_counter()
+    action()
+    seconds = time.perf_counter() - started
+    # tracing slows Faker down severalfold, so the peak comes from a second run
+    tracemalloc.start()
+    action()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.bench_datasets",
+        description="Compare generating pets at startup with reading them from "
+        "a memory-mapped dataset",
+    )
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--lookups", type=int, default=10000)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "pets.bin")
+        started = time.perf_counter()
+        build_dataset(path, 0, {"pets": args.records}, args.jobs)
+        print(
+            f"Built {args.records} pets in {time.perf_counter() - started:.1f}s "
+            f"({os.path.getsize(path) / 1024 / 1024:.1f} MiB), once per seed"
+        )
+
+        rng = random.Random(0)
+        lookups = [rng.randrange(args.records) for _ in range(args.lookups)]
+        dataset = Dataset(path)
+        pets = dataset["pets"]
+        rows = [
+            (
+                "generate list",
+                measure(lambda: [generate_pet_data() for _ in range(args.records)]),
+            ),
+            ("open dataset", measure(lambda: Dataset(path).close())),
+            ("stream all", measure(lambda: sum(1 for _ in pets))),
+            (
+                f"{args.lookups} by index",
+                measure(lambda: sum(1 for index in lookups if pets[index])),
+            ),
+        ]
+        dataset.close()
+
+    print(f"  {'':<18} {'seconds':>9} {'peak heap, MiB':>14}")
+    for name, (seconds, peak) in rows:
+        print(f"  {name:<18} {seconds:>9.3f} {peak / 1024 / 1024:>14.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
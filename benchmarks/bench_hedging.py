@@ -0,0 +1,104 @@
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from api.adapters import connection_stats
+from api.client import APIClient
+from api.hedging import hedge_stats, hedger
+from config.settings import Settings
+from server.runner import StandInServer
+from utils.data_generators import generate_pet_data
+
+
+def run(
+    hedge: bool, pet_ids: List[int], concurrency: int, count: int
+) -> Dict[str, float]:
+    Settings.HEDGE_REQUESTS = hedge
+    hedge_stats.reset()
+    hedger.reset()
+    pet_client = APIClient(base_path="/pet")
+    latencies = []
+
+    def get_pet(index: int) -> None:
+        started = time.perf_counter()
+        pet_client.get(f"/{pet_ids[index % len(pet_ids)]}", expected_status=200)
+        latencies.append(time.perf_counter() - started)
+
+    connection_stats.reset()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(get_pet, range(count)))
+    seconds = time.perf_counter() - started
+    sent = connection_stats.snapshot()["requests"]
+    pet_client.close()
+
+    latencies.sort()
+    totals = hedge_stats.totals()
+    return {
+        "seconds": seconds,
+        "p50": latencies[len(latencies) // 2],
+        "p90": latencies[int(len(latencies) * 0.9)],
+        "p99": latencies[int(len(latencies) * 0.99)],
+        "max": latencies[-1],
+        "extra_load": sent / count - 1,
+        "hedge_wins": totals["hedge_wins"],
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.bench_hedging",
+        description="Compare plain and hedged GET requests against a stand-in "
+        "server where every Nth request is slow",
+    )
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--pets", type=int, default=100)
+    parser.add_argument(
+        "--slow-every", type=int, default=50, help="Delay every Nth request"
+    )
+    parser.add_argument(
+        "--slow-delay", type=float, default=0.5, help="Delay of a slow request"
+    )
+    args = parser.parse_args(argv)
+
+    Settings.LOG_REQUESTS = Settings.LOG_RESPONSES = False
+    with StandInServer(
+        workers=args.workers,
+        slow_every=args.slow_every,
+        slow_delay=args.slow_delay,
+    ) as server:
+        Settings.BASE_URL = server.base_url
+        pet_client = APIClient(base_path="/pet")
+        pet_ids = [
+            pet_client.post(json_data=generate_pet_data()).json()["id"]
+            for _ in range(args.pets)
+        ]
+        pet_client.close()
+
+        print(
+            f"{args.requests} GET /pet/{{id}}, {args.concurrency} threads, "
+            f"every {args.slow_every}th request +{args.slow_delay * 1000:g}ms, "
+            f"hedge at p{Settings.HEDGE_PERCENTILE:g}, "
+            f"budget {Settings.HEDGE_BUDGET:.0%}"
+        )
+        print(
+            f"  {'hedging':<7} {'total, s':>8} {'p50, ms':>8} {'p90, ms':>8} "
+            f"{'p99, ms':>8} {'max, ms':>8} {'extra load':>10} {'won':>5}"
+        )
+        for hedge in (False, True):
+            result = run(hedge, pet_ids, args.concurrency, args.requests)
+            print(
+                f"  {'on' if hedge else 'off':<7} {result['seconds']:>8.2f} "
+                f"{result['p50'] * 1000:>8.1f} {result['p90'] * 1000:>8.1f} "
+                f"{result['p99'] * 1000:>8.1f} {result['max'] * 1000:>8.1f} "
+                f"{result['extra_load']:>10.1%} {result['hedge_wins']:>5.0f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
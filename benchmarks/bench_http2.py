@@ -0,0 +1,158 @@
+import argparse
+import asyncio
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from api.adapters import connection_stats
+from api.client import APIClient
+from config.settings import Settings
+from server.runner import StandInServer
+from utils.data_generators import generate_pet_data
+
+
+class LatencyProxy:
+    def __init__(self, upstream: Tuple[str, int], rtt: float):
+        self.upstream = upstream
+        self.rtt = rtt
+        self.port = 0
+        self._connections = multiprocessing.Value("i", 0)
+        self._process: Optional[multiprocessing.Process] = None
+
+    @property
+    def connections(self) -> int:
+        return self._connections.value
+
+    def start(self) -> "LatencyProxy":
+        ports = multiprocessing.SimpleQueue()
+        self._process = multiprocessing.Process(
+            target=self._run, args=(ports,), daemon=True
+        )
+        self._process.start()
+        self.port = ports.get()
+        return self
+
+    def stop(self) -> None:
+        self._process.terminate()
+        self._process.join()
+
+    def _run(self, ports) -> None:
+        loop = asyncio.new_event_loop()
+        tasks = set()
+
+        def accept(reader, writer) -> None:
+            task = loop.create_task(self._accept(reader, writer))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        server = loop.run_until_complete(asyncio.start_server(accept, "127.0.0.1", 0))
+        ports.put(server.sockets[0].getsockname()[1])
+        loop.run_forever()
+
+    async def _accept(self, reader, writer) -> None:
+        with self._connections.get_lock():
+            self._connections.value += 1
+        await asyncio.sleep(self.rtt)
+        upstream_reader, upstream_writer = await asyncio.open_connection(*self.upstream)
+        await asyncio.gather(
+            self._pipe(reader, upstream_writer),
+            self._pipe(upstream_reader, writer),
+            return_exceptions=True,
+        )
+
+    async def _pipe(self, reader, writer) -> None:
+        loop = asyncio.get_running_loop()
+        delay = self.rtt / 2
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                loop.call_later(delay, writer.write, data)
+        finally:
+            loop.call_later(delay, writer.close)
+
+
+def run(
+    transport: str, pet_ids: List[int], concurrency: int, count: int
+) -> Dict[str, float]:
+    Settings.HTTP_TRANSPORT = transport
+    connection_stats.reset()
+    pet_client = APIClient(base_path="/pet")
+    latencies = []
+
+    def get_pet(index: int) -> None:
+        started = time.perf_counter()
+        pet_client.get(f"/{pet_ids[index % len(pet_ids)]}", expected_status=200)
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(get_pet, range(count)))
+    seconds = time.perf_counter() - started
+    pet_client.close()
+
+    latencies.sort()
+    return {
+        "seconds": seconds,
+        "rps": count / seconds,
+        "p50": latencies[len(latencies) // 2],
+        "p99": latencies[int(len(latencies) * 0.99)],
+        "connections": connection_stats.snapshot()["connections_opened"],
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.bench_http2",
+        description="Compare the HTTP/1.1 adapter and the HTTP/2 transport "
+        "against the stand-in server behind a latency proxy",
+    )
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[8, 32, 128], metavar="N"
+    )
+    parser.add_argument(
+        "--rtt", type=float, default=0.02, help="Simulated round trip in seconds"
+    )
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--pets", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    Settings.LOG_REQUESTS = Settings.LOG_RESPONSES = False
+    with StandInServer(workers=args.workers) as server:
+        proxy = LatencyProxy((server.host, server.port), args.rtt).start()
+        Settings.BASE_URL = f"http://127.0.0.1:{proxy.port}{server.base_path}"
+
+        pet_client = APIClient(base_path="/pet")
+        pet_ids = [
+            pet_client.post(json_data=generate_pet_data()).json()["id"]
+            for _ in range(args.pets)
+        ]
+        pet_client.close()
+
+        print(
+            f"{args.requests} GET /pet/{{id}}, rtt {args.rtt * 1000:g}ms, "
+            f"{args.workers} server workers"
+        )
+        print(
+            f"  {'transport':<9} {'threads':>7} {'req/s':>8} {'p50, ms':>8} "
+            f"{'p99, ms':>8} {'client conns':>12} {'proxy conns':>11}"
+        )
+        for concurrency in args.concurrency:
+            for transport in ("http1", "http2"):
+                accepted = proxy.connections
+                result = run(transport, pet_ids, concurrency, args.requests)
+                print(
+                    f"  {transport:<9} {concurrency:>7} {result['rps']:>8.0f} "
+                    f"{result['p50'] * 1000:>8.1f} {result['p99'] * 1000:>8.1f} "
+                    f"{result['connections']:>12} {proxy.connections - accepted:>11}"
+                )
+        proxy.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
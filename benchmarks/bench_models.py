@@ -0,0 +1,131 @@
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from api.models import Model, Order, Pet, User, encode
+from utils.validators import validate_order_data, validate_pet_data, validate_user_data
+
+
+def build_pets(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": pet_id,
+            "category": {"id": pet_id % 10, "name": f"category-{pet_id % 10}"},
+            "name": f"pet-{pet_id}",
+            "photoUrls": [f"https://example.com/{pet_id}.png"],
+            "tags": [{"id": pet_id % 100, "name": f"tag-{pet_id % 100}"}],
+            "status": ("available", "pending", "sold")[pet_id % 3],
+        }
+        for pet_id in range(1, count + 1)
+    ]
+
+
+def build_users(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": user_id,
+            "username": f"user{user_id}",
+            "firstName": f"First{user_id}",
+            "lastName": f"Last{user_id}",
+            "email": f"user{user_id}@example.com",
+            "password": f"secret-{user_id}",
+            "phone": f"+1-555-{user_id:07d}",
+            "userStatus": 0,
+        }
+        for user_id in range(1, count + 1)
+    ]
+
+
+def build_orders(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": order_id,
+            "petId": order_id * 7,
+            "quantity": order_id % 5 + 1,
+            "shipDate": "2024-01-01T00:00:00.000+0000",
+            "status": ("placed", "approved", "delivered")[order_id % 3],
+            "complete": order_id % 2 == 0,
+        }
+        for order_id in range(1, count + 1)
+    ]
+
+
+def retained(decode: Callable[[bytes], Any], raw: bytes) -> Tuple[Any, int]:
+    gc.collect()
+    tracemalloc.start()
+    result = decode(raw)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def best_of(function: Callable[[], Any], repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def compare(
+    name: str,
+    model: type,
+    items: List[Dict[str, Any]],
+    validate: Callable[[Any], bool],
+) -> None:
+    raw = json.dumps(items).encode("utf-8")
+    del items
+
+    dicts, dict_bytes = retained(json.loads, raw)
+    models, model_bytes = retained(model.list_from_json, raw)
+    assert isinstance(models[0], Model) and dict(models[0]) == dicts[0]
+
+    dict_decode = best_of(lambda: json.loads(raw))
+    model_decode = best_of(lambda: model.list_from_json(raw))
+    dict_encode = best_of(lambda: json.dumps(dicts).encode("utf-8"))
+    model_encode = best_of(lambda: encode(models))
+    dict_validate = best_of(lambda: all(map(validate, dicts)))
+    model_validate = best_of(lambda: all(map(validate, models)))
+
+    count = len(dicts)
+    print(f"{count} {name}:")
+    print(
+        f"  memory  dicts {dict_bytes / 2**20:>7.1f} MB  "
+        f"models {model_bytes / 2**20:>7.1f} MB  "
+        f"({dict_bytes / model_bytes:.2f}x, {model_bytes / count:.0f} B each)"
+    )
+    print(
+        f"  decode  dicts {dict_decode * 1000:>7.1f} ms  "
+        f"models {model_decode * 1000:>7.1f} ms"
+    )
+    print(
+        f"  encode  dicts {dict_encode * 1000:>7.1f} ms  "
+        f"models {model_encode * 1000:>7.1f} ms"
+    )
+    print(
+        f"  validate dicts {dict_validate * 1000:>6.1f} ms  "
+        f"models {model_validate * 1000:>7.1f} ms"
+    )
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.bench_models",
+        description="Compare memory and codec speed of plain dicts and slotted models",
+    )
+    parser.add_argument("--count", type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    compare("pets", Pet, build_pets(args.count), validate_pet_data)
+    compare("users", User, build_users(args.count), validate_user_data)
+    compare("orders", Order, build_orders(args.count), validate_order_data)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from api.client import APIClient
+from api.uploads import upload_images
+from config.settings import Settings
+from server.runner import StandInServer
+from utils.data_generators import generate_pet_data
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (2**20 if sys.platform == "darwin" else 2**10)
+
+
+def upload_buffered(
+    pet_client: APIClient, uploads: List[List[Any]], concurrency: int
+) -> Dict[str, Any]:
+    def upload(item: List[Any]) -> int:
+        pet_id, path = item
+        with open(path, "rb") as f:
+            pet_client.post(
+                f"/{pet_id}/uploadImage",
+                files={"file": (os.path.basename(path), f)},
+                headers={"Content-Type": None},
+                expected_status=200,
+            )
+        return os.path.getsize(path)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        total = sum(executor.map(upload, uploads))
+    seconds = time.perf_counter() - started
+    return {
+        "bytes": total,
+        "seconds": round(seconds, 3),
+        "throughput_mb_s": round(total / seconds / 2**20, 2),
+    }
+
+
+def run_mode(args: argparse.Namespace) -> int:
+    Settings.BASE_URL = args.base_url
+    Settings.LOG_REQUESTS = Settings.LOG_RESPONSES = False
+    uploads = json.loads(args.uploads)
+    pet_client = APIClient(base_path="/pet")
+
+    baseline = peak_rss_mb()
+    if args.mode == "streaming":
+        report = upload_images(
+            pet_client, [tuple(item) for item in uploads], args.concurrency
+        )
+        result = report.summary()
+    else:
+        result = upload_buffered(pet_client, uploads, args.concurrency)
+    result["rss_growth_mb"] = round(peak_rss_mb() - baseline, 1)
+    print(json.dumps(result))
+    return 0
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.bench_uploads",
+        description="Compare buffered and streaming image uploads against the stand-in server",
+    )
+    parser.add_argument("--files", type=int, default=8)
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument(
+        "--mode", choices=["buffered", "streaming"], help=argparse.SUPPRESS
+    )
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    parser.add_argument("--uploads", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.mode:
+        return run_mode(args)
+
+    with (
+        tempfile.TemporaryDirectory() as directory,
+        StandInServer(workers=args.workers) as server,
+    ):
+        Settings.BASE_URL = server.base_url
+        Settings.LOG_REQUESTS = Settings.LOG_RESPONSES = False
+        pet_client = APIClient(base_path="/pet")
+
+        uploads = []
+        block = os.urandom(2**20)
+        for index in range(args.files):
+            path = os.path.join(directory, f"image-{index}.png")
+            with open(path, "wb") as f:
+                for _ in range(args.size_mb):
+                    f.write(block)
+            pet = pet_client.post(json_data=generate_pet_data(), expected_status=200)
+            uploads.append([pet.json()["id"], path])
+
+        print(
+            f"{args.files} files x {args.size_mb} MB, concurrency {args.concurrency}, "
+            f"{args.workers} server workers"
+        )
+        for mode in ("buffered", "streaming"):
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "benchmarks.bench_uploads",
+                    f"--mode={mode}",
+                    f"--base-url={server.base_url}",
+                    f"--uploads={json.dumps(uploads)}",
+                    f"--concurrency={args.concurrency}",
+                ],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"{mode:<10} {result['throughput_mb_s']:>8.1f} MB/s  "
+                f"{result['seconds']:>7.2f}s  peak RSS growth {result['rss_growth_mb']:>7.1f} MB"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,42 @@
 import os
+from typing import Dict, Optional
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
+def parse_endpoint_timeouts(value: str) -> Dict[str, float]:
+    timeouts = {}
+    for entry in value.split(","):
+        if not entry.strip():
+            continue
+        endpoint, separator, seconds = entry.rpartition("=")
+        method, _, path = endpoint.strip().rpartition(" ")
+        if not separator or not path.startswith("/"):
+            raise ValueError(
+                f"Invalid ENDPOINT_TIMEOUTS entry {entry.strip()!r}, "
+                "expected '[METHOD] /path=seconds'"
+            )
+        key = f"{method.strip().upper()} {path}" if method.strip() else path
+        timeouts[key] = float(seconds)
+    return timeouts
+
+
 class Settings:
     BASE_URL: str = os.getenv("PETSTORE_BASE_URL", "https://petstore.swagger.io/v2")
 
     REQUEST_TIMEOUT: int = int(os.getenv("REQUEST_TIMEOUT", "30"))
     CONNECT_TIMEOUT: int = int(os.getenv("CONNECT_TIMEOUT", "10"))
+    ENDPOINT_TIMEOUTS: Dict[str, float] = parse_endpoint_timeouts(
+        os.getenv("ENDPOINT_TIMEOUTS", "")
+    )
+    ADAPTIVE_TIMEOUTS: bool = os.getenv("ADAPTIVE_TIMEOUTS", "false").lower() == "true"
+    TIMEOUT_PERCENTILE: float = float(os.getenv("TIMEOUT_PERCENTILE", "99"))
+    TIMEOUT_FACTOR: float = float(os.getenv("TIMEOUT_FACTOR", "3"))
+    TIMEOUT_MIN_SAMPLES: int = int(os.getenv("TIMEOUT_MIN_SAMPLES", "20"))
+    TIMEOUT_FLOOR: float = float(os.getenv("TIMEOUT_FLOOR", "1"))
+    TIMEOUT_CEILING: float = float(os.getenv("TIMEOUT_CEILING", str(REQUEST_TIMEOUT)))
 
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     LOG_REQUESTS: bool = os.getenv("LOG_REQUESTS", "true").lower() == "true"
@@ -18,10 +45,54 @@ class Settings:
     MAX_RETRIES: int = int(os.getenv("MAX_RETRIES", "3"))
     RETRY_DELAY: float = float(os.getenv("RETRY_DELAY", "0.1"))
 
+    WARMUP_CONNECTIONS: int = int(os.getenv("WARMUP_CONNECTIONS", "0"))
+    DNS_CACHE_TTL: float = float(os.getenv("DNS_CACHE_TTL", "60"))
+    TLS_SESSION_REUSE: bool = os.getenv("TLS_SESSION_REUSE", "true").lower() == "true"
+
+    SHARD_INDEX: int = int(os.getenv("SHARD_INDEX", "0"))
+    SHARD_COUNT: int = int(os.getenv("SHARD_COUNT", "1"))
+
+    BULK_CHUNK_SIZE: int = int(os.getenv("BULK_CHUNK_SIZE", "100"))
+    BULK_CONCURRENCY: int = int(os.getenv("BULK_CONCURRENCY", "8"))
+
+    UPLOAD_WINDOW_SIZE: int = int(os.getenv("UPLOAD_WINDOW_SIZE", str(4 * 1024 * 1024)))
+    UPLOAD_CONCURRENCY: int = int(os.getenv("UPLOAD_CONCURRENCY", "4"))
+
+    REQUEST_COMPRESSION: str = os.getenv("REQUEST_COMPRESSION", "").lower()
+    REQUEST_COMPRESSION_MIN_SIZE: int = int(
+        os.getenv("REQUEST_COMPRESSION_MIN_SIZE", "1024")
+    )
+    REQUEST_COMPRESSION_LEVEL: int = int(os.getenv("REQUEST_COMPRESSION_LEVEL", "6"))
+
+    HTTP_TRANSPORT: str = os.getenv("HTTP_TRANSPORT", "http1").lower()
+    HTTP2_MAX_CONNECTIONS: int = int(os.getenv("HTTP2_MAX_CONNECTIONS", "2"))
+    HTTP2_MAX_STREAMS: int = int(os.getenv("HTTP2_MAX_STREAMS", "100"))
+
+    HEDGE_REQUESTS: bool = os.getenv("HEDGE_REQUESTS", "false").lower() == "true"
+    HEDGE_PERCENTILE: float = float(os.getenv("HEDGE_PERCENTILE", "95"))
+    HEDGE_MIN_SAMPLES: int = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+    HEDGE_MIN_DELAY: float = float(os.getenv("HEDGE_MIN_DELAY", "0.05"))
+    HEDGE_BUDGET: float = float(os.getenv("HEDGE_BUDGET", "0.05"))
+
+    DATASET_PATH: str = os.getenv("DATASET_PATH", "")
+
     @classmethod
     def get_base_url(cls) -> str:
         return cls.BASE_URL
 
     @classmethod
-    def get_timeout(cls) -> tuple[int, int]:
+    def get_endpoint_timeout(cls, endpoint: str) -> Optional[float]:
+        if not cls.ENDPOINT_TIMEOUTS:
+            return None
+        timeout = cls.ENDPOINT_TIMEOUTS.get(endpoint)
+        if timeout is None:
+            timeout = cls.ENDPOINT_TIMEOUTS.get(endpoint.partition(" ")[2])
+        return timeout
+
+    @classmethod
+    def get_timeout(cls, endpoint: Optional[str] = None) -> tuple[float, float]:
+        if endpoint is not None:
+            timeout = cls.get_endpoint_timeout(endpoint)
+            if timeout is not None:
+                return (cls.CONNECT_TIMEOUT, timeout)
         return (cls.CONNECT_TIMEOUT, cls.REQUEST_TIMEOUT)
@@ -0,0 +1,65 @@
+import pytest
+
+from api.compression import bandwidth_stats
+
+_enabled_key = pytest.StashKey[bool]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("bandwidth", "request/response byte accounting")
+    group.addoption(
+        "--bandwidth",
+        action="store_true",
+        default=False,
+        help="Count body bytes on the wire and after decoding per endpoint",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    if config.getoption("bandwidth"):
+        bandwidth_stats.reset()
+        bandwidth_stats.start()
+        config.stash[_enabled_key] = True
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    if config.stash.get(_enabled_key, False):
+        bandwidth_stats.stop()
+
+
+def _kib(value: int) -> str:
+    return f"{value / 1024:.1f}"
+
+
+def _ratio(wire: int, logical: int) -> str:
+    return f"{wire / logical:.2f}" if logical else "-"
+
+
+def pytest_terminal_summary(terminalreporter, config: pytest.Config) -> None:
+    if not config.stash.get(_enabled_key, False):
+        return
+    snapshot = bandwidth_stats.snapshot()
+    if not snapshot:
+        return
+
+    terminalreporter.section("bandwidth (KiB, wire / logical)")
+    terminalreporter.write_line(
+        f"{'endpoint':<36} {'requests':>8} {'sent':>9} {'of':>9} {'ratio':>6} "
+        f"{'received':>9} {'of':>9} {'ratio':>6}"
+    )
+    rows = sorted(
+        snapshot.items(),
+        key=lambda item: item[1]["request_wire"] + item[1]["response_wire"],
+        reverse=True,
+    )
+    rows.append(("total", bandwidth_stats.totals()))
+    for key, counters in rows:
+        terminalreporter.write_line(
+            f"{key[-36:]:<36} {counters['requests']:>8} "
+            f"{_kib(counters['request_wire']):>9} "
+            f"{_kib(counters['request_logical']):>9} "
+            f"{_ratio(counters['request_wire'], counters['request_logical']):>6} "
+            f"{_kib(counters['response_wire']):>9} "
+            f"{_kib(counters['response_logical']):>9} "
+            f"{_ratio(counters['response_wire'], counters['response_logical']):>6}"
+        )
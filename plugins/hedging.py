@@ -0,0 +1,52 @@
+import pytest
+
+from api.hedging import hedge_stats, hedger
+from config.settings import Settings
+
+_previous_key = pytest.StashKey[bool]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("hedging", "hedged GET requests")
+    group.addoption(
+        "--hedge",
+        action="store_true",
+        default=False,
+        help="Send a duplicate GET when the first one is slower than "
+        "HEDGE_PERCENTILE of its endpoint (same as HEDGE_REQUESTS=true)",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    if config.getoption("hedge"):
+        config.stash[_previous_key] = Settings.HEDGE_REQUESTS
+        Settings.HEDGE_REQUESTS = True
+    if Settings.HEDGE_REQUESTS:
+        hedge_stats.reset()
+        hedger.reset()
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    previous = config.stash.get(_previous_key, None)
+    if previous is not None:
+        Settings.HEDGE_REQUESTS = previous
+
+
+def pytest_terminal_summary(terminalreporter, config: pytest.Config) -> None:
+    snapshot = hedge_stats.snapshot()
+    if not Settings.HEDGE_REQUESTS or not snapshot:
+        return
+
+    terminalreporter.section("hedged requests")
+    terminalreporter.write_line(
+        f"{'endpoint':<36} {'requests':>8} {'hedged':>7} {'won':>5} "
+        f"{'no budget':>9} {'saved, s':>9}"
+    )
+    rows = sorted(snapshot.items(), key=lambda item: item[1]["hedged"], reverse=True)
+    rows.append(("total", hedge_stats.totals()))
+    for key, counters in rows:
+        terminalreporter.write_line(
+            f"{key[-36:]:<36} {counters['requests']:>8} {counters['hedged']:>7} "
+            f"{counters['hedge_wins']:>5} {counters['budget_exhausted']:>9} "
+            f"{counters['saved_seconds']:>9.2f}"
+        )
@@ -0,0 +1,277 @@
+import json
+import os
+from typing import Dict, List, Optional
+
+import pytest
+
+from utils import hooks
+from utils.stats import holm_adjust, mann_whitney_greater, percentile
+
+KINDS = ["endpoints", "tests"]
+
+
+def load_baseline(path: str) -> Dict[str, Dict[str, List[float]]]:
+    if not path or not os.path.exists(path):
+        return {kind: {} for kind in KINDS}
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return {kind: data.get(kind, {}) for kind in KINDS}
+
+
+class Regression:
+    def __init__(
+        self,
+        kind: str,
+        key: str,
+        baseline: List[float],
+        current: List[float],
+        p_value: float,
+    ):
+        self.kind = kind
+        self.key = key
+        self.baseline = sorted(baseline)
+        self.current = sorted(current)
+        self.p_value = p_value
+        self.adjusted_p = p_value
+
+    def median(self, which: str) -> float:
+        return percentile(getattr(self, which), 50)
+
+    def p90(self, which: str) -> float:
+        return percentile(getattr(self, which), 90)
+
+    @property
+    def slowdown(self) -> float:
+        baseline = self.median("baseline")
+        if baseline <= 0:
+            return float("inf")
+        return self.median("current") / baseline - 1
+
+    @property
+    def delta(self) -> float:
+        return self.median("current") - self.median("baseline")
+
+
+class PerfGate:
+    def __init__(
+        self,
+        baseline: Dict[str, Dict[str, List[float]]],
+        alpha: float,
+        min_slowdown: float,
+        min_delta: float,
+        min_samples: int,
+    ):
+        self.baseline = baseline
+        self.alpha = alpha
+        self.min_slowdown = min_slowdown
+        self.min_delta = min_delta
+        self.min_samples = min_samples
+        self.samples: Dict[str, Dict[str, List[float]]] = {kind: {} for kind in KINDS}
+        self.compared = 0
+        self.regressions: List[Regression] = []
+        self._test_duration: Optional[float] = None
+
+    def start(self) -> None:
+        hooks.subscribe("request", self.on_request)
+
+    def stop(self) -> None:
+        hooks.unsubscribe("request", self.on_request)
+
+    def on_request(
+        self,
+        method: str,
+        endpoint: str,
+        status_code: Optional[int],
+        elapsed: float,
+        **_,
+    ) -> None:
+        if status_code is not None:
+            self.samples["endpoints"].setdefault(f"{method} {endpoint}", []).append(
+                elapsed
+            )
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        if report.when == "setup":
+            self._test_duration = 0.0
+        if self._test_duration is None:
+            return
+        if report.outcome != "passed":
+            self._test_duration = None
+            return
+        self._test_duration += report.duration
+        if report.when == "teardown":
+            self.samples["tests"].setdefault(report.nodeid, []).append(
+                self._test_duration
+            )
+            self._test_duration = None
+
+    def compare(self) -> List[Regression]:
+        candidates = []
+        for kind in KINDS:
+            for key, current in self.samples[kind].items():
+                baseline = self.baseline[kind].get(key, [])
+                if min(len(current), len(baseline)) < self.min_samples:
+                    continue
+                candidates.append(
+                    Regression(
+                        kind,
+                        key,
+                        baseline,
+                        current,
+                        mann_whitney_greater(current, baseline),
+                    )
+                )
+
+        self.compared = len(candidates)
+        adjusted = holm_adjust([candidate.p_value for candidate in candidates])
+        for candidate, p_value in zip(candidates, adjusted):
+            candidate.adjusted_p = p_value
+
+        self.regressions = sorted(
+            (
+                candidate
+                for candidate in candidates
+                if candidate.adjusted_p < self.alpha
+                and candidate.slowdown >= self.min_slowdown
+                and candidate.delta >= self.min_delta
+            ),
+            key=lambda regression: regression.slowdown,
+            reverse=True,
+        )
+        return self.regressions
+
+    def save(self, path: str, limit: int) -> None:
+        data = load_baseline(path)
+        for kind in KINDS:
+            for key, values in self.samples[kind].items():
+                merged = data[kind].get(key, []) + [round(value, 6) for value in values]
+                data[kind][key] = merged[-limit:]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, **data}, f, indent=1, sort_keys=True)
+
+
+_gate_key = pytest.StashKey[PerfGate]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("perf-gate", "latency regression gate")
+    group.addoption(
+        "--perf-baseline",
+        default=None,
+        metavar="PATH",
+        help="Fail the run if endpoint or test latencies regressed against PATH",
+    )
+    group.addoption(
+        "--perf-save-baseline",
+        default=None,
+        metavar="PATH",
+        help="Append this run's latency samples to the baseline at PATH "
+        "(skipped when the gate fails)",
+    )
+    group.addoption(
+        "--perf-baseline-size",
+        type=int,
+        default=500,
+        help="Most recent samples kept per endpoint or test (default: 500)",
+    )
+    group.addoption(
+        "--perf-alpha",
+        type=float,
+        default=0.01,
+        help="Significance level of the one-sided Mann-Whitney U test "
+        "after Holm correction (default: 0.01)",
+    )
+    group.addoption(
+        "--perf-min-slowdown",
+        type=float,
+        default=0.1,
+        help="Minimal relative growth of the median to report (default: 0.1)",
+    )
+    group.addoption(
+        "--perf-min-delta-ms",
+        type=float,
+        default=1.0,
+        help="Minimal absolute growth of the median in ms (default: 1.0)",
+    )
+    group.addoption(
+        "--perf-min-samples",
+        type=int,
+        default=5,
+        help="Samples required on both sides to compare a key (default: 5)",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    baseline_path = config.getoption("perf_baseline")
+    if not baseline_path and not config.getoption("perf_save_baseline"):
+        return
+    if baseline_path and not os.path.exists(baseline_path):
+        raise pytest.UsageError(f"perf baseline not found: {baseline_path}")
+
+    gate = PerfGate(
+        load_baseline(baseline_path),
+        alpha=config.getoption("perf_alpha"),
+        min_slowdown=config.getoption("perf_min_slowdown"),
+        min_delta=config.getoption("perf_min_delta_ms") / 1000,
+        min_samples=config.getoption("perf_min_samples"),
+    )
+    gate.start()
+    config.stash[_gate_key] = gate
+    config.pluginmanager.register(gate, "perf_gate_recorder")
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    gate = config.stash.get(_gate_key, None)
+    if gate is not None:
+        gate.stop()
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    config = session.config
+    gate = config.stash.get(_gate_key, None)
+    if gate is None:
+        return
+
+    if config.getoption("perf_baseline") and gate.compare():
+        if session.exitstatus == pytest.ExitCode.OK:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+        return
+
+    save_path = config.getoption("perf_save_baseline")
+    if save_path:
+        gate.save(save_path, config.getoption("perf_baseline_size"))
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.1f}ms"
+
+
+def pytest_terminal_summary(terminalreporter, config: pytest.Config) -> None:
+    gate = config.stash.get(_gate_key, None)
+    if gate is None or not config.getoption("perf_baseline"):
+        return
+
+    terminalreporter.section("performance gate")
+    if not gate.regressions:
+        terminalreporter.write_line(
+            f"no latency regressions in {gate.compared} compared endpoints and tests "
+            f"(alpha={gate.alpha})"
+        )
+        return
+
+    terminalreporter.write_line(
+        f"{len(gate.regressions)} of {gate.compared} endpoints and tests regressed "
+        f"(alpha={gate.alpha}, Holm-corrected):",
+        red=True,
+    )
+    for regression in gate.regressions:
+        terminalreporter.write_line(
+            f"  {regression.kind[:-1]:<8} {regression.key}\n"
+            f"           p50 {_ms(regression.median('baseline'))} -> "
+            f"{_ms(regression.median('current'))} "
+            f"(+{regression.slowdown:.0%}, +{_ms(regression.delta)})  "
+            f"p90 {_ms(regression.p90('baseline'))} -> "
+            f"{_ms(regression.p90('current'))}  "
+            f"n={len(regression.baseline)}/{len(regression.current)}  "
+            f"p={regression.adjusted_p:.2g}"
+        )
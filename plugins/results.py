@@ -0,0 +1,172 @@
+import json
+import os
+import socket
+import time
+from typing import Any, Dict, Optional
+
+import pytest
+
+from utils import hooks
+
+_sink_key = pytest.StashKey["ResultSink"]()
+
+
+class ResultSink:
+    def __init__(self, path: str, max_requests: int, max_text: int):
+        self.path = path
+        self.max_requests = max_requests
+        self.max_text = max_text
+        self.outcomes: Dict[str, int] = {}
+        self.started = time.time()
+        self._file = None
+        self._current: Optional[Dict[str, Any]] = None
+
+    def start(self, args: Any) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8", buffering=1)
+        self.write(
+            {
+                "type": "session",
+                "started": self.started,
+                "hostname": socket.gethostname(),
+                "pid": os.getpid(),
+                "args": list(args),
+            }
+        )
+        hooks.subscribe("request", self.on_request)
+
+    def stop(self, exitstatus: int) -> None:
+        hooks.unsubscribe("request", self.on_request)
+        self.write(
+            {
+                "type": "session_finish",
+                "exitstatus": int(exitstatus),
+                "duration": round(time.time() - self.started, 3),
+                "outcomes": self.outcomes,
+            }
+        )
+        self._file.close()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, default=str) + "\n")
+
+    def truncate(self, text: str) -> str:
+        if len(text) <= self.max_text:
+            return text
+        return text[: self.max_text] + f"\n... [{len(text) - self.max_text} more chars]"
+
+    def on_request(
+        self,
+        method: str,
+        endpoint: str,
+        status_code: Optional[int],
+        elapsed: float,
+        **_: Any,
+    ) -> None:
+        record = self._current
+        if record is None:
+            return
+        record["request_count"] += 1
+        if len(record["requests"]) < self.max_requests:
+            record["requests"].append(
+                {
+                    "endpoint": f"{method} {endpoint}",
+                    "status": status_code,
+                    "ms": round(elapsed * 1000, 3),
+                }
+            )
+
+    def pytest_runtest_logstart(self, nodeid: str) -> None:
+        self._current = {
+            "type": "test",
+            "nodeid": nodeid,
+            "outcome": "passed",
+            "phase": None,
+            "started": round(time.time(), 3),
+            "duration": 0.0,
+            "setup": 0.0,
+            "call": 0.0,
+            "teardown": 0.0,
+            "request_count": 0,
+            "requests": [],
+        }
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        record = self._current
+        if record is None or report.nodeid != record["nodeid"]:
+            return
+        record[report.when] = round(report.duration, 6)
+        record["duration"] = round(record["duration"] + report.duration, 6)
+        if report.user_properties:
+            record["properties"] = dict(report.user_properties)
+        if report.passed or record["phase"] is not None:
+            return
+
+        if report.when == "call":
+            record["outcome"] = report.outcome
+        elif report.failed:
+            record["outcome"] = "error"
+        else:
+            record["outcome"] = "skipped"
+        record["phase"] = report.when
+        if report.failed:
+            record["longrepr"] = self.truncate(report.longreprtext)
+            if report.caplog:
+                record["log"] = self.truncate(report.caplog)
+
+    def pytest_runtest_logfinish(self, nodeid: str) -> None:
+        record, self._current = self._current, None
+        if record is None:
+            return
+        if record["request_count"] > len(record["requests"]):
+            record["requests_dropped"] = record["request_count"] - len(
+                record["requests"]
+            )
+        self.outcomes[record["outcome"]] = self.outcomes.get(record["outcome"], 0) + 1
+        self.write(record)
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("results", "streaming JSONL results")
+    group.addoption(
+        "--results-jsonl",
+        default=None,
+        metavar="PATH",
+        help="Append one JSON line per finished test to PATH "
+        "(render with python -m tools.results_report)",
+    )
+    group.addoption(
+        "--results-max-requests",
+        type=int,
+        default=200,
+        help="Requests recorded per test, the rest are only counted (default: 200)",
+    )
+    group.addoption(
+        "--results-max-text",
+        type=int,
+        default=20000,
+        help="Characters kept from a failure traceback or captured log "
+        "(default: 20000)",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    path = config.getoption("results_jsonl")
+    if path:
+        sink = ResultSink(
+            path,
+            config.getoption("results_max_requests"),
+            config.getoption("results_max_text"),
+        )
+        sink.start(config.invocation_params.args)
+        config.stash[_sink_key] = sink
+        config.pluginmanager.register(sink, "results_sink")
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    sink = session.config.stash.get(_sink_key, None)
+    if sink is not None:
+        sink.stop(session.exitstatus)
@@ -0,0 +1,156 @@
+import json
+import os
+import socket
+import time
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from config.settings import Settings
+from utils import hooks
+
+DEFAULT_DURATIONS_PATH = ".test_durations.json"
+
+
+def load_durations(path: str) -> Dict[str, float]:
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def assign_shards(
+    nodeids: List[str], durations: Dict[str, float], num_shards: int
+) -> Dict[str, int]:
+    known = [durations[nodeid] for nodeid in nodeids if nodeid in durations]
+    default_cost = sum(known) / len(known) if known else 1.0
+    costs = {nodeid: durations.get(nodeid, default_cost) for nodeid in nodeids}
+
+    loads = [0.0] * num_shards
+    assignment = {}
+    for nodeid in sorted(nodeids, key=lambda nodeid: (-costs[nodeid], nodeid)):
+        shard = min(range(num_shards), key=lambda index: (loads[index], index))
+        assignment[nodeid] = shard
+        loads[shard] += costs[nodeid]
+    return assignment
+
+
+class ShardResults:
+    def __init__(self, shard_id: int, num_shards: int):
+        self.shard_id = shard_id
+        self.num_shards = num_shards
+        self.tests: Dict[str, Dict[str, Any]] = {}
+        self.latency: Dict[str, List[float]] = {}
+        self.started = time.time()
+
+    def on_request(self, method: str, endpoint: str, elapsed: float, **_: Any) -> None:
+        self.latency.setdefault(f"{method} {endpoint}", []).append(round(elapsed, 6))
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        test = self.tests.setdefault(
+            report.nodeid, {"outcome": "passed", "duration": 0.0}
+        )
+        test["duration"] += report.duration
+
+        if report.when == "call":
+            if report.outcome != "passed" and test["outcome"] != "error":
+                test["outcome"] = report.outcome
+        elif report.failed:
+            test["outcome"] = "error"
+        elif report.skipped:
+            test["outcome"] = "skipped"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "shard_id": self.shard_id,
+            "num_shards": self.num_shards,
+            "hostname": socket.gethostname(),
+            "started": self.started,
+            "duration": time.time() - self.started,
+            "tests": self.tests,
+            "latency": self.latency,
+        }
+
+
+_results_key = pytest.StashKey[ShardResults]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("sharding", "deterministic sharding across nodes")
+    group.addoption(
+        "--shard-id",
+        type=int,
+        default=Settings.SHARD_INDEX,
+        help="Index of this node, starting from 0 (default: SHARD_INDEX)",
+    )
+    group.addoption(
+        "--num-shards",
+        type=int,
+        default=Settings.SHARD_COUNT,
+        help="Total number of nodes (default: SHARD_COUNT)",
+    )
+    group.addoption(
+        "--shard-durations",
+        default=DEFAULT_DURATIONS_PATH,
+        metavar="PATH",
+        help=f"JSON with per-test durations used to balance shards (default: {DEFAULT_DURATIONS_PATH})",
+    )
+    group.addoption(
+        "--shard-results",
+        default=None,
+        metavar="PATH",
+        help="Write this node's outcomes and latency samples to PATH",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    shard_id = config.getoption("shard_id")
+    num_shards = config.getoption("num_shards")
+    if num_shards < 1 or not 0 <= shard_id < num_shards:
+        raise pytest.UsageError(
+            f"Invalid shard {shard_id} of {num_shards}: expected 0 <= shard-id < num-shards"
+        )
+
+    Settings.SHARD_INDEX = shard_id
+    Settings.SHARD_COUNT = num_shards
+
+    if config.getoption("shard_results"):
+        results = ShardResults(shard_id, num_shards)
+        hooks.subscribe("request", results.on_request)
+        config.stash[_results_key] = results
+        config.pluginmanager.register(results, "shard_results_recorder")
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: List[pytest.Item]
+) -> None:
+    num_shards = config.getoption("num_shards")
+    if num_shards == 1:
+        return
+
+    shard_id = config.getoption("shard_id")
+    assignment = assign_shards(
+        [item.nodeid for item in items],
+        load_durations(config.getoption("shard_durations")),
+        num_shards,
+    )
+
+    selected = [item for item in items if assignment[item.nodeid] == shard_id]
+    deselected = [item for item in items if assignment[item.nodeid] != shard_id]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+    items[:] = selected
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    results: Optional[ShardResults] = session.config.stash.get(_results_key, None)
+    if results is None:
+        return
+
+    hooks.unsubscribe("request", results.on_request)
+    path = session.config.getoption("shard_results")
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results.to_dict(), f, indent=2)
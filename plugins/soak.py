@@ -0,0 +1,317 @@
+import gc
+import json
+import math
+import os
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from utils.logger import logger
+
+TREND_METRICS = ["traced_memory", "open_fds", "open_sockets", "gc_objects"]
+LEAK_MIN_POINTS = 3
+LEAK_MIN_GROWTH = 0.05
+
+_monitor_key = pytest.StashKey["SoakMonitor"]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("soak", "endurance runs with leak detection")
+    group.addoption(
+        "--soak-duration",
+        type=float,
+        default=None,
+        help="Repeat the selected tests for this many seconds",
+    )
+    group.addoption(
+        "--soak-iterations",
+        type=int,
+        default=None,
+        help="Repeat the selected tests this many times",
+    )
+    group.addoption(
+        "--soak-interval",
+        type=float,
+        default=30.0,
+        help="Seconds between resource samples (default: 30)",
+    )
+    group.addoption(
+        "--soak-frames",
+        type=int,
+        default=10,
+        help="Traceback depth recorded by tracemalloc (default: 10)",
+    )
+    group.addoption(
+        "--soak-top",
+        type=int,
+        default=10,
+        help="Number of top allocating call sites in the report (default: 10)",
+    )
+    group.addoption(
+        "--soak-report",
+        default="soak_report.json",
+        help="Path of the JSON soak report (default: soak_report.json)",
+    )
+
+
+def _open_fd_targets() -> Optional[List[str]]:
+    for fd_dir in ("/proc/self/fd", "/dev/fd"):
+        if not os.path.isdir(fd_dir):
+            continue
+        targets = []
+        for fd in os.listdir(fd_dir):
+            try:
+                targets.append(os.readlink(os.path.join(fd_dir, fd)))
+            except OSError:
+                targets.append("")
+        return targets
+    return None
+
+
+def _slope(xs: List[float], ys: List[float]) -> float:
+    n = len(xs)
+    if n < 2:
+        return 0.0
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    if var_x == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+
+
+def _residual_spread(xs: List[float], ys: List[float], slope: float) -> float:
+    n = len(xs)
+    intercept = sum(ys) / n - slope * sum(xs) / n
+    return math.sqrt(sum((y - intercept - slope * x) ** 2 for x, y in zip(xs, ys)) / n)
+
+
+def _is_leaking(xs: List[float], ys: List[float]) -> bool:
+    if len(xs) < LEAK_MIN_POINTS:
+        return False
+    slope = _slope(xs, ys)
+    fitted_growth = slope * (xs[-1] - xs[0])
+    return fitted_growth > LEAK_MIN_GROWTH * max(abs(ys[0]), 1) and (
+        fitted_growth > 2 * _residual_spread(xs, ys, slope)
+    )
+
+
+class SoakMonitor:
+    def __init__(self, interval: float, frames: int, top: int):
+        self.interval = interval
+        self.frames = frames
+        self.top = top
+        self.samples: List[Dict[str, Any]] = []
+        self.tests_run = 0
+        self.iterations = 0
+        self._started_tracing = False
+        self._started_at = 0.0
+        self._last_sample_at = 0.0
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._final: Optional[tracemalloc.Snapshot] = None
+        self.result: Optional[Dict[str, Any]] = None
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        self._started_at = time.monotonic()
+        self.sample()
+
+    def test_finished(self) -> None:
+        self.tests_run += 1
+        if time.monotonic() - self._last_sample_at >= self.interval:
+            self.sample()
+
+    def iteration_finished(self) -> None:
+        self.iterations += 1
+        if self._baseline is None:
+            self.sample()
+            self._baseline = self._snapshot()
+
+    def sample(self) -> None:
+        gc.collect()
+        now = time.monotonic()
+        current, peak = tracemalloc.get_traced_memory()
+        fds = _open_fd_targets()
+
+        self.samples.append(
+            {
+                "elapsed": round(now - self._started_at, 3),
+                "iteration": self.iterations,
+                "tests_run": self.tests_run,
+                "traced_memory": current,
+                "traced_peak": peak,
+                "open_fds": len(fds) if fds is not None else None,
+                "open_sockets": (
+                    sum(1 for target in fds if target.startswith("socket:"))
+                    if fds is not None and os.path.isdir("/proc/self/fd")
+                    else None
+                ),
+                "gc_objects": len(gc.get_objects()),
+            }
+        )
+        self._last_sample_at = now
+
+    def finish(self) -> Dict[str, Any]:
+        self.sample()
+        self._final = self._snapshot()
+        if self._started_tracing:
+            tracemalloc.stop()
+        self.result = self.report()
+        return self.result
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+                tracemalloc.Filter(False, "<unknown>"),
+            ]
+        )
+
+    def trends(self) -> Dict[str, Dict[str, float]]:
+        measured = [s for s in self.samples if s["iteration"] >= 1] or self.samples
+        result = {}
+        for metric in TREND_METRICS:
+            points = [s for s in measured if s[metric] is not None]
+            if not points:
+                continue
+            elapsed = [s["elapsed"] for s in points]
+            iterations = [s["iteration"] for s in points]
+            values = [s[metric] for s in points]
+            result[metric] = {
+                "first": values[0],
+                "last": values[-1],
+                "growth": values[-1] - values[0],
+                "per_hour": round(_slope(elapsed, values) * 3600, 2),
+                "per_iteration": round(_slope(iterations, values), 2),
+                "leaking": _is_leaking(elapsed, values),
+            }
+        return result
+
+    def top_allocations(self) -> List[Dict[str, Any]]:
+        if self._final is None:
+            return []
+        baseline = self._baseline or self._final
+        stats = self._final.compare_to(baseline, "traceback")
+        growing = [stat for stat in stats if stat.size_diff > 0][: self.top]
+        return [
+            {
+                "size_diff": stat.size_diff,
+                "count_diff": stat.count_diff,
+                "size": stat.size,
+                "traceback": [
+                    f"{frame.filename}:{frame.lineno}"
+                    for frame in reversed(stat.traceback)
+                ],
+            }
+            for stat in growing
+        ]
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "duration": self.samples[-1]["elapsed"] if self.samples else 0.0,
+            "iterations": self.iterations,
+            "tests_run": self.tests_run,
+            "trends": self.trends(),
+            "top_allocations": self.top_allocations(),
+            "samples": self.samples,
+        }
+
+
+def _soak_enabled(config: pytest.Config) -> bool:
+    return (
+        config.getoption("soak_duration") is not None
+        or config.getoption("soak_iterations") is not None
+    )
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtestloop(session: pytest.Session) -> Optional[bool]:
+    config = session.config
+    if not _soak_enabled(config):
+        return None
+
+    if session.testsfailed and not config.option.continue_on_collection_errors:
+        raise session.Interrupted(
+            f"{session.testsfailed} error{'s' if session.testsfailed != 1 else ''} during collection"
+        )
+
+    if config.option.collectonly or not session.items:
+        return True
+
+    duration = config.getoption("soak_duration")
+    iterations = config.getoption("soak_iterations")
+    deadline = time.monotonic() + duration if duration is not None else None
+
+    def should_continue(completed: int) -> bool:
+        if iterations is not None and completed >= iterations:
+            return False
+        if deadline is not None and time.monotonic() >= deadline:
+            return False
+        return True
+
+    monitor = SoakMonitor(
+        interval=config.getoption("soak_interval"),
+        frames=config.getoption("soak_frames"),
+        top=config.getoption("soak_top"),
+    )
+    config.stash[_monitor_key] = monitor
+    monitor.start()
+
+    items = session.items
+    completed = 0
+    try:
+        while True:
+            for i, item in enumerate(items):
+                if i + 1 < len(items):
+                    nextitem = items[i + 1]
+                else:
+                    nextitem = items[0] if should_continue(completed + 1) else None
+                item.config.hook.pytest_runtest_protocol(item=item, nextitem=nextitem)
+                monitor.test_finished()
+                if session.shouldfail:
+                    raise session.Failed(session.shouldfail)
+                if session.shouldstop:
+                    raise session.Interrupted(session.shouldstop)
+            completed += 1
+            monitor.iteration_finished()
+            logger.info(
+                f"Soak iteration {completed} finished, {monitor.tests_run} tests run"
+            )
+            if nextitem is None:
+                break
+    finally:
+        report = monitor.finish()
+        with open(config.getoption("soak_report"), "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    return True
+
+
+def pytest_terminal_summary(terminalreporter, config: pytest.Config) -> None:
+    monitor = config.stash.get(_monitor_key, None)
+    if monitor is None or monitor.result is None:
+        return
+
+    report = monitor.result
+    terminalreporter.section("soak summary")
+    terminalreporter.write_line(
+        f"{report['iterations']} iterations, {report['tests_run']} tests "
+        f"in {report['duration']:.1f}s, report: {config.getoption('soak_report')}"
+    )
+    for metric, trend in report["trends"].items():
+        terminalreporter.write_line(
+            f"{metric:>14}: {trend['first']} -> {trend['last']} "
+            f"(growth {trend['growth']:+}, {trend['per_iteration']:+}/iteration, "
+            f"{trend['per_hour']:+}/hour)"
+            + (" - possible leak" if trend["leaking"] else "")
+        )
+    for site in report["top_allocations"][:5]:
+        terminalreporter.write_line(
+            f"{site['size_diff']:+} B ({site['count_diff']:+} blocks) at {site['traceback'][0]}"
+        )
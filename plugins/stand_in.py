@@ -0,0 +1,49 @@
+import pytest
+
+from config.settings import Settings
+from server.runner import StandInServer
+
+_server_key = pytest.StashKey[StandInServer]()
+_base_url_key = pytest.StashKey[str]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("stand-in", "In-process stand-in Petstore server")
+    group.addoption(
+        "--stand-in",
+        action="store_true",
+        default=False,
+        help="Run the suite against an in-process stand-in server instead of BASE_URL",
+    )
+    group.addoption(
+        "--stand-in-write-lag",
+        type=float,
+        default=0.0,
+        help="Seconds before a write becomes visible on the stand-in (default: 0)",
+    )
+    group.addoption(
+        "--stand-in-compress",
+        action="store_true",
+        default=False,
+        help="Let the stand-in compress responses over 1 KiB",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    if not config.getoption("stand_in"):
+        return
+    server = StandInServer(
+        workers=0,
+        write_lag=config.getoption("stand_in_write_lag"),
+        compress_responses=config.getoption("stand_in_compress"),
+    ).start()
+    config.stash[_server_key] = server
+    config.stash[_base_url_key] = Settings.BASE_URL
+    Settings.BASE_URL = server.base_url
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    server = config.stash.get(_server_key, None)
+    if server is not None:
+        server.stop()
+        Settings.BASE_URL = config.stash[_base_url_key]
@@ -0,0 +1,165 @@
+import csv
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from utils import clock, hooks
+
+COLUMNS = [
+    "wall",
+    "network",
+    "backoff",
+    "polling",
+    "client",
+    "other",
+    "requests",
+]
+
+
+class TimeBreakdown:
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+        self._current: Optional[Dict[str, Any]] = None
+
+    def start(self) -> None:
+        hooks.subscribe("request", self.on_request)
+        hooks.subscribe("retry_wait", self.on_retry_wait)
+
+    def stop(self) -> None:
+        hooks.unsubscribe("request", self.on_request)
+        hooks.unsubscribe("retry_wait", self.on_retry_wait)
+
+    def begin_test(self, nodeid: str) -> None:
+        self._current = {"nodeid": nodeid, "outcome": "passed"}
+        self._current.update({column: 0 for column in COLUMNS})
+
+    def end_test(self, wall: float) -> None:
+        record = self._current
+        self._current = None
+        if record is None:
+            return
+
+        record["wall"] = wall
+        record["network"] = max(record["network"] - record["backoff"], 0.0)
+        record["other"] = max(
+            wall
+            - record["network"]
+            - record["backoff"]
+            - record["polling"]
+            - record["client"],
+            0.0,
+        )
+        self.records.append(record)
+
+    def on_request(self, elapsed: float, overhead: float, **_: Any) -> None:
+        if self._current is not None:
+            self._current["network"] += elapsed
+            self._current["client"] += overhead
+            self._current["requests"] += 1
+
+    def on_retry_wait(self, source: str, seconds: float, **_: Any) -> None:
+        if self._current is not None and source in self._current:
+            self._current[source] += seconds
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        if self._current is not None and report.outcome != "passed":
+            if self._current["outcome"] != "failed":
+                self._current["outcome"] = report.outcome
+
+    def sorted_records(self, column: str) -> List[Dict[str, Any]]:
+        return sorted(self.records, key=lambda record: record[column], reverse=True)
+
+    def write_csv(self, path: str, column: str) -> None:
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=["nodeid", "outcome"] + COLUMNS)
+            writer.writeheader()
+            for record in self.sorted_records(column):
+                writer.writerow(
+                    {
+                        key: round(value, 6) if isinstance(value, float) else value
+                        for key, value in record.items()
+                    }
+                )
+
+
+_breakdown_key = pytest.StashKey[TimeBreakdown]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("time-breakdown", "per-test wall time attribution")
+    group.addoption(
+        "--time-breakdown",
+        default=None,
+        metavar="PATH",
+        help="Write a CSV with network/retry/client time per test to PATH",
+    )
+    group.addoption(
+        "--time-breakdown-sort",
+        default="wall",
+        choices=COLUMNS,
+        help="Column to sort the breakdown by (default: wall)",
+    )
+    group.addoption(
+        "--time-breakdown-top",
+        type=int,
+        default=10,
+        help="Number of slowest tests shown in the terminal summary (default: 10)",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    if config.getoption("time_breakdown"):
+        breakdown = TimeBreakdown()
+        breakdown.start()
+        config.stash[_breakdown_key] = breakdown
+        config.pluginmanager.register(breakdown, "time_breakdown_recorder")
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    breakdown = config.stash.get(_breakdown_key, None)
+    if breakdown is not None:
+        breakdown.stop()
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_protocol(item: pytest.Item, nextitem: Optional[pytest.Item]):
+    breakdown = item.config.stash.get(_breakdown_key, None)
+    if breakdown is None:
+        return (yield)
+
+    breakdown.begin_test(item.nodeid)
+    started = clock.perf_counter()
+    try:
+        return (yield)
+    finally:
+        breakdown.end_test(clock.perf_counter() - started)
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    breakdown = session.config.stash.get(_breakdown_key, None)
+    if breakdown is not None:
+        breakdown.write_csv(
+            session.config.getoption("time_breakdown"),
+            session.config.getoption("time_breakdown_sort"),
+        )
+
+
+def pytest_terminal_summary(terminalreporter, config: pytest.Config) -> None:
+    breakdown = config.stash.get(_breakdown_key, None)
+    if breakdown is None or not breakdown.records:
+        return
+
+    column = config.getoption("time_breakdown_sort")
+    terminalreporter.section(f"time breakdown (sorted by {column})")
+    header = f"{'test':<60} " + " ".join(f"{name:>9}" for name in COLUMNS)
+    terminalreporter.write_line(header)
+    for record in breakdown.sorted_records(column)[
+        : config.getoption("time_breakdown_top")
+    ]:
+        nodeid = record["nodeid"][-60:]
+        values = " ".join(
+            f"{record[name]:>9.3f}" if name != "requests" else f"{record[name]:>9}"
+            for name in COLUMNS
+        )
+        terminalreporter.write_line(f"{nodeid:<60} {values}")
@@ -0,0 +1,123 @@
+import functools
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+
+from utils import clock, tracing
+
+_plugin_key = pytest.StashKey["TracingPlugin"]()
+
+
+class TracingPlugin:
+    def __init__(self, tracer: tracing.Tracer):
+        self.tracer = tracer
+        self.tests: List[Tuple[float, str, str]] = []
+        self._test: Optional[tracing.Span] = None
+        self._teardowns: Dict[Any, tracing.Span] = {}
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_protocol(
+        self, item: pytest.Item, nextitem: Optional[pytest.Item]
+    ):
+        span = self.tracer.new_span(item.nodeid, {"outcome": "passed"}, root=True)
+        item.user_properties.append(("trace_id", span.trace_hex))
+        self.tracer.root = self._test = span
+        started = clock.perf_counter()
+        try:
+            with span:
+                return (yield)
+        finally:
+            self.tracer.root = self._test = None
+            self.tests.append(
+                (clock.perf_counter() - started, item.nodeid, span.trace_hex)
+            )
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        if self._test is not None and report.outcome != "passed":
+            if self._test.attributes["outcome"] != "failed":
+                self._test.set("outcome", report.outcome)
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_setup(self, item: pytest.Item):
+        with self.tracer.new_span("setup", {}):
+            return (yield)
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_call(self, item: pytest.Item):
+        with self.tracer.new_span("call", {}):
+            return (yield)
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_teardown(self, item: pytest.Item, nextitem):
+        with self.tracer.new_span("teardown", {}):
+            return (yield)
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request: pytest.FixtureRequest):
+        attributes = {"fixture": fixturedef.argname, "scope": fixturedef.scope}
+        with self.tracer.new_span(f"setup {fixturedef.argname}", attributes):
+            result = yield
+        fixturedef.addfinalizer(functools.partial(self._begin_teardown, fixturedef))
+        return result
+
+    def _begin_teardown(self, fixturedef) -> None:
+        attributes = {"fixture": fixturedef.argname, "scope": fixturedef.scope}
+        self._teardowns[fixturedef] = self.tracer.new_span(
+            f"teardown {fixturedef.argname}", attributes
+        ).start()
+
+    def pytest_fixture_post_finalizer(self, fixturedef, request) -> None:
+        span = self._teardowns.pop(fixturedef, None)
+        if span is not None:
+            span.finish()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("tracing", "Request and fixture tracing")
+    group.addoption(
+        "--trace-file",
+        default=None,
+        metavar="PATH",
+        help="Write spans for tests, fixtures, requests and polling attempts "
+        "to PATH in Chrome trace format (chrome://tracing, Perfetto)",
+    )
+    group.addoption(
+        "--trace-buffer",
+        type=int,
+        default=1024,
+        help="Spans buffered in memory before a batch is handed to the writer "
+        "thread (default: 1024)",
+    )
+    group.addoption(
+        "--trace-top",
+        type=int,
+        default=5,
+        help="Number of slowest tests listed with their trace ids (default: 5)",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    path = config.getoption("trace_file")
+    if path:
+        tracer = tracing.enable(path, config.getoption("trace_buffer"))
+        plugin = TracingPlugin(tracer)
+        config.stash[_plugin_key] = plugin
+        config.pluginmanager.register(plugin, "tracing_recorder")
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    if config.stash.get(_plugin_key, None) is not None:
+        tracing.disable()
+
+
+def pytest_terminal_summary(terminalreporter, config: pytest.Config) -> None:
+    plugin = config.stash.get(_plugin_key, None)
+    if plugin is None:
+        return
+    terminalreporter.section("tracing")
+    terminalreporter.write_line(
+        f"{plugin.tracer.spans} spans written to {plugin.tracer.path}"
+    )
+    slowest = sorted(plugin.tests, reverse=True)[: config.getoption("trace_top")]
+    for seconds, nodeid, trace_id in slowest:
+        terminalreporter.write_line(f"{seconds:>8.3f}s  {trace_id}  {nodeid}")
@@ -0,0 +1,40 @@
+import pytest
+
+from utils import clock
+
+_clock_key = pytest.StashKey[clock.VirtualClock]()
+_previous_key = pytest.StashKey[clock.Clock]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("virtual-clock", "Virtual clock for retries and polling")
+    group.addoption(
+        "--virtual-clock",
+        action="store_true",
+        default=False,
+        help="Skip retry and polling waits instantly instead of sleeping "
+        "(use with an in-process or lag-free backend)",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    if config.getoption("virtual_clock"):
+        virtual = clock.VirtualClock()
+        config.stash[_clock_key] = virtual
+        config.stash[_previous_key] = clock.set_clock(virtual)
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    previous = config.stash.get(_previous_key, None)
+    if previous is not None:
+        clock.set_clock(previous)
+
+
+def pytest_terminal_summary(terminalreporter, config: pytest.Config) -> None:
+    virtual = config.stash.get(_clock_key, None)
+    if virtual is None:
+        return
+    terminalreporter.section("virtual clock")
+    terminalreporter.write_line(
+        f"skipped {virtual.slept:.2f}s of waiting in {virtual.sleeps} sleeps"
+    )
@@ -0,0 +1,93 @@
+import argparse
+import sys
+import threading
+from typing import List
+
+from server.runner import StandInServer, server_ssl_context
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m server",
+        description="Local stand-in Petstore server for /pet, /store and /user",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Worker processes sharing the listening socket, 0 - serve in-process",
+    )
+    parser.add_argument(
+        "--storage", default=None, help="SQLite file, a temporary one by default"
+    )
+    parser.add_argument(
+        "--write-lag",
+        type=float,
+        default=0.0,
+        help="Seconds before a write becomes visible to reads by id/username",
+    )
+    parser.add_argument("--base-path", default="/v2")
+    parser.add_argument(
+        "--access-log",
+        action="store_true",
+        help="Log each request with the trace id from its traceparent header",
+    )
+    parser.add_argument(
+        "--compress",
+        action="store_true",
+        help="Compress JSON responses over 1 KiB when the client accepts gzip/deflate",
+    )
+    parser.add_argument(
+        "--slow-every",
+        type=int,
+        default=0,
+        help="Delay every Nth request of a worker, like one slow replica of N",
+    )
+    parser.add_argument(
+        "--slow-delay",
+        type=float,
+        default=1.0,
+        help="Seconds a slow request is delayed by (default: 1.0)",
+    )
+    parser.add_argument(
+        "--certfile", default=None, help="PEM certificate chain, serve HTTPS with it"
+    )
+    parser.add_argument(
+        "--keyfile", default=None, help="PEM private key, if not in --certfile"
+    )
+    args = parser.parse_args(argv)
+
+    server = StandInServer(
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        storage_path=args.storage,
+        write_lag=args.write_lag,
+        base_path=args.base_path,
+        access_log=args.access_log,
+        compress_responses=args.compress,
+        slow_every=args.slow_every,
+        slow_delay=args.slow_delay,
+        ssl_context=(
+            server_ssl_context(args.certfile, args.keyfile) if args.certfile else None
+        ),
+    ).start()
+    print(f"Serving Petstore stand-in at {server.base_url} ({args.workers} workers)")
+    print(f"PETSTORE_BASE_URL={server.base_url}", flush=True)
+
+    try:
+        if args.workers > 0:
+            server.wait()
+        else:
+            threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,488 @@
+import gzip
+import json
+import random
+import re
+import socket
+import ssl
+import sys
+import threading
+import zlib
+from contextlib import contextmanager
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from server.multipart import MultipartError, parse_boundary, read_multipart
+from server.storage import PetstoreStorage
+
+Route = Tuple[str, "re.Pattern[str]", str]
+
+STREAMING_HANDLERS = {"upload_image"}
+
+COMPRESS_MIN_SIZE = 1024
+
+DRAIN_TIMEOUT = 10.0
+
+HTTP2_PREFACE = b"PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n"
+
+
+class BadRequest(Exception):
+    pass
+
+
+class UnsupportedEncoding(Exception):
+    pass
+
+
+def _route(method: str, pattern: str, handler: str) -> Route:
+    return method, re.compile(f"^{pattern}$"), handler
+
+
+ROUTES: List[Route] = [
+    _route("GET", r"/pet/findByStatus", "find_pets_by_status"),
+    _route("GET", r"/pet/findByTags", "find_pets_by_tags"),
+    _route("POST", r"/pet", "create_pet"),
+    _route("PUT", r"/pet", "update_pet"),
+    _route("GET", r"/pet/(?P<pet_id>[^/]+)", "get_pet"),
+    _route("POST", r"/pet/(?P<pet_id>[^/]+)", "update_pet_form"),
+    _route("DELETE", r"/pet/(?P<pet_id>[^/]+)", "delete_pet"),
+    _route("POST", r"/pet/(?P<pet_id>[^/]+)/uploadImage", "upload_image"),
+    _route("GET", r"/store/inventory", "get_inventory"),
+    _route("POST", r"/store/order", "place_order"),
+    _route("GET", r"/store/order/(?P<order_id>[^/]+)", "get_order"),
+    _route("DELETE", r"/store/order/(?P<order_id>[^/]+)", "delete_order"),
+    _route("GET", r"/user/login", "login"),
+    _route("GET", r"/user/logout", "logout"),
+    _route("POST", r"/user/createWithList", "create_users"),
+    _route("POST", r"/user/createWithArray", "create_users"),
+    _route("POST", r"/user", "create_user"),
+    _route("GET", r"/user/(?P<username>[^/]+)", "get_user"),
+    _route("PUT", r"/user/(?P<username>[^/]+)", "update_user"),
+    _route("DELETE", r"/user/(?P<username>[^/]+)", "delete_user"),
+]
+
+
+def _message(code: int, message: str, kind: str = "unknown") -> Dict[str, Any]:
+    return {"code": code, "type": kind, "message": message}
+
+
+def _decode_body(body: bytes, encoding: str) -> bytes:
+    encoding = encoding.strip().lower()
+    if not body or encoding in ("", "identity"):
+        return body
+    try:
+        if encoding == "gzip":
+            return gzip.decompress(body)
+        if encoding == "deflate":
+            return zlib.decompress(body)
+    except (OSError, EOFError, zlib.error):
+        raise BadRequest(f"Request body is not valid {encoding} data")
+    raise UnsupportedEncoding(f"Unsupported Content-Encoding: {encoding}")
+
+
+def _accepted_encoding(header: str) -> Optional[str]:
+    accepted = {}
+    for item in header.split(","):
+        coding, _, parameters = item.strip().partition(";")
+        quality = 1.0
+        if parameters.strip().startswith("q="):
+            try:
+                quality = float(parameters.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    for coding in ("gzip", "deflate"):
+        if accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+
+def _integer(value: Any, field: str) -> int:
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise BadRequest(f"'{field}' must be an integer")
+    return value
+
+
+def _path_integer(value: str) -> Optional[int]:
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def _entity(body: Any, kind: str) -> Dict[str, Any]:
+    if not isinstance(body, dict):
+        raise BadRequest(f"{kind} must be a JSON object")
+    return body
+
+
+def _pet(body: Any) -> Dict[str, Any]:
+    pet = _entity(body, "Pet")
+    if "id" in pet:
+        _integer(pet["id"], "id")
+    else:
+        pet = {"id": random.getrandbits(62), **pet}
+    if pet.get("status") is not None and not isinstance(pet["status"], str):
+        raise BadRequest("'status' must be a string")
+    return pet
+
+
+def _order(body: Any) -> Dict[str, Any]:
+    order = _entity(body, "Order")
+    for field in ("id", "petId", "quantity"):
+        if field in order:
+            _integer(order[field], field)
+    if "id" not in order:
+        order = {"id": random.getrandbits(62), **order}
+    return {"complete": False, **order}
+
+
+def _user(body: Any) -> Dict[str, Any]:
+    user = _entity(body, "User")
+    if "id" in user:
+        _integer(user["id"], "id")
+    if not isinstance(user.get("username"), str):
+        raise BadRequest("'username' must be a string")
+    return user
+
+
+class PetstoreHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: "PetstoreHTTPServer"
+
+    def handle(self) -> None:
+        if self.rfile.peek(len(HTTP2_PREFACE)).startswith(HTTP2_PREFACE):
+            # h2c with prior knowledge; h2 is only needed by HTTP/2 clients
+            from server.http2 import HTTP2ServerConnection
+
+            return HTTP2ServerConnection(self).serve()
+        super().handle()
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def log_request(self, code: Any = "-", size: Any = "-") -> None:
+        if not self.server.access_log:
+            return
+        parts = self.headers.get("traceparent", "").split("-")
+        trace_id = parts[1] if len(parts) == 4 else "-"
+        sys.stderr.write(
+            f"{self.log_date_time_string()} {self.command} {self.path} "
+            f"{getattr(code, 'value', code)} trace_id={trace_id}\n"
+        )
+
+    def do_GET(self) -> None:
+        self.dispatch()
+
+    def do_POST(self) -> None:
+        self.dispatch()
+
+    def do_PUT(self) -> None:
+        self.dispatch()
+
+    def do_DELETE(self) -> None:
+        self.dispatch()
+
+    @property
+    def storage(self) -> PetstoreStorage:
+        return self.server.storage
+
+    def dispatch(self) -> None:
+        with self.server.in_flight():
+            self.handle_request()
+
+    def handle_request(self) -> None:
+        if self.server.is_slow_request():
+            self.server.closing.wait(self.server.slow_delay)
+        url = urlsplit(self.path)
+        self.query = parse_qs(url.query)
+        handler, arguments, status = self.resolve(url.path)
+
+        self.body = b"" if handler in STREAMING_HANDLERS else self.read_body()
+        if handler is None:
+            message = "Method not allowed" if status == 405 else "Not found"
+            return self.send_json(status, _message(status, message))
+
+        try:
+            self.body = _decode_body(
+                self.body, self.headers.get("Content-Encoding", "")
+            )
+            getattr(self, handler)(**arguments)
+        except BadRequest as e:
+            self.send_json(HTTPStatus.BAD_REQUEST, _message(400, str(e), "error"))
+        except UnsupportedEncoding as e:
+            self.send_json(
+                HTTPStatus.UNSUPPORTED_MEDIA_TYPE, _message(415, str(e), "error")
+            )
+
+    def resolve(self, path: str) -> Tuple[Optional[str], Dict[str, str], int]:
+        if not path.startswith(self.server.base_path):
+            return None, {}, HTTPStatus.NOT_FOUND
+        path = path[len(self.server.base_path) :].rstrip("/") or "/"
+
+        status = HTTPStatus.NOT_FOUND
+        for method, pattern, name in ROUTES:
+            match = pattern.match(path)
+            if match is None:
+                continue
+            if method != self.command:
+                status = HTTPStatus.METHOD_NOT_ALLOWED
+                continue
+            arguments = {
+                key: unquote(value) for key, value in match.groupdict().items()
+            }
+            return name, arguments, HTTPStatus.OK
+        return None, {}, status
+
+    @property
+    def content_length(self) -> int:
+        return int(self.headers.get("Content-Length") or 0)
+
+    def read_body(self) -> bytes:
+        length = self.content_length
+        return self.rfile.read(length) if length else b""
+
+    def json_body(self) -> Any:
+        try:
+            return json.loads(self.body)
+        except ValueError:
+            raise BadRequest("Request body is not valid JSON")
+
+    def form_body(self) -> Dict[str, str]:
+        form = parse_qs(self.body.decode("utf-8"))
+        return {key: values[-1] for key, values in form.items()}
+
+    def query_values(self, name: str) -> List[str]:
+        return [
+            value
+            for values in self.query.get(name, [])
+            for value in values.split(",")
+            if value
+        ]
+
+    def send_json(self, status: int, payload: Any) -> None:
+        self.send_raw_json(status, json.dumps(payload))
+
+    def send_raw_json(self, status: int, body: str) -> None:
+        encoded = body.encode("utf-8")
+        coding = None
+        if self.server.compress_responses and len(encoded) >= COMPRESS_MIN_SIZE:
+            coding = _accepted_encoding(self.headers.get("Accept-Encoding", ""))
+        if coding == "gzip":
+            encoded = gzip.compress(encoded, compresslevel=6, mtime=0)
+        elif coding == "deflate":
+            encoded = zlib.compress(encoded, 6)
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if coding is not None:
+            self.send_header("Content-Encoding", coding)
+        if self.server.compress_responses:
+            self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def send_found(self, body: Optional[str], kind: str) -> None:
+        if body is None:
+            return self.send_json(
+                HTTPStatus.NOT_FOUND, _message(1, f"{kind} not found", "error")
+            )
+        self.send_raw_json(HTTPStatus.OK, body)
+
+    def send_deleted(self, deleted: bool, key: Any) -> None:
+        if not deleted:
+            self.send_response(HTTPStatus.NOT_FOUND)
+            self.send_header("Content-Length", "0")
+            return self.end_headers()
+        self.send_json(HTTPStatus.OK, _message(200, str(key)))
+
+    def find_pets_by_status(self) -> None:
+        bodies = self.storage.find_pets_by_status(self.query_values("status"))
+        self.send_raw_json(HTTPStatus.OK, f"[{','.join(bodies)}]")
+
+    def find_pets_by_tags(self) -> None:
+        bodies = self.storage.find_pets_by_tags(self.query_values("tags"))
+        self.send_raw_json(HTTPStatus.OK, f"[{','.join(bodies)}]")
+
+    def create_pet(self) -> None:
+        self.send_json(HTTPStatus.OK, self.storage.put_pet(_pet(self.json_body())))
+
+    def update_pet(self) -> None:
+        pet = _entity(self.json_body(), "Pet")
+        _integer(pet.get("id"), "id")
+        self.send_json(HTTPStatus.OK, self.storage.put_pet(_pet(pet)))
+
+    def get_pet(self, pet_id: str) -> None:
+        pet_id = _path_integer(pet_id)
+        self.send_found(
+            self.storage.get_pet(pet_id) if pet_id is not None else None, "Pet"
+        )
+
+    def update_pet_form(self, pet_id: str) -> None:
+        key = _path_integer(pet_id)
+        changes = {
+            field: value
+            for field, value in self.form_body().items()
+            if field in ("name", "status")
+        }
+        pet = self.storage.update_pet(key, **changes) if key is not None else None
+        if pet is None:
+            return self.send_json(
+                HTTPStatus.NOT_FOUND, _message(404, "not found", "unknown")
+            )
+        self.send_json(HTTPStatus.OK, _message(200, str(key)))
+
+    def delete_pet(self, pet_id: str) -> None:
+        key = _path_integer(pet_id)
+        self.send_deleted(key is not None and self.storage.delete_pet(key), pet_id)
+
+    def upload_image(self, pet_id: str) -> None:
+        boundary = parse_boundary(self.headers.get("Content-Type", ""))
+        if boundary is None:
+            self.read_body()
+            raise BadRequest("Expected a multipart/form-data body")
+        try:
+            fields, files = read_multipart(self.rfile, self.content_length, boundary)
+        except MultipartError as e:
+            self.close_connection = True
+            raise BadRequest(str(e))
+
+        key = _path_integer(pet_id)
+        if key is None or self.storage.get_pet(key) is None:
+            return self.send_json(
+                HTTPStatus.NOT_FOUND, _message(1, "Pet not found", "error")
+            )
+        if "file" not in files:
+            raise BadRequest("Missing 'file' part")
+
+        filename, size = files["file"]
+        message = (
+            f"additionalMetadata: {fields.get('additionalMetadata', 'null')}\n"
+            f"File uploaded to ./{filename}, {size} bytes"
+        )
+        self.send_json(HTTPStatus.OK, _message(200, message))
+
+    def get_inventory(self) -> None:
+        self.send_json(HTTPStatus.OK, self.storage.inventory())
+
+    def place_order(self) -> None:
+        self.send_json(HTTPStatus.OK, self.storage.put_order(_order(self.json_body())))
+
+    def get_order(self, order_id: str) -> None:
+        order_id = _path_integer(order_id)
+        self.send_found(
+            self.storage.get_order(order_id) if order_id is not None else None,
+            "Order",
+        )
+
+    def delete_order(self, order_id: str) -> None:
+        key = _path_integer(order_id)
+        if key is None or not self.storage.delete_order(key):
+            return self.send_json(
+                HTTPStatus.NOT_FOUND, _message(404, "Order Not Found")
+            )
+        self.send_json(HTTPStatus.OK, _message(200, order_id))
+
+    def login(self) -> None:
+        session = random.getrandbits(40)
+        self.send_json(
+            HTTPStatus.OK, _message(200, f"logged in user session:{session}")
+        )
+
+    def logout(self) -> None:
+        self.send_json(HTTPStatus.OK, _message(200, "ok"))
+
+    def create_users(self) -> None:
+        users = self.json_body()
+        if not isinstance(users, list):
+            raise BadRequest("Expected a JSON array of users")
+        self.storage.put_users([_user(user) for user in users])
+        self.send_json(HTTPStatus.OK, _message(200, "ok"))
+
+    def create_user(self) -> None:
+        user = self.storage.put_user(_user(self.json_body()))
+        self.send_json(HTTPStatus.OK, _message(200, str(user.get("id", 0))))
+
+    def get_user(self, username: str) -> None:
+        self.send_found(self.storage.get_user(username), "User")
+
+    def update_user(self, username: str) -> None:
+        user = _user({**_entity(self.json_body(), "User"), "username": username})
+        self.storage.put_user(user)
+        self.send_json(HTTPStatus.OK, _message(200, str(user.get("id", 0))))
+
+    def delete_user(self, username: str) -> None:
+        self.send_deleted(self.storage.delete_user(username), username)
+
+
+class PetstoreHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        storage: PetstoreStorage,
+        base_path: str = "/v2",
+        handler: Callable[..., BaseHTTPRequestHandler] = PetstoreHandler,
+        bind_and_activate: bool = True,
+        access_log: bool = False,
+        compress_responses: bool = False,
+        slow_every: int = 0,
+        slow_delay: float = 0.0,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ):
+        super().__init__(address, handler, bind_and_activate=bind_and_activate)
+        self.storage = storage
+        self.ssl_context = ssl_context
+        self.base_path = base_path.rstrip("/")
+        self.access_log = access_log
+        self.compress_responses = compress_responses
+        self.slow_every = slow_every
+        self.slow_delay = slow_delay
+        self._served = 0
+        self._served_lock = threading.Lock()
+        self._in_flight = 0
+        self._idle = threading.Condition()
+        self.closing = threading.Event()
+
+    @contextmanager
+    def in_flight(self) -> Iterator[None]:
+        with self._idle:
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._idle:
+                self._in_flight -= 1
+                self._idle.notify_all()
+
+    def get_request(self) -> Tuple[socket.socket, Any]:
+        sock, address = super().get_request()
+        if self.ssl_context is not None:
+            # The handshake runs on the first read, in the handler thread
+            sock = self.ssl_context.wrap_socket(
+                sock, server_side=True, do_handshake_on_connect=False
+            )
+        return sock, address
+
+    def server_close(self) -> None:
+        self.closing.set()
+        super().server_close()
+        with self._idle:
+            self._idle.wait_for(lambda: self._in_flight == 0, DRAIN_TIMEOUT)
+
+    def handle_error(self, request: Any, client_address: Tuple[str, int]) -> None:
+        if isinstance(sys.exc_info()[1], (ConnectionError, ssl.SSLError)):
+            return
+        super().handle_error(request, client_address)
+
+    def is_slow_request(self) -> bool:
+        if self.slow_every <= 0:
+            return False
+        with self._served_lock:
+            self._served += 1
+            return self._served % self.slow_every == 0
@@ -0,0 +1,198 @@
+import os
+import sys
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.client import HTTPMessage
+from io import BytesIO
+from typing import Dict, List, Tuple
+
+import h2.config
+import h2.connection
+import h2.events
+import h2.exceptions
+import h2.settings
+
+from server.app import PetstoreHandler
+
+WINDOW_SIZE = 4 * 1024 * 1024
+READ_SIZE = 65536
+MAX_CONCURRENT_STREAMS = 128
+CONNECTION_HEADERS = {"connection", "keep-alive", "transfer-encoding", "upgrade"}
+
+Headers = List[Tuple[str, str]]
+
+_stream_executor = ThreadPoolExecutor(thread_name_prefix="h2-stream", max_workers=256)
+
+
+def _reset_stream_executor() -> None:
+    # A worker process forked after h2c was served in its parent inherits an
+    # executor whose threads stayed in the parent, submitted streams would never run
+    global _stream_executor
+    _stream_executor = ThreadPoolExecutor(
+        thread_name_prefix="h2-stream", max_workers=256
+    )
+
+
+os.register_at_fork(after_in_child=_reset_stream_executor)
+
+
+class HTTP2StreamHandler(PetstoreHandler):
+    def __init__(
+        self,
+        connection: "HTTP2ServerConnection",
+        stream_id: int,
+        headers: Headers,
+        body: bytes,
+    ):
+        self.h2_connection = connection
+        self.stream_id = stream_id
+        self.server = connection.server
+        self.client_address = connection.client_address
+        self.request_version = "HTTP/2"
+        self.close_connection = False
+
+        self.headers = HTTPMessage()
+        pseudo = {}
+        for name, value in headers:
+            if name.startswith(":"):
+                pseudo[name] = value
+            else:
+                self.headers[name] = value
+        if "Content-Length" not in self.headers:
+            self.headers["Content-Length"] = str(len(body))
+        self.command = pseudo.get(":method", "")
+        self.path = pseudo.get(":path", "/")
+        self.requestline = f"{self.command} {self.path} HTTP/2"
+
+        self.rfile = BytesIO(body)
+        self.wfile = BytesIO()
+        self.status = HTTPStatus.INTERNAL_SERVER_ERROR
+        self.response_headers: Headers = []
+
+    def send_response(self, code: int, message: str = None) -> None:
+        self.log_request(code)
+        self.status = code
+
+    def send_header(self, keyword: str, value: str) -> None:
+        if keyword.lower() not in CONNECTION_HEADERS:
+            self.response_headers.append((keyword.lower(), str(value)))
+
+    def end_headers(self) -> None:
+        pass
+
+    def run(self) -> None:
+        try:
+            self.dispatch()
+        except Exception:
+            traceback.print_exc(file=sys.stderr)
+            self.status = HTTPStatus.INTERNAL_SERVER_ERROR
+            self.response_headers = [("content-length", "0")]
+            self.wfile = BytesIO()
+        self.h2_connection.respond(
+            self.stream_id,
+            int(self.status),
+            self.response_headers,
+            self.wfile.getvalue(),
+        )
+
+
+class HTTP2ServerConnection:
+    def __init__(self, handler: PetstoreHandler):
+        self.server = handler.server
+        self.client_address = handler.client_address
+        self._rfile = handler.rfile
+        self._sock = handler.connection
+        self._h2 = h2.connection.H2Connection(
+            h2.config.H2Configuration(client_side=False, header_encoding="utf-8")
+        )
+        self._lock = threading.Condition()
+        self._requests: Dict[int, Tuple[Headers, List[bytes]]] = {}
+        self.closed = False
+
+    def serve(self) -> None:
+        with self._lock:
+            self._h2.initiate_connection()
+            self._h2.update_settings(
+                {
+                    h2.settings.SettingCodes.MAX_CONCURRENT_STREAMS: (
+                        MAX_CONCURRENT_STREAMS
+                    ),
+                    h2.settings.SettingCodes.INITIAL_WINDOW_SIZE: WINDOW_SIZE,
+                }
+            )
+            self._h2.increment_flow_control_window(WINDOW_SIZE)
+            self._flush()
+
+        try:
+            while not self.closed:
+                data = self._rfile.read1(READ_SIZE)
+                if not data:
+                    break
+                with self._lock:
+                    for event in self._h2.receive_data(data):
+                        self._handle(event)
+                    self._flush()
+                    self._lock.notify_all()
+        except (OSError, h2.exceptions.H2Error):
+            pass
+        finally:
+            with self._lock:
+                self.closed = True
+                self._lock.notify_all()
+
+    def _handle(self, event: h2.events.Event) -> None:
+        if isinstance(event, h2.events.RequestReceived):
+            self._requests[event.stream_id] = (event.headers, [])
+        elif isinstance(event, h2.events.DataReceived):
+            request = self._requests.get(event.stream_id)
+            if request is not None:
+                request[1].append(event.data)
+            self._h2.acknowledge_received_data(
+                event.flow_controlled_length, event.stream_id
+            )
+        elif isinstance(event, h2.events.StreamEnded):
+            request = self._requests.pop(event.stream_id, None)
+            if request is not None:
+                handler = HTTP2StreamHandler(
+                    self, event.stream_id, request[0], b"".join(request[1])
+                )
+                _stream_executor.submit(handler.run)
+        elif isinstance(event, h2.events.StreamReset):
+            self._requests.pop(event.stream_id, None)
+        elif isinstance(event, h2.events.ConnectionTerminated):
+            self.closed = True
+
+    def respond(
+        self, stream_id: int, status: int, headers: Headers, body: bytes
+    ) -> None:
+        view = memoryview(body)
+        with self._lock:
+            try:
+                self._h2.send_headers(
+                    stream_id, [(":status", str(status))] + headers, end_stream=not body
+                )
+                while view:
+                    window = min(
+                        self._h2.local_flow_control_window(stream_id),
+                        self._h2.max_outbound_frame_size,
+                    )
+                    if window <= 0:
+                        self._flush()
+                        self._lock.wait()
+                        if self.closed:
+                            return
+                        continue
+                    self._h2.send_data(
+                        stream_id, bytes(view[:window]), end_stream=len(view) <= window
+                    )
+                    view = view[window:]
+                self._flush()
+            except (OSError, h2.exceptions.H2Error):
+                pass
+
+    def _flush(self) -> None:
+        data = self._h2.data_to_send()
+        if data:
+            self._sock.sendall(data)
@@ -0,0 +1,99 @@
+import re
+from typing import BinaryIO, Dict, Optional, Tuple
+
+READ_SIZE = 256 * 1024
+
+_BOUNDARY = re.compile(r'boundary="?([^";]+)"?')
+_DISPOSITION = re.compile(rb'(\w+)="([^"]*)"')
+
+
+class MultipartError(ValueError):
+    pass
+
+
+class MultipartPart:
+    def __init__(self, headers: bytes):
+        params: Dict[str, str] = {}
+        for line in headers.split(b"\r\n"):
+            name, _, value = line.partition(b":")
+            if name.strip().lower() == b"content-disposition":
+                params = {
+                    key.decode("latin-1"): item.decode("utf-8")
+                    for key, item in _DISPOSITION.findall(value)
+                }
+        self.name = params.get("name", "")
+        self.filename: Optional[str] = params.get("filename")
+        self.size = 0
+        self.value = bytearray()
+
+    def feed(self, data: memoryview) -> None:
+        self.size += len(data)
+        if self.filename is None:
+            self.value += data
+
+
+def parse_boundary(content_type: str) -> Optional[str]:
+    match = _BOUNDARY.search(content_type or "")
+    return match.group(1) if match else None
+
+
+def read_multipart(
+    stream: BinaryIO, length: int, boundary: str
+) -> Tuple[Dict[str, str], Dict[str, Tuple[str, int]]]:
+    delimiter = b"\r\n--" + boundary.encode("latin-1")
+    buffer = bytearray(b"\r\n")
+    remaining = length
+    state = "preamble"
+    part: Optional[MultipartPart] = None
+    fields: Dict[str, str] = {}
+    files: Dict[str, Tuple[str, int]] = {}
+
+    while state != "done":
+        if remaining > 0:
+            chunk = stream.read(min(READ_SIZE, remaining))
+            if not chunk:
+                raise MultipartError("Unexpected end of multipart body")
+            remaining -= len(chunk)
+            buffer += chunk
+
+        progress = True
+        while progress and state != "done":
+            progress = False
+            if state == "preamble":
+                index = buffer.find(delimiter)
+                if index >= 0:
+                    del buffer[: index + len(delimiter)]
+                    state, progress = "headers", True
+            elif state == "headers":
+                if buffer[:2] == b"--":
+                    state = "done"
+                    continue
+                end = buffer.find(b"\r\n\r\n")
+                if end >= 0:
+                    part = MultipartPart(bytes(buffer[2:end]))
+                    del buffer[: end + 4]
+                    state, progress = "data", True
+            else:
+                index = buffer.find(delimiter)
+                consumed = index if index >= 0 else len(buffer) - len(delimiter) + 1
+                if consumed > 0:
+                    with memoryview(buffer) as view:
+                        part.feed(view[:consumed])
+                    del buffer[:consumed]
+                if index >= 0:
+                    del buffer[: len(delimiter)]
+                    if part.filename is None:
+                        fields[part.name] = part.value.decode("utf-8", "replace")
+                    else:
+                        files[part.name] = (part.filename, part.size)
+                    state, progress = "headers", True
+
+        if remaining <= 0 and state != "done":
+            raise MultipartError("Multipart body is not terminated")
+
+    while remaining > 0:
+        chunk = stream.read(min(READ_SIZE, remaining))
+        if not chunk:
+            break
+        remaining -= len(chunk)
+    return fields, files
@@ -0,0 +1,169 @@
+import multiprocessing
+import os
+import socket
+import ssl
+import tempfile
+import threading
+from typing import List, Optional
+
+from server.app import PetstoreHTTPServer
+from server.storage import PetstoreStorage
+
+
+def _serve(
+    sock: socket.socket,
+    storage_path: str,
+    write_lag: float,
+    base_path: str,
+    access_log: bool,
+    compress_responses: bool,
+    slow_every: int,
+    slow_delay: float,
+    ssl_context: Optional[ssl.SSLContext],
+) -> None:
+    storage = PetstoreStorage(storage_path, write_lag)
+    server = PetstoreHTTPServer(
+        sock.getsockname()[:2],
+        storage,
+        base_path,
+        bind_and_activate=False,
+        access_log=access_log,
+        compress_responses=compress_responses,
+        slow_every=slow_every,
+        slow_delay=slow_delay,
+        ssl_context=ssl_context,
+    )
+    server.socket.close()
+    server.socket = sock
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def server_ssl_context(certfile: str, keyfile: Optional[str] = None) -> ssl.SSLContext:
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(certfile, keyfile)
+    context.set_alpn_protocols(["h2", "http/1.1"])
+    return context
+
+
+class StandInServer:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        workers: int = 1,
+        storage_path: Optional[str] = None,
+        write_lag: float = 0.0,
+        base_path: str = "/v2",
+        access_log: bool = False,
+        compress_responses: bool = False,
+        slow_every: int = 0,
+        slow_delay: float = 0.0,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.write_lag = write_lag
+        self.base_path = base_path
+        self.access_log = access_log
+        self.compress_responses = compress_responses
+        self.slow_every = slow_every
+        self.slow_delay = slow_delay
+        self.ssl_context = ssl_context
+        self._owns_storage = storage_path is None
+        self.storage_path = storage_path or os.path.join(
+            tempfile.mkdtemp(prefix="petstore-"), "petstore.sqlite3"
+        )
+        self._socket: Optional[socket.socket] = None
+        self._processes: List[multiprocessing.Process] = []
+        self._server: Optional[PetstoreHTTPServer] = None
+
+    @property
+    def base_url(self) -> str:
+        host = f"[{self.host}]" if ":" in self.host else self.host
+        scheme = "http" if self.ssl_context is None else "https"
+        return f"{scheme}://{host}:{self.port}{self.base_path}"
+
+    def start(self) -> "StandInServer":
+        PetstoreStorage(self.storage_path).initialize()
+
+        if self.workers <= 0:
+            storage = PetstoreStorage(self.storage_path, self.write_lag)
+            self._server = PetstoreHTTPServer(
+                (self.host, self.port),
+                storage,
+                self.base_path,
+                access_log=self.access_log,
+                compress_responses=self.compress_responses,
+                slow_every=self.slow_every,
+                slow_delay=self.slow_delay,
+                ssl_context=self.ssl_context,
+            )
+            self.port = self._server.server_address[1]
+            threading.Thread(
+                target=self._server.serve_forever, args=(0.05,), daemon=True
+            ).start()
+            return self
+
+        family = socket.AF_INET6 if ":" in self.host else socket.AF_INET
+        self._socket = socket.create_server(
+            (self.host, self.port), family=family, backlog=1024
+        )
+        self.port = self._socket.getsockname()[1]
+
+        for _ in range(self.workers):
+            process = multiprocessing.Process(
+                target=_serve,
+                args=(
+                    self._socket,
+                    self.storage_path,
+                    self.write_lag,
+                    self.base_path,
+                    self.access_log,
+                    self.compress_responses,
+                    self.slow_every,
+                    self.slow_delay,
+                    self.ssl_context,
+                ),
+                daemon=True,
+            )
+            process.start()
+            self._processes.append(process)
+        return self
+
+    def wait(self) -> None:
+        for process in self._processes:
+            process.join()
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+        for process in self._processes:
+            process.terminate()
+        for process in self._processes:
+            process.join()
+        self._processes = []
+
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+        if self._owns_storage:
+            directory = os.path.dirname(self.storage_path)
+            for name in os.listdir(directory):
+                os.remove(os.path.join(directory, name))
+            os.rmdir(directory)
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -0,0 +1,242 @@
+import json
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+from utils import clock
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pets (
+    id INTEGER PRIMARY KEY,
+    status TEXT,
+    body TEXT,
+    previous_body TEXT,
+    visible_at REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS pets_by_status ON pets (status);
+CREATE TABLE IF NOT EXISTS pet_inventory (
+    status TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    body TEXT,
+    previous_body TEXT,
+    visible_at REAL NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS orders (
+    id INTEGER PRIMARY KEY,
+    body TEXT,
+    previous_body TEXT,
+    visible_at REAL NOT NULL DEFAULT 0
+);
+"""
+
+_KEYS = {"pets": "id", "users": "username", "orders": "id"}
+
+
+class PetstoreStorage:
+    def __init__(self, path: str, write_lag: float = 0.0):
+        self.path = path
+        self.write_lag = write_lag
+        self._local = threading.local()
+
+    def initialize(self) -> None:
+        connection = sqlite3.connect(self.path, isolation_level=None)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+        finally:
+            connection.close()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, isolation_level=None, check_same_thread=False, timeout=30
+            )
+            connection.execute("PRAGMA synchronous=OFF")
+            connection.execute("PRAGMA temp_store=MEMORY")
+            connection.execute("PRAGMA cache_size=-16384")
+            self._local.connection = connection
+        return connection
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _write(self, operation, *args) -> Any:
+        connection = self.connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            result = operation(connection, *args)
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+        return result
+
+    def _row(
+        self, connection: sqlite3.Connection, table: str, key: Any
+    ) -> Optional[tuple]:
+        return connection.execute(
+            f"SELECT body, previous_body, visible_at FROM {table} WHERE {_KEYS[table]} = ?",
+            (key,),
+        ).fetchone()
+
+    @staticmethod
+    def _visible(row: Optional[tuple], now: float) -> Optional[str]:
+        if row is None:
+            return None
+        body, previous_body, visible_at = row
+        return body if now >= visible_at else previous_body
+
+    def _get(self, table: str, key: Any) -> Optional[str]:
+        return self._visible(self._row(self.connection, table, key), clock.now())
+
+    def _put(
+        self,
+        connection: sqlite3.Connection,
+        table: str,
+        key: Any,
+        body: Optional[str],
+        **columns: Any,
+    ) -> Optional[Dict[str, Any]]:
+        row = self._row(connection, table, key)
+        now = clock.now()
+
+        if body is None and self.write_lag <= 0:
+            connection.execute(f"DELETE FROM {table} WHERE {_KEYS[table]} = ?", (key,))
+        else:
+            columns = {
+                _KEYS[table]: key,
+                "body": body,
+                **columns,
+                "previous_body": self._visible(row, now)
+                if self.write_lag > 0
+                else None,
+                "visible_at": now + self.write_lag if self.write_lag > 0 else 0,
+            }
+            connection.execute(
+                f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))})",
+                tuple(columns.values()),
+            )
+        return json.loads(row[0]) if row is not None and row[0] is not None else None
+
+    def _delete(self, connection: sqlite3.Connection, table: str, key: Any) -> bool:
+        if self._visible(self._row(connection, table, key), clock.now()) is None:
+            return False
+        if table == "pets":
+            self._put_pet(connection, key, None)
+        else:
+            self._put(connection, table, key, None)
+        return True
+
+    @staticmethod
+    def _adjust_inventory(
+        connection: sqlite3.Connection, status: Optional[str], delta: int
+    ) -> None:
+        if status is None:
+            return
+        connection.execute(
+            "INSERT INTO pet_inventory (status, count) VALUES (?, ?) "
+            "ON CONFLICT (status) DO UPDATE SET count = count + excluded.count",
+            (status, delta),
+        )
+
+    def _put_pet(
+        self, connection: sqlite3.Connection, pet_id: int, pet: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        status = pet.get("status") if pet is not None else None
+        previous = self._put(
+            connection,
+            "pets",
+            pet_id,
+            json.dumps(pet) if pet is not None else None,
+            status=status,
+        )
+
+        previous_status = previous.get("status") if previous is not None else None
+        if previous_status != status:
+            self._adjust_inventory(connection, previous_status, -1)
+            self._adjust_inventory(connection, status, 1)
+        return previous
+
+    def get_pet(self, pet_id: int) -> Optional[str]:
+        return self._get("pets", pet_id)
+
+    def put_pet(self, pet: Dict[str, Any]) -> Dict[str, Any]:
+        self._write(self._put_pet, pet["id"], pet)
+        return pet
+
+    def update_pet(self, pet_id: int, **changes: Any) -> Optional[Dict[str, Any]]:
+        def operation(connection: sqlite3.Connection) -> Optional[Dict[str, Any]]:
+            row = self._row(connection, "pets", pet_id)
+            if self._visible(row, clock.now()) is None or row[0] is None:
+                return None
+            pet = {**json.loads(row[0]), **changes}
+            self._put_pet(connection, pet_id, pet)
+            return pet
+
+        return self._write(operation)
+
+    def delete_pet(self, pet_id: int) -> bool:
+        return self._write(self._delete, "pets", pet_id)
+
+    def find_pets_by_status(self, statuses: Iterable[str]) -> List[str]:
+        statuses = list(dict.fromkeys(statuses))
+        if not statuses:
+            return []
+        placeholders = ", ".join("?" * len(statuses))
+        rows = self.connection.execute(
+            f"SELECT body FROM pets WHERE status IN ({placeholders})", statuses
+        )
+        return [body for (body,) in rows]
+
+    def find_pets_by_tags(self, tags: Iterable[str]) -> List[str]:
+        tags = set(tags)
+        rows = self.connection.execute("SELECT body FROM pets WHERE body IS NOT NULL")
+        return [
+            body
+            for (body,) in rows
+            if any(
+                tag.get("name") in tags for tag in json.loads(body).get("tags") or []
+            )
+        ]
+
+    def inventory(self) -> Dict[str, int]:
+        rows = self.connection.execute(
+            "SELECT status, count FROM pet_inventory WHERE count > 0"
+        )
+        return dict(rows.fetchall())
+
+    def get_order(self, order_id: int) -> Optional[str]:
+        return self._get("orders", order_id)
+
+    def put_order(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        self._write(self._put, "orders", order["id"], json.dumps(order))
+        return order
+
+    def delete_order(self, order_id: int) -> bool:
+        return self._write(self._delete, "orders", order_id)
+
+    def get_user(self, username: str) -> Optional[str]:
+        return self._get("users", username)
+
+    def put_users(self, users: Iterable[Dict[str, Any]]) -> None:
+        def operation(connection: sqlite3.Connection) -> None:
+            for user in users:
+                self._put(connection, "users", user["username"], json.dumps(user))
+
+        self._write(operation)
+
+    def put_user(self, user: Dict[str, Any]) -> Dict[str, Any]:
+        self._write(self._put, "users", user["username"], json.dumps(user))
+        return user
+
+    def delete_user(self, username: str) -> bool:
+        return self._write(self._delete, "users", username)
@@ -1,14 +1,39 @@
-from typing import Any, Dict, Generator, List
+import shutil
+import subprocess
+from typing import Any, Dict, Generator, List, Tuple
 
 import pytest
 
 from api.client import APIClient
+from config.settings import Settings
+from server.runner import StandInServer, server_ssl_context
+from utils.clock import VirtualClock, use_clock
 from utils.data_generators import (
     generate_order_data,
     generate_pet_data,
     generate_user_data,
     generate_users_list,
 )
+from utils.datasets import Dataset
+from utils.inventory_oracle import InventoryOracle
+
+pytest_plugins = [
+    "plugins.bandwidth",
+    "plugins.hedging",
+    "plugins.perf_gate",
+    "plugins.results",
+    "plugins.sharding",
+    "plugins.soak",
+    "plugins.stand_in",
+    "plugins.time_breakdown",
+    "plugins.tracing",
+    "plugins.virtual_clock",
+]
+
+CERTIFICATE_REQUEST = (
+    "req -x509 -nodes -days 1 -newkey ec -pkeyopt ec_paramgen_curve:prime256v1 "
+    "-subj /CN=127.0.0.1 -addext subjectAltName=IP:127.0.0.1"
+)
 
 
 @pytest.fixture(scope="session")
@@ -39,6 +64,58 @@ def user_client() -> Generator[APIClient, None, None]:
     client.close()
 
 
+@pytest.fixture
+def inventory_oracle(
+    store_client: APIClient, pet_client: APIClient
+) -> Generator[InventoryOracle, None, None]:
+    oracle = InventoryOracle(store_client, pet_client)
+    oracle.start()
+    yield oracle
+    oracle.stop()
+
+
+@pytest.fixture(scope="session")
+def dataset() -> Generator[Dataset, None, None]:
+    if not Settings.DATASET_PATH:
+        pytest.skip("DATASET_PATH is not set, build one with tools.build_dataset")
+    with Dataset(Settings.DATASET_PATH) as opened:
+        yield opened
+
+
+@pytest.fixture
+def tls_certificate(tmp_path) -> Tuple[str, str]:
+    openssl = shutil.which("openssl")
+    if openssl is None:
+        pytest.skip("openssl is needed to issue a certificate for the stand-in")
+    certfile, keyfile = str(tmp_path / "cert.pem"), str(tmp_path / "key.pem")
+    subprocess.run(
+        [openssl, *CERTIFICATE_REQUEST.split(), "-keyout", keyfile, "-out", certfile],
+        check=True,
+        capture_output=True,
+    )
+    return certfile, keyfile
+
+
+@pytest.fixture
+def stand_in_server(
+    request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch
+) -> Generator[StandInServer, None, None]:
+    options = {"workers": 0, **getattr(request, "param", {})}
+    if options.pop("tls", False):
+        certfile, keyfile = request.getfixturevalue("tls_certificate")
+        options["ssl_context"] = server_ssl_context(certfile, keyfile)
+        monkeypatch.setenv("REQUESTS_CA_BUNDLE", certfile)
+    with StandInServer(**options) as server:
+        monkeypatch.setattr(Settings, "BASE_URL", server.base_url)
+        yield server
+
+
+@pytest.fixture
+def virtual_clock() -> Generator[VirtualClock, None, None]:
+    with use_clock(VirtualClock()) as clock:
+        yield clock
+
+
 @pytest.fixture
 def pet_data() -> Dict[str, Any]:
     return generate_pet_data()
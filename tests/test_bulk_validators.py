@@ -0,0 +1,126 @@
+import pytest
+
+from utils.bulk_validators import (
+    PET_TYPES,
+    find_entity_violations,
+    validate_inventory_bulk,
+    validate_orders_bulk,
+    validate_pets_bulk,
+)
+from utils.data_generators import generate_order_data, generate_pet_data
+from utils.validators import PET_STATUSES
+
+
+def make_pets(count: int):
+    return [generate_pet_data(pet_id=index + 1) for index in range(count)]
+
+
+class TestFindEntityViolations:
+    def test_valid_list_has_no_violations(self):
+        violations = find_entity_violations(
+            make_pets(1000),
+            types=PET_TYPES,
+            enums={"status": PET_STATUSES},
+            expected={"status": "available"},
+        )
+
+        assert violations == {}
+
+    def test_reports_indices_of_seeded_violations(self):
+        pets = make_pets(1000)
+        del pets[10]["name"]
+        pets[20]["id"] = "21"
+        pets[30]["status"] = "lost"
+        pets[41]["id"] = pets[40]["id"]
+        pets[50]["status"] = "sold"
+        pets[60]["id"] = True
+        pets[70]["name"] = None
+        pets[999]["id"] = pets[0]["id"]
+
+        violations = find_entity_violations(
+            pets,
+            types=PET_TYPES,
+            enums={"status": PET_STATUSES},
+            required_fields=["id", "name", "status"],
+            expected={"status": "available"},
+        )
+
+        assert violations == {
+            "missing 'name'": [10],
+            "'id' is not int": [20, 60],
+            "'name' is not str": [70],
+            "'status' not in ['available', 'pending', 'sold']": [30],
+            "'status' != 'available'": [30, 50],
+            "duplicate 'id'": [0, 40, 41, 999],
+        }
+
+    def test_optional_fields_may_be_missing_or_null(self):
+        pets = make_pets(100)
+        del pets[5]["name"]
+        pets[6]["name"] = None
+        pets[7]["name"] = 7
+
+        violations = find_entity_violations(
+            pets, types=PET_TYPES, required_fields=["id"]
+        )
+
+        assert violations == {"'name' is not str": [7]}
+
+
+class TestBulkValidators:
+    def test_pets_message_lists_every_check(self):
+        pets = make_pets(50)
+        pets[3]["status"] = "lost"
+        pets[4]["id"] = pets[2]["id"]
+
+        with pytest.raises(AssertionError) as error:
+            validate_pets_bulk(pets)
+
+        message = str(error.value)
+        assert message.startswith("Pet validation failed for 50 items:")
+        assert "'status' not in ['available', 'pending', 'sold']: indices [3]" in (
+            message
+        )
+        assert "duplicate 'id': indices [2, 4]" in message
+
+    def test_status_only_validation_skips_other_fields(self):
+        pets = make_pets(20)
+        for pet in pets:
+            pet["status"] = "sold"
+        pets[1]["id"] = "not-an-id"
+        pets[2]["name"] = 42
+        del pets[3]["id"]
+        status_only = {
+            "expected_status": "sold",
+            "required_fields": ["status"],
+            "unique_ids": False,
+            "types": {},
+        }
+
+        assert validate_pets_bulk(pets, **status_only)
+        pets[4]["status"] = "available"
+        with pytest.raises(AssertionError, match=r"'status' != 'sold': indices \[4\]"):
+            validate_pets_bulk(pets, **status_only)
+
+    def test_orders_with_missing_quantity(self):
+        orders = [
+            generate_order_data(order_id=index + 1, pet_id=1) for index in range(20)
+        ]
+        orders[3]["quantity"] = None
+        del orders[8]["status"]
+
+        with pytest.raises(AssertionError) as error:
+            validate_orders_bulk(orders)
+
+        assert "missing 'status': indices [8]" in str(error.value)
+        assert "'quantity' is not int: indices [3]" in str(error.value)
+
+    def test_inventory_counts_must_be_non_negative_integers(self):
+        assert validate_inventory_bulk({"available": 3, "sold": 0})
+        with pytest.raises(
+            AssertionError,
+            match=r"non-negative integers: sold=-1, pending='2', lost=1.5$",
+        ):
+            validate_inventory_bulk(
+                {"available": 3, "sold": -1, "pending": "2", "lost": 1.5}
+            )
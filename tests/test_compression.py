@@ -0,0 +1,80 @@
+import gzip
+
+import pytest
+
+from api.client import APIClient
+from api.compression import BandwidthStats, compress_request_body
+from config.settings import Settings
+from utils.data_generators import generate_pet_data, generate_users_list
+from utils.validators import validate_status_code
+
+
+@pytest.fixture
+def bandwidth():
+    stats = BandwidthStats()
+    stats.start()
+    yield stats
+    stats.stop()
+
+
+class TestCompression:
+    def test_small_or_incompressible_bodies_are_sent_as_is(self):
+        assert compress_request_body(b"{}", "gzip", 1024) == (b"{}", None)
+        assert compress_request_body(bytes(range(256)), "gzip", 0)[1] is None
+
+        body = b'{"username":"user"},' * 100
+        compressed, encoding = compress_request_body(body, "deflate", 1024)
+        assert encoding == "deflate" and len(compressed) < len(body) / 5
+
+    def test_compressed_request_body(
+        self, stand_in_server, bandwidth, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(Settings, "REQUEST_COMPRESSION", "gzip")
+        user_client = APIClient(base_path="/user")
+        users = generate_users_list(20)
+
+        response = user_client.post("/createWithList", json_data=users)
+
+        validate_status_code(response, 200)
+        assert response.request.headers["Content-Encoding"] == "gzip"
+        assert gzip.decompress(response.request.body).startswith(b'[{"id":')
+        for user in users:
+            user_client.get(f"/{user['username']}", expected_status=200)
+
+        counters = bandwidth.snapshot()["POST /user/createWithList"]
+        assert counters["request_wire"] == len(response.request.body)
+        assert counters["request_logical"] > 2 * counters["request_wire"]
+        user_client.close()
+
+    @pytest.mark.parametrize(
+        "stand_in_server",
+        [{"compress_responses": True}],
+        indirect=True,
+        ids=["compressing"],
+    )
+    def test_compressed_response_is_decoded(self, stand_in_server, bandwidth):
+        pet_client = APIClient(base_path="/pet")
+        status = "compressed"
+        for _ in range(20):
+            pet_client.post(json_data=generate_pet_data(status=status))
+
+        response = pet_client.get(
+            "/findByStatus", params={"status": status}, expected_status=200
+        )
+
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert len(response.json()) == 20
+        counters = bandwidth.snapshot()["GET /pet/findByStatus"]
+        assert counters["response_logical"] == len(response.content)
+        assert counters["response_wire"] < counters["response_logical"] / 2
+        pet_client.close()
+
+    def test_unsupported_content_encoding(self, stand_in_server):
+        pet_client = APIClient(base_path="/pet")
+
+        response = pet_client.post(
+            data=b"{}", headers={"Content-Encoding": "br"}, expected_status=None
+        )
+
+        validate_status_code(response, 415)
+        pet_client.close()
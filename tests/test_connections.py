@@ -0,0 +1,120 @@
+import os
+import socket
+
+import pytest
+import requests
+from urllib3.util.wait import wait_for_read
+
+from api.adapters import connection_stats, dns_cache
+from api.client import APIClient
+from config.settings import Settings
+from server.runner import StandInServer
+from utils.data_generators import generate_pet_data
+
+DUAL_STACK_HOST = "dual-stack.petstore.test"
+
+
+@pytest.fixture
+def dual_stack_host(monkeypatch: pytest.MonkeyPatch):
+    resolve = socket.getaddrinfo
+
+    def getaddrinfo(host, port, *args, **kwargs):
+        if host != DUAL_STACK_HOST:
+            return resolve(host, port, *args, **kwargs)
+        return [
+            (socket.AF_INET6, socket.SOCK_STREAM, 6, "", ("::1", port, 0, 0)),
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.1", port)),
+        ]
+
+    monkeypatch.setattr(socket, "getaddrinfo", getaddrinfo)
+    dns_cache.clear()
+    yield DUAL_STACK_HOST
+    dns_cache.clear()
+
+
+class TestDNSCache:
+    @pytest.mark.parametrize("transport", ["http1", "http2"])
+    def test_falls_back_to_next_address(
+        self,
+        dual_stack_host,
+        transport,
+        stand_in_server: StandInServer,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        server = stand_in_server
+        monkeypatch.setattr(Settings, "DNS_CACHE_TTL", 60.0)
+        monkeypatch.setattr(Settings, "HTTP_TRANSPORT", transport)
+        monkeypatch.setattr(
+            Settings,
+            "BASE_URL",
+            f"http://{dual_stack_host}:{server.port}{server.base_path}",
+        )
+        connection_stats.reset()
+        pet_client = APIClient(base_path="/pet")
+        pet = generate_pet_data()
+
+        pet_client.post(json_data=pet, expected_status=200)
+        pet_client.close()
+        pet_client = APIClient(base_path="/pet")
+        pet_client.get(f"/{pet['id']}", expected_status=200)
+        pet_client.close()
+
+        assert dns_cache.resolve(dual_stack_host, server.port) == [
+            "127.0.0.1",
+            "::1",
+        ]
+        counters = connection_stats.snapshot()
+        assert counters["dns_lookups"] == 1
+        assert counters["connections_opened"] == 2
+
+
+@pytest.mark.parametrize("stand_in_server", [{"tls": True}], indirect=True, ids=["tls"])
+class TestTLSSessions:
+    @pytest.fixture(autouse=True)
+    def http1(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(Settings, "HTTP_TRANSPORT", "http1")
+        monkeypatch.setattr(Settings, "TLS_SESSION_REUSE", True)
+        connection_stats.reset()
+
+    def test_reconnect_resumes_the_session(self, stand_in_server: StandInServer):
+        pet = generate_pet_data()
+        pet_client = APIClient(base_path="/pet")
+        pet_client.post(json_data=pet, expected_status=200)
+        pet_client.close()
+
+        pet_client = APIClient(base_path="/pet")
+        response = pet_client.get(f"/{pet['id']}", retry_on_404=True)
+        pet_client.close()
+
+        assert response.url.startswith("https://")
+        counters = connection_stats.snapshot()
+        assert counters["connections_opened"] == 2
+        assert counters["tls_full_handshakes"] == 1
+        assert counters["tls_resumed_handshakes"] == 1
+
+    def test_idle_check_remembers_the_ticket_of_a_warmed_connection(
+        self, stand_in_server: StandInServer
+    ):
+        warmed = APIClient(base_path="/pet")
+        assert warmed.warm_up(2) == 2
+        request = requests.Request("GET", warmed.base_url).prepare()
+        pool = warmed.adapter.get_connection_with_tls_context(
+            request, os.environ["REQUESTS_CA_BUNDLE"]
+        )
+        idle = [connection for connection in pool.pool.queue if connection]
+        # The server sends session tickets after the handshake and nothing reads them
+        assert all(wait_for_read(connection.sock, timeout=5.0) for connection in idle)
+        assert all(connection.is_connected for connection in idle)
+
+        resumed = APIClient(base_path="/pet")
+        assert resumed.warm_up(1) == 1
+        response = resumed.get("/987654321")
+        warmed.close()
+        resumed.close()
+
+        assert response.status_code == 404
+        counters = connection_stats.snapshot()
+        assert counters["warmed_connections"] == 3
+        assert counters["connections_opened"] == 3
+        assert counters["tls_full_handshakes"] == 2
+        assert counters["tls_resumed_handshakes"] == 1
@@ -0,0 +1,166 @@
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+import pytest
+
+from api.client import APIClient
+from config.settings import Settings
+from tools import build_dataset
+from utils.datasets import Dataset
+from utils.validators import (
+    validate_order_data,
+    validate_pet_data,
+    validate_status_code,
+)
+
+COUNTS = {"pets": 150, "users": 40, "orders": 200}
+
+
+@pytest.fixture
+def small_chunks(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(build_dataset, "CHUNK_SIZE", 64)
+
+
+@pytest.fixture
+def dataset_path(tmp_path, small_chunks) -> str:
+    path = str(tmp_path / "dataset.bin")
+    build_dataset.build_dataset(path, seed=7, counts=COUNTS)
+    return path
+
+
+class TestDatasetBuild:
+    def test_same_seed_gives_identical_file(self, tmp_path, dataset_path):
+        parallel = str(tmp_path / "parallel.bin")
+        other_seed = str(tmp_path / "other.bin")
+        build_dataset.build_dataset(parallel, seed=7, counts=COUNTS, jobs=2)
+        build_dataset.build_dataset(other_seed, seed=8, counts=COUNTS)
+
+        with open(dataset_path, "rb") as f:
+            content = f.read()
+        with open(parallel, "rb") as f:
+            assert f.read() == content
+        with open(other_seed, "rb") as f:
+            assert f.read() != content
+        assert not os.path.exists(f"{dataset_path}.tmp")
+
+    def test_parallel_build_keeps_a_bounded_window_of_chunks(
+        self, tmp_path, monkeypatch: pytest.MonkeyPatch
+    ):
+        executors = []
+
+        class CountingExecutor(ThreadPoolExecutor):
+            def __init__(self, jobs: int):
+                super().__init__(jobs)
+                self.in_flight = 0
+                self.peak = 0
+                executors.append(self)
+
+            def submit(self, fn, *args, **kwargs):
+                future = super().submit(fn, *args, **kwargs)
+                self.in_flight += 1
+                self.peak = max(self.peak, self.in_flight)
+                result = future.result
+
+                def collected(timeout=None):
+                    self.in_flight -= 1
+                    return result(timeout)
+
+                future.result = collected
+                return future
+
+        monkeypatch.setattr(build_dataset, "CHUNK_SIZE", 8)
+        monkeypatch.setattr(build_dataset, "ProcessPoolExecutor", CountingExecutor)
+        path = str(tmp_path / "windowed.bin")
+
+        written = build_dataset.build_dataset(path, seed=7, counts=COUNTS, jobs=2)
+
+        assert written == COUNTS
+        assert executors[0].peak == 4
+
+    def test_random_access_matches_stream(self, dataset_path):
+        with Dataset(dataset_path) as dataset:
+            assert {kind: len(dataset[kind]) for kind in COUNTS} == COUNTS
+            assert dataset.meta["seed"] == 7
+
+            pets = list(dataset["pets"])
+            assert [pet["id"] for pet in pets] == list(range(1, 151))
+            assert dataset["pets"][0] == pets[0]
+            assert dataset["pets"][-1] == pets[-1]
+            assert dataset["pets"][97] == pets[97]
+            with pytest.raises(IndexError):
+                dataset["pets"][150]
+            for pet in pets:
+                validate_pet_data(pet)
+
+            shard = list(dataset["orders"].iter(1, step=3))
+            assert [order["id"] for order in shard] == list(range(2, 201, 3))
+            for order in shard:
+                validate_order_data(order)
+                assert 1 <= order["petId"] <= COUNTS["pets"]
+
+            usernames = {user["username"] for user in dataset["users"]}
+            assert len(usernames) == COUNTS["users"]
+
+    def test_truncated_file_is_rejected(self, tmp_path, dataset_path):
+        truncated = tmp_path / "truncated.bin"
+        with open(dataset_path, "rb") as f:
+            truncated.write_bytes(f.read()[:-100])
+
+        with pytest.raises(ValueError, match="not a dataset file"):
+            Dataset(str(truncated))
+
+    def test_corrupt_header_is_rejected_and_unmapped(
+        self, tmp_path, dataset_path, monkeypatch: pytest.MonkeyPatch
+    ):
+        corrupt = tmp_path / "corrupt.bin"
+        with open(dataset_path, "rb") as f:
+            content = bytearray(f.read())
+        # the header JSON ends right before the 16-byte trailer
+        content[-17:-16] = b"x"
+        corrupt.write_bytes(bytes(content))
+        mapped = []
+
+        class TrackedMmap(mmap.mmap):
+            def __new__(cls, *args, **kwargs):
+                buffer = super().__new__(cls, *args, **kwargs)
+                mapped.append(buffer)
+                return buffer
+
+        monkeypatch.setattr(mmap, "mmap", TrackedMmap)
+
+        with pytest.raises(ValueError, match="corrupt dataset header"):
+            Dataset(str(corrupt))
+        assert mapped and mapped[0].closed
+
+
+class TestDatasetRecords:
+    def test_records_round_trip_through_api(self, stand_in_server, dataset_path):
+        pet_client = APIClient(base_path="/pet")
+        created = []
+        try:
+            with Dataset(dataset_path) as dataset:
+                for pet in dataset["pets"].iter(140):
+                    pet_client.post(json_data=pet, expected_status=200)
+                    created.append(pet["id"])
+                    response = pet_client.get(f"/{pet['id']}")
+                    validate_status_code(response, 200)
+                    assert response.json()["name"] == pet["name"]
+        finally:
+            for pet_id in created:
+                pet_client.delete(f"/{pet_id}", expected_status=None)
+            pet_client.close()
+
+    def test_shard_records_are_valid(self, dataset: Dataset):
+        pets = dataset["pets"]
+        for pet in islice(
+            pets.iter(Settings.SHARD_INDEX, step=Settings.SHARD_COUNT), 1000
+        ):
+            validate_pet_data(pet)
+        for order in islice(
+            dataset["orders"].iter(Settings.SHARD_INDEX, step=Settings.SHARD_COUNT),
+            1000,
+        ):
+            validate_order_data(order)
+            assert 1 <= order["petId"] <= len(pets)
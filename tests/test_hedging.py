@@ -0,0 +1,140 @@
+import threading
+import time
+
+import pytest
+
+from api.client import APIClient
+from api.hedging import HedgeBudget, Hedger, hedge_stats, hedger
+from config.settings import Settings
+from utils.data_generators import generate_pet_data
+
+
+@pytest.fixture
+def hedging(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(Settings, "HEDGE_MIN_SAMPLES", 5)
+    monkeypatch.setattr(Settings, "HEDGE_MIN_DELAY", 0.02)
+    hedge_stats.reset()
+    yield
+    hedger.reset()
+    hedge_stats.reset()
+
+
+def warmed_hedger(budget: float) -> Hedger:
+    warmed = Hedger(HedgeBudget(budget))
+    for index in range(100):
+        warmed.observe("GET /pet/{id}", 0.5 if index % 50 == 0 else 0.001)
+    return warmed
+
+
+class FakeResponse(str):
+    closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def slow_then_fast(delays, sent=None):
+    calls = iter(delays)
+    lock = threading.Lock()
+
+    def send():
+        with lock:
+            delay, name = next(calls)
+        time.sleep(delay)
+        response = FakeResponse(name)
+        if sent is not None:
+            sent.append(response)
+        return response
+
+    return send
+
+
+class TestHedger:
+    def test_hedge_answers_first(self, hedging):
+        sent = []
+        send = slow_then_fast([(0.5, "primary"), (0.0, "hedge")], sent)
+        started = time.perf_counter()
+
+        warmed = warmed_hedger(1.0)
+
+        response = warmed.run("GET /pet/{id}", send)
+
+        assert response == "hedge"
+        assert time.perf_counter() - started < 0.3
+        warmed.reset()
+        assert sent == ["hedge", "primary"]
+        assert sent[1].closed and not response.closed
+        counters = hedge_stats.snapshot()["GET /pet/{id}"]
+        assert counters["hedged"] == counters["hedge_wins"] == 1
+
+    def test_fast_primary_is_not_hedged(self, hedging):
+        send = slow_then_fast([(0.0, "primary")])
+
+        assert warmed_hedger(1.0).run("GET /pet/{id}", send) == "primary"
+        assert hedge_stats.snapshot()["GET /pet/{id}"]["hedged"] == 0
+
+    def test_budget_caps_hedges(self, hedging):
+        send = slow_then_fast([(0.05, "primary")] * 20)
+        budgeted = warmed_hedger(0.0)
+        budgeted.budget = HedgeBudget(0.0, burst=1.0)
+
+        results = [budgeted.run("GET /pet/{id}", send) for _ in range(3)]
+
+        counters = hedge_stats.snapshot()["GET /pet/{id}"]
+        assert counters["hedged"] == 1
+        assert counters["budget_exhausted"] == 2
+        assert results == ["primary"] * 3
+
+    def test_endpoint_without_a_tail_runs_inline(self, hedging):
+        steady = Hedger(HedgeBudget(1.0))
+        for _ in range(100):
+            steady.observe("GET /pet/{id}", 0.001)
+        threads = []
+
+        def send():
+            threads.append(threading.current_thread())
+            return FakeResponse("primary")
+
+        assert steady.delay("GET /pet/{id}") is None
+        assert steady.run("GET /pet/{id}", send) == "primary"
+        assert threads == [threading.current_thread()]
+
+    def test_no_hedging_before_enough_samples(self, hedging):
+        cold = Hedger(HedgeBudget(1.0))
+        send = slow_then_fast([(0.05, "primary")])
+
+        assert cold.run("GET /user/{name}", send) == "primary"
+        assert cold.delay("GET /user/{name}") is None
+
+
+class TestHedgedClient:
+    @pytest.mark.parametrize(
+        "stand_in_server",
+        [{"slow_every": 4, "slow_delay": 0.5}],
+        indirect=True,
+        ids=["slow-replica"],
+    )
+    def test_slow_replica_is_hedged(
+        self, hedging, stand_in_server, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(Settings, "HEDGE_REQUESTS", True)
+        monkeypatch.setattr(Settings, "HEDGE_PERCENTILE", 50)
+        monkeypatch.setattr(Settings, "HEDGE_BUDGET", 1.0)
+        hedger.reset()
+        pet_client = APIClient(base_path="/pet")
+        pet = generate_pet_data()
+        pet_client.post(json_data=pet, expected_status=200)
+
+        for _ in range(8):
+            pet_client.get(f"/{pet['id']}", expected_status=200)
+        slowest = 0.0
+        for _ in range(20):
+            started = time.perf_counter()
+            pet_client.get(f"/{pet['id']}", expected_status=200)
+            slowest = max(slowest, time.perf_counter() - started)
+        pet_client.close()
+
+        counters = hedge_stats.snapshot()["GET /pet/{id}"]
+        assert counters["hedge_wins"] >= 5
+        assert counters["hedged"] < 15
+        assert slowest < 0.4
@@ -0,0 +1,181 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import pytest
+import requests
+
+from api import http2
+from api.adapters import connection_stats
+from api.client import APIClient
+from api.http2 import HTTP2Adapter, HTTP2Connection, HTTP2Pool
+from config.settings import Settings
+from server.runner import StandInServer
+from utils.clock import VirtualClock
+from utils.data_generators import generate_pet_data
+from utils.validators import validate_status_code
+
+
+@pytest.fixture
+def http2_server(stand_in_server: StandInServer, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(Settings, "HTTP_TRANSPORT", "http2")
+    return stand_in_server
+
+
+@pytest.mark.parametrize(
+    "stand_in_server",
+    [{"write_lag": 2.0, "compress_responses": True}],
+    indirect=True,
+    ids=["write-lag-compressing"],
+)
+class TestHTTP2Transport:
+    def test_concurrent_requests_share_one_connection(self, http2_server):
+        pet_client = APIClient(base_path="/pet")
+        pets = [generate_pet_data() for _ in range(10)]
+        for pet in pets:
+            pet_client.post(json_data=pet, expected_status=200)
+        connection_stats.reset()
+
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            responses = list(
+                executor.map(
+                    lambda index: pet_client.post(
+                        json_data=pets[index % 10], expected_status=200
+                    ),
+                    range(100),
+                )
+            )
+
+        assert isinstance(pet_client.adapter, HTTP2Adapter)
+        assert [response.json()["id"] for response in responses] == [
+            pets[index % 10]["id"] for index in range(100)
+        ]
+        assert connection_stats.snapshot()["requests"] == 100
+        assert connection_stats.snapshot()["connections_opened"] == 0
+        assert pet_client.adapter.h2_pool.connection_count() == 1
+        pet_client.close()
+
+    def test_expected_status_and_compressed_response(self, http2_server):
+        pet_client = APIClient(base_path="/pet")
+        status = "http2"
+        for _ in range(20):
+            pet_client.post(json_data=generate_pet_data(status=status))
+
+        response = pet_client.get(
+            "/findByStatus", params={"status": status}, expected_status=200
+        )
+
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert len(response.json()) == 20
+        with pytest.raises(AssertionError, match="Expected status 200, got 404"):
+            pet_client.get("/987654321", expected_status=200)
+        pet_client.close()
+
+    def test_retry_on_404_backs_off(
+        self,
+        http2_server,
+        virtual_clock: VirtualClock,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        monkeypatch.setattr(Settings, "MAX_RETRIES", 4)
+        monkeypatch.setattr(Settings, "RETRY_DELAY", 0.5)
+        pet_client = APIClient(base_path="/pet")
+        pet_data = generate_pet_data()
+
+        pet_client.post(json_data=pet_data, expected_status=200)
+        response = pet_client.get(f"/{pet_data['id']}", retry_on_404=True)
+
+        validate_status_code(response, 200)
+        assert virtual_clock.slept == pytest.approx(3.0)
+        with pytest.raises(requests.exceptions.RetryError):
+            pet_client.get("/987654321", retry_on_404=True)
+        pet_client.close()
+
+
+class TestHTTP2Handshake:
+    def test_failed_handshake_closes_socket_and_is_retried(
+        self, http2_server, monkeypatch: pytest.MonkeyPatch
+    ):
+        sockets = []
+        connect = http2._connect
+        flush = HTTP2Connection._flush
+        failures = iter([BrokenPipeError("peer went away")])
+
+        def recording_connect(host, port, timeout):
+            sockets.append(connect(host, port, timeout))
+            return sockets[-1]
+
+        def flaky_flush(connection):
+            error = next(failures, None)
+            if error is not None:
+                raise error
+            flush(connection)
+
+        monkeypatch.setattr(http2, "_connect", recording_connect)
+        monkeypatch.setattr(HTTP2Connection, "_flush", flaky_flush)
+        pet_client = APIClient(base_path="/pet")
+
+        response = pet_client.get("/987654321")
+
+        validate_status_code(response, 404)
+        assert len(sockets) == 2
+        assert sockets[0].fileno() == -1
+        assert pet_client.adapter.h2_pool.connection_count() == 1
+        pet_client.close()
+
+    def test_pool_is_not_locked_while_connecting(
+        self, http2_server, monkeypatch: pytest.MonkeyPatch
+    ):
+        connect = http2._connect
+        connecting, release = threading.Event(), threading.Event()
+
+        def slow_connect(host, port, timeout):
+            connecting.set()
+            release.wait(5.0)
+            return connect(host, port, timeout)
+
+        monkeypatch.setattr(http2, "_connect", slow_connect)
+        url = urlsplit(http2_server.base_url)
+        origin = (url.scheme, url.hostname, url.port)
+        pool = HTTP2Pool(max_connections=1)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            first = executor.submit(pool.connection, origin, None, 5.0)
+            assert connecting.wait(5.0)
+            second = executor.submit(pool.connection, origin, None, 5.0)
+            started = time.perf_counter()
+            assert pool.connection_count() == 0
+            assert pool.open(origin, None, 5.0) is None
+            waited = time.perf_counter() - started
+            release.set()
+            assert first.result() is second.result()
+
+        assert waited < 1.0
+        assert pool.connection_count() == 1
+        pool.close()
+
+
+class TestStandInShutdown:
+    def test_stop_drains_in_flight_streams(
+        self, monkeypatch: pytest.MonkeyPatch, capfd: pytest.CaptureFixture
+    ):
+        monkeypatch.setattr(Settings, "HTTP_TRANSPORT", "http2")
+        server = StandInServer(workers=0, slow_every=2, slow_delay=5.0).start()
+        monkeypatch.setattr(Settings, "BASE_URL", server.base_url)
+        pet_client = APIClient(base_path="/pet")
+        pet = generate_pet_data()
+        pet_client.post(json_data=pet, expected_status=200)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            slow = executor.submit(pet_client.get, f"/{pet['id']}")
+            time.sleep(0.2)
+            started = time.perf_counter()
+            server.stop()
+            response = slow.result()
+            stopped = time.perf_counter() - started
+        pet_client.close()
+
+        assert stopped < 1.0
+        validate_status_code(response, 200)
+        assert "Traceback" not in capfd.readouterr().err
@@ -0,0 +1,104 @@
+import gc
+import json
+
+import pytest
+
+from api.models import Category, Order, Pet, Tag, User, encode, is_model_body
+
+PET_JSON = {
+    "id": 7,
+    "category": {"id": 1, "name": "Dogs"},
+    "name": "Rex",
+    "photoUrls": ["https://example.com/7.png"],
+    "tags": [{"id": 2, "name": "good"}, {"id": 3}],
+    "status": "available",
+}
+
+
+class TestModels:
+    def test_from_json_builds_nested_models(self):
+        pet = Pet.from_json(json.dumps(PET_JSON))
+
+        assert pet.id == 7 and pet.name == "Rex"
+        assert pet.category == Category(1, "Dogs")
+        assert isinstance(pet.category, Category)
+        assert [type(tag) for tag in pet.tags] == [Tag, Tag]
+        assert pet.tags[1].name is None
+        assert pet.photo_urls == ["https://example.com/7.png"]
+        assert pet.status is Pet.from_dict({"status": "avail" + "able"}).status
+
+    def test_to_dict_round_trips_and_skips_missing_fields(self):
+        pet = Pet.from_dict(PET_JSON)
+
+        assert pet.to_dict() == PET_JSON
+        assert type(pet.to_dict()["category"]) is dict
+        assert Pet(id=1).to_dict() == {"id": 1}
+        assert User.from_dict({"username": "u", "userStatus": 0}).to_dict() == {
+            "username": "u",
+            "userStatus": 0,
+        }
+
+    def test_mapping_behaviour(self):
+        order = Order(id=5, pet_id=7, quantity=1, status="placed")
+
+        assert order["petId"] == 7
+        assert "petId" in order and "shipDate" not in order and "pet_id" not in order
+        assert order.get("shipDate", "none") == "none"
+        assert order.get("unknown") is None
+        assert list(order) == ["id", "petId", "quantity", "status"]
+        assert len(order) == 4
+        assert dict(order) == {"id": 5, "petId": 7, "quantity": 1, "status": "placed"}
+        with pytest.raises(KeyError):
+            order["shipDate"]
+        with pytest.raises(KeyError):
+            order["pet_id"]
+
+    def test_replace_returns_changed_copy(self):
+        pet = Pet.from_dict(PET_JSON)
+
+        sold = pet.replace(status="sold", name="Max")
+
+        assert (sold.status, sold.name, sold.id) == ("sold", "Max", 7)
+        assert pet.status == "available" and pet.name == "Rex"
+        assert sold.tags is pet.tags
+        with pytest.raises(TypeError):
+            pet.replace(photoUrls=[])
+
+    def test_encode_nested_models(self):
+        pet = Pet(
+            id=1,
+            category=Category(2, "Cats"),
+            name="Tom",
+            tags=[Tag(3, "grey"), {"id": 4, "name": "raw"}],
+        )
+
+        body = encode([pet, {"plain": True}])
+
+        assert body == (
+            b'[{"id":1,"category":{"id":2,"name":"Cats"},"name":"Tom",'
+            b'"tags":[{"id":3,"name":"grey"},{"id":4,"name":"raw"}]},'
+            b'{"plain":true}]'
+        )
+        assert pet.to_json() == encode(pet)
+        assert is_model_body([pet]) and not is_model_body([{"id": 1}])
+        with pytest.raises(ValueError):
+            encode({"weight": float("nan")})
+        with pytest.raises(TypeError, match="set is not JSON serializable"):
+            encode(Pet(id=1, photo_urls={"a"}))
+
+    def test_list_from_json_restores_gc(self):
+        raw = json.dumps([PET_JSON, {**PET_JSON, "id": 8}])
+
+        pets = Pet.list_from_json(raw)
+        assert gc.isenabled()
+        gc.disable()
+        try:
+            assert Pet.list_from_json(raw)[1].id == 8
+            assert not gc.isenabled()
+        finally:
+            gc.enable()
+
+        assert [pet.id for pet in pets] == [7, 8]
+        with pytest.raises(json.JSONDecodeError):
+            Pet.list_from_json("[")
+        assert gc.isenabled()
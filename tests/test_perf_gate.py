@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+from plugins.perf_gate import PerfGate
+
+
+def make_gate(baseline, current, **options) -> PerfGate:
+    settings = {
+        "alpha": 0.01,
+        "min_slowdown": 0.1,
+        "min_delta": 0.001,
+        "min_samples": 5,
+    }
+    settings.update(options)
+    gate = PerfGate({"endpoints": baseline, "tests": {}}, **settings)
+    gate.samples["endpoints"] = current
+    return gate
+
+
+def latencies(seed: int, median: float, count: int = 60):
+    rng = random.Random(seed)
+    return [rng.lognormvariate(0, 0.3) * median for _ in range(count)]
+
+
+class TestPerfGate:
+    def test_noise_is_not_a_regression(self):
+        endpoints = [f"GET /endpoint/{index}" for index in range(40)]
+        gate = make_gate(
+            {key: latencies(index, 0.02) for index, key in enumerate(endpoints)},
+            {key: latencies(index + 100, 0.02) for index, key in enumerate(endpoints)},
+        )
+
+        assert gate.compare() == []
+        assert gate.compared == 40
+
+    def test_slowdown_is_reported(self):
+        gate = make_gate(
+            {"GET /pet/{id}": latencies(1, 0.02), "POST /pet": latencies(2, 0.02)},
+            {"GET /pet/{id}": latencies(3, 0.03), "POST /pet": latencies(4, 0.02)},
+        )
+
+        [regression] = gate.compare()
+
+        assert regression.key == "GET /pet/{id}"
+        assert regression.slowdown == pytest.approx(0.5, abs=0.15)
+        assert regression.adjusted_p < 0.01
+
+    @pytest.mark.parametrize(
+        "options", [{"min_slowdown": 0.6}, {"min_delta": 0.05}, {"min_samples": 100}]
+    )
+    def test_small_or_undersampled_changes_are_ignored(self, options):
+        gate = make_gate(
+            {"GET /pet/{id}": latencies(1, 0.02)},
+            {"GET /pet/{id}": latencies(3, 0.03)},
+            **options,
+        )
+
+        assert gate.compare() == []
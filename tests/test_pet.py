@@ -1,7 +1,12 @@
+import os
+
 import pytest
 
 from api.client import APIClient
-from utils.data_generators import generate_pet_data
+from api.models import Pet
+from api.uploads import upload_image
+from utils.bulk_validators import validate_pets_bulk
+from utils.data_generators import generate_pet, generate_pet_data
 from utils.retries import retry_until_condition
 from utils.validators import (
     validate_error_response,
@@ -52,6 +57,24 @@ class TestPetAPI:
         assert updated_pet["name"] == "Updated Pet Name"
         assert updated_pet["status"] == "sold"
 
+    @pytest.mark.positive
+    def test_update_pet_model(self, pet_client: APIClient):
+        pet = generate_pet(category_id=1, category_name="Dogs")
+        try:
+            created = Pet.from_json(pet_client.post(json_data=pet).content)
+            validate_pet_data(created)
+            assert created.category.name == "Dogs"
+
+            response = pet_client.put(json_data=created.replace(status="sold"))
+
+            validate_status_code(response, 200)
+            updated = Pet.from_json(response.content)
+            assert updated.status == "sold"
+            assert updated.tags[0].name == pet.tags[0].name
+            assert updated.replace(status="available").to_dict() == pet.to_dict()
+        finally:
+            pet_client.delete(f"/{pet.id}", expected_status=None)
+
     @pytest.mark.positive
     def test_update_pet_form_data(self, pet_client: APIClient, created_pet: dict):
         pet_id = created_pet["id"]
@@ -79,9 +102,13 @@ class TestPetAPI:
         validate_status_code(response, 200)
         pets = response.json()
 
-        assert isinstance(pets, list)
-        for pet in pets:
-            assert pet["status"] == status
+        validate_pets_bulk(
+            pets,
+            expected_status=status,
+            required_fields=["status"],
+            unique_ids=False,
+            types={},
+        )
 
     @pytest.mark.positive
     def test_delete_pet(self, pet_client: APIClient, pet_data: dict):
@@ -94,6 +121,25 @@ class TestPetAPI:
         get_response = pet_client.get(f"/{pet_id}", expected_status=None)
         validate_status_code(get_response, 404)
 
+    @pytest.mark.positive
+    def test_upload_image(self, pet_client: APIClient, created_pet: dict, tmp_path):
+        image = tmp_path / "pet.png"
+        image.write_bytes(os.urandom(300 * 1024 + 7))
+
+        result = upload_image(
+            pet_client,
+            created_pet["id"],
+            str(image),
+            additional_metadata="streamed",
+            window_size=64 * 1024,
+            retry_on_404=True,
+        )
+
+        validate_status_code(result.response, 200)
+        message = result.response.json()["message"]
+        assert "streamed" in message
+        assert f"{image.stat().st_size} bytes" in message
+
     @pytest.mark.negative
     def test_get_nonexistent_pet(self, pet_client: APIClient):
         nonexistent_id = 999999999
@@ -0,0 +1,147 @@
+import io
+import json
+
+import pytest
+
+from plugins.results import ResultSink
+from tools.results_report import (
+    Summary,
+    iter_records,
+    main,
+    print_summary,
+    write_html,
+)
+
+
+def make_record(nodeid: str, outcome: str, duration: float, requests) -> dict:
+    return {
+        "type": "test",
+        "nodeid": nodeid,
+        "outcome": outcome,
+        "phase": None if outcome == "passed" else "call",
+        "duration": duration,
+        "request_count": len(requests),
+        "requests": [
+            {"endpoint": endpoint, "status": status, "ms": ms}
+            for endpoint, status, ms in requests
+        ],
+    }
+
+
+def write_results(path, records) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+        f.write('{"type": "test", "nodeid": "tests/test_pet.py::test_cut')
+
+
+class TestResultSink:
+    def test_requests_are_capped_and_counted(self, tmp_path):
+        path = tmp_path / "results" / "run.jsonl"
+        sink = ResultSink(str(path), max_requests=2, max_text=100)
+        sink.start(["-m", "pet"])
+
+        sink.pytest_runtest_logstart("tests/test_pet.py::test_create_pet")
+        for status in (200, 200, 404):
+            sink.on_request("GET", "/pet/{id}", status, 0.0125)
+        sink.pytest_runtest_logfinish("tests/test_pet.py::test_create_pet")
+        sink.on_request("GET", "/pet/{id}", 200, 0.01)
+        sink.stop(0)
+
+        session, test, finish = iter_records(str(path))
+        assert session["type"] == "session" and session["args"] == ["-m", "pet"]
+        assert test["request_count"] == 3 and test["requests_dropped"] == 1
+        assert test["requests"][0] == {
+            "endpoint": "GET /pet/{id}",
+            "status": 200,
+            "ms": 12.5,
+        }
+        assert finish["outcomes"] == {"passed": 1}
+
+
+class TestResultsReport:
+    def test_summary(self, tmp_path):
+        path = tmp_path / "run.jsonl"
+        write_results(
+            path,
+            [{"type": "session"}]
+            + [
+                make_record(
+                    f"tests/test_pet.py::test_{index}",
+                    "passed",
+                    index / 10,
+                    [("GET /pet/{id}", 200, 10.0), ("POST /pet", 200, 20.0)],
+                )
+                for index in range(10)
+            ]
+            + [
+                make_record(
+                    "tests/test_user.py::test_login",
+                    "failed",
+                    0.5,
+                    [("GET /user/login", 500, 30.0)],
+                )
+            ],
+        )
+        out = io.StringIO()
+
+        assert print_summary(str(path), 3, out) == 1
+
+        text = out.getvalue()
+        assert text.startswith("FAILED  tests/test_user.py::test_login\n")
+        assert "11 tests in 1 sessions" in text and "1 failed, 10 passed" in text
+        slowest = text.split("slowest 3 tests:\n")[1].splitlines()[:3]
+        assert [line.split()[-1] for line in slowest] == [
+            "tests/test_pet.py::test_9",
+            "tests/test_pet.py::test_8",
+            "tests/test_pet.py::test_7",
+        ]
+        assert "GET /user/login" in text and "errors=1" in text
+
+    def test_html(self, tmp_path):
+        path = tmp_path / "run.jsonl"
+        write_results(
+            path,
+            [
+                make_record("tests/test_pet.py::test_ok", "passed", 0.1, []),
+                dict(
+                    make_record("tests/test_pet.py::test_bad", "failed", 0.2, []),
+                    longrepr="assert <Pet> == {}",
+                ),
+            ],
+        )
+        output = tmp_path / "report.html"
+
+        assert write_html(str(path), str(output), failures_only=True) == 1
+
+        page = output.read_text(encoding="utf-8")
+        assert "test_bad" in page and "test_ok" not in page.split('id="summary"')[0]
+        assert "assert &lt;Pet&gt; == {}" in page
+        assert page.rstrip().endswith("</html>")
+
+    def test_exit_zero_keeps_report_errors(self, tmp_path, capsys):
+        path = tmp_path / "run.jsonl"
+        write_results(path, [make_record("t", "failed", 0.1, [])])
+        output = tmp_path / "report.html"
+
+        assert main(["html", str(path), "-o", str(output)]) == 1
+        assert main(["html", str(path), "-o", str(output), "--exit-zero"]) == 0
+        assert main(["summary", str(path), "--exit-zero"]) == 0
+        assert output.exists()
+        with pytest.raises(FileNotFoundError):
+            main(
+                [
+                    "html",
+                    str(tmp_path / "missing.jsonl"),
+                    "-o",
+                    str(tmp_path / "missing.html"),
+                    "--exit-zero",
+                ]
+            )
+
+    def test_summary_counts_every_record(self):
+        summary = Summary(top=1)
+        for index in range(5):
+            summary.add(make_record(f"t{index}", "passed", index, []))
+
+        assert summary.tests == 5 and summary.slowest_tests() == [(4, "t4")]
@@ -0,0 +1,148 @@
+import time
+
+import pytest
+from urllib3 import HTTPResponse
+from urllib3.util.retry import RequestHistory
+
+from api.client import APIClient, TimedRetry
+from config.settings import Settings
+from server.runner import StandInServer
+from utils import hooks
+from utils.clock import VirtualClock
+from utils.data_generators import generate_pet_data
+from utils.retries import retry_until_condition
+from utils.validators import validate_status_code
+
+
+@pytest.fixture
+def retry_waits():
+    waits = []
+
+    def on_wait(source: str, seconds: float) -> None:
+        waits.append((source, seconds))
+
+    hooks.subscribe("retry_wait", on_wait)
+    yield waits
+    hooks.unsubscribe("retry_wait", on_wait)
+
+
+class TestRetryUntilCondition:
+    def test_condition_met_after_retries(
+        self, virtual_clock: VirtualClock, retry_waits
+    ):
+        attempts = iter(range(1, 10))
+        started = time.perf_counter()
+
+        result = retry_until_condition(
+            operation=lambda: next(attempts),
+            condition=lambda attempt: attempt == 4,
+            max_retries=5,
+            delay=1.5,
+        )
+
+        assert result == 4
+        assert virtual_clock.sleeps == 3
+        assert virtual_clock.slept == pytest.approx(4.5)
+        assert retry_waits == [("polling", pytest.approx(1.5, abs=0.05))] * 3
+        assert time.perf_counter() - started < 0.5
+
+    def test_condition_never_met(self, virtual_clock: VirtualClock):
+        with pytest.raises(AssertionError, match="still pending. Last result: 0"):
+            retry_until_condition(
+                operation=lambda: 0,
+                condition=lambda result: result > 0,
+                max_retries=4,
+                delay=10,
+                error_message="still pending",
+            )
+
+        assert virtual_clock.sleeps == 3
+        assert virtual_clock.slept == pytest.approx(30)
+
+    def test_operation_errors_are_retried(self, virtual_clock: VirtualClock):
+        calls = []
+
+        def operation() -> str:
+            calls.append(virtual_clock.monotonic())
+            if len(calls) < 3:
+                raise ConnectionError("backend is down")
+            return "ok"
+
+        assert retry_until_condition(operation, lambda result: True, 5, 2.0) == "ok"
+        assert calls[2] - calls[0] == pytest.approx(4.0, abs=0.05)
+
+    def test_last_error_is_reported(self, virtual_clock: VirtualClock):
+        def operation() -> None:
+            raise ConnectionError("backend is down")
+
+        with pytest.raises(AssertionError, match="Last error: backend is down"):
+            retry_until_condition(operation, lambda result: True, 3, 1.0)
+
+
+class TestTimedRetry:
+    def test_exponential_backoff(self, virtual_clock: VirtualClock, retry_waits):
+        retry = TimedRetry(total=5, backoff_factor=0.1)
+        expected = []
+        for _ in range(4):
+            retry = retry.new(
+                history=retry.history + (RequestHistory("GET", "/", None, 503, None),)
+            )
+            expected.append(retry.get_backoff_time())
+            retry.sleep()
+
+        assert expected == pytest.approx([0, 0.2, 0.4, 0.8])
+        assert virtual_clock.slept == pytest.approx(1.4)
+        assert [source for source, _ in retry_waits] == ["backoff"] * 4
+
+    def test_retry_after_header(self, virtual_clock: VirtualClock):
+        retry = TimedRetry(total=3, backoff_factor=0.1, respect_retry_after_header=True)
+        response = HTTPResponse(status=503, headers={"Retry-After": "7"})
+
+        retry.sleep(response)
+
+        assert virtual_clock.slept == pytest.approx(7)
+
+
+@pytest.mark.parametrize(
+    "stand_in_server", [{"write_lag": 2.0}], indirect=True, ids=["write-lag"]
+)
+class TestVisibilityLag:
+    def test_polling_waits_for_lagging_write(
+        self, stand_in_server: StandInServer, virtual_clock: VirtualClock
+    ):
+        pet_client = APIClient(base_path="/pet")
+        pet_data = generate_pet_data()
+        started = time.perf_counter()
+
+        pet_client.post(json_data=pet_data, expected_status=200)
+        response = retry_until_condition(
+            operation=lambda: pet_client.get(
+                f"/{pet_data['id']}", expected_status=None
+            ),
+            condition=lambda response: response.status_code == 200,
+            max_retries=10,
+            delay=0.5,
+        )
+
+        validate_status_code(response, 200)
+        assert 1.5 <= virtual_clock.slept <= 2.5
+        assert time.perf_counter() - started < 1.0
+        pet_client.close()
+
+    def test_backoff_waits_for_lagging_write(
+        self,
+        stand_in_server: StandInServer,
+        virtual_clock: VirtualClock,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        monkeypatch.setattr(Settings, "MAX_RETRIES", 4)
+        monkeypatch.setattr(Settings, "RETRY_DELAY", 0.5)
+        pet_client = APIClient(base_path="/pet")
+        pet_data = generate_pet_data()
+
+        pet_client.post(json_data=pet_data, expected_status=200)
+        response = pet_client.get(f"/{pet_data['id']}", retry_on_404=True)
+
+        validate_status_code(response, 200)
+        assert virtual_clock.slept == pytest.approx(3.0)
+        pet_client.close()
@@ -0,0 +1,141 @@
+import json
+import random
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from plugins.sharding import assign_shards, load_durations
+from tools.shard_runner import merge_results
+
+
+def make_nodeids(count: int):
+    return [f"tests/test_{index % 7}.py::test_{index}" for index in range(count)]
+
+
+def write_node(directory, shard_id: int, tests, latency, num_shards: int = 2) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    node = {
+        "shard_id": shard_id,
+        "num_shards": num_shards,
+        "hostname": f"node{shard_id}",
+        "started": 0.0,
+        "duration": 1.5,
+        "tests": tests,
+        "latency": latency,
+    }
+    (directory / f"node-{shard_id}.json").write_text(json.dumps(node))
+    (directory / f"node-{shard_id}.xml").write_text(
+        f'<testsuites><testsuite name="pytest" tests="{len(tests)}" failures="0" '
+        'errors="0" skipped="0" time="1.5"/></testsuites>'
+    )
+
+
+class TestAssignShards:
+    def test_assignment_is_deterministic(self):
+        nodeids = make_nodeids(200)
+        rng = random.Random(1)
+        durations = {nodeid: rng.uniform(0.01, 5.0) for nodeid in nodeids[::2]}
+
+        assignment = assign_shards(nodeids, durations, 4)
+        shuffled = nodeids[:]
+        rng.shuffle(shuffled)
+
+        assert assign_shards(shuffled, dict(durations), 4) == assignment
+        assert sorted(assignment) == sorted(nodeids)
+        assert set(assignment.values()) == {0, 1, 2, 3}
+
+    def test_shards_are_balanced_by_duration(self):
+        nodeids = make_nodeids(300)
+        rng = random.Random(2)
+        durations = {nodeid: rng.expovariate(1.0) for nodeid in nodeids}
+
+        assignment = assign_shards(nodeids, durations, 5)
+
+        loads = [0.0] * 5
+        for nodeid, shard in assignment.items():
+            loads[shard] += durations[nodeid]
+        assert max(loads) - min(loads) <= max(durations.values())
+
+    def test_unknown_tests_cost_the_average(self):
+        durations = {"a": 10.0, "b": 2.0}
+
+        assignment = assign_shards(["a", "b", "c", "d"], durations, 2)
+
+        assert assignment == {"a": 0, "c": 1, "d": 1, "b": 0}
+
+
+class TestMergeResults:
+    def test_merges_two_shard_directories(self, tmp_path, capsys):
+        write_node(
+            tmp_path / "artifacts-0",
+            0,
+            {
+                "tests/test_pet.py::test_a": {"outcome": "passed", "duration": 0.5},
+                "tests/test_pet.py::test_b": {"outcome": "skipped", "duration": 0.0},
+            },
+            {"GET /pet/{id}": [0.01, 0.02]},
+        )
+        write_node(
+            tmp_path / "artifacts-1" / "nested",
+            1,
+            {"tests/test_user.py::test_c": {"outcome": "passed", "duration": 1.25}},
+            {"GET /pet/{id}": [0.03], "POST /user": [0.05]},
+        )
+        durations_path = tmp_path / "durations.json"
+        durations_path.write_text(
+            json.dumps(
+                {
+                    "tests/test_pet.py::test_b": 4.0,
+                    "tests/test_store.py::test_not_run": 2.0,
+                    "tests/test_user.py::test_c": 9.0,
+                }
+            )
+        )
+        output = tmp_path / "merged"
+
+        exit_code = merge_results(
+            [str(tmp_path / "artifacts-0"), str(tmp_path / "artifacts-1")],
+            str(output),
+            str(durations_path),
+        )
+
+        assert exit_code == 0
+        merged = json.loads((output / "merged.json").read_text())
+        assert merged["outcomes"] == {"passed": 2, "skipped": 1}
+        assert merged["problems"] == []
+        assert [node["shard_id"] for node in merged["nodes"]] == [0, 1]
+        assert merged["tests"]["tests/test_user.py::test_c"]["shard_id"] == 1
+        assert merged["latency"]["GET /pet/{id}"]["count"] == 3
+        assert merged["latency"]["POST /user"]["count"] == 1
+
+        junit = ET.parse(output / "junit.xml").getroot()
+        assert junit.get("tests") == "3"
+        assert len(junit.findall("testsuite")) == 2
+
+        assert load_durations(str(durations_path)) == {
+            "tests/test_pet.py::test_a": 0.5,
+            "tests/test_pet.py::test_b": 4.0,
+            "tests/test_store.py::test_not_run": 2.0,
+            "tests/test_user.py::test_c": 1.25,
+        }
+        assert "shard 1 (node1): 1 tests in 1.5s" in capsys.readouterr().out
+
+    @pytest.mark.parametrize("outcome", ["failed", "error"])
+    def test_failures_and_missing_shards_fail_the_merge(self, tmp_path, outcome):
+        write_node(
+            tmp_path / "artifacts",
+            0,
+            {"tests/test_pet.py::test_a": {"outcome": outcome, "duration": 0.5}},
+            {},
+            num_shards=3,
+        )
+
+        exit_code = merge_results(
+            [str(tmp_path / "artifacts")],
+            str(tmp_path / "merged"),
+            str(tmp_path / "durations.json"),
+        )
+
+        merged = json.loads((tmp_path / "merged" / "merged.json").read_text())
+        assert exit_code == 1
+        assert merged["problems"] == ["missing results for shards [1, 2]"]
@@ -0,0 +1,79 @@
+import random
+
+from plugins.soak import SoakMonitor
+
+
+def make_sample(index: int, rng: random.Random, **metrics):
+    sample = {
+        "elapsed": 60.0 * index,
+        "iteration": index,
+        "tests_run": 50 * index,
+        "traced_memory": 40_000_000 + rng.randint(-400_000, 400_000),
+        "traced_peak": 60_000_000,
+        "open_fds": 24,
+        "open_sockets": 4,
+        "gc_objects": 150_000 + rng.randint(-2_000, 2_000),
+    }
+    sample.update(metrics)
+    return sample
+
+
+def make_monitor(samples):
+    monitor = SoakMonitor(interval=60.0, frames=1, top=5)
+    monitor.samples = samples
+    monitor.iterations = samples[-1]["iteration"]
+    return monitor
+
+
+class TestSoakMonitor:
+    def test_rising_trend_is_reported_as_leak(self):
+        rng = random.Random(1)
+        samples = [
+            make_sample(
+                index,
+                rng,
+                traced_memory=40_000_000 + index * 800_000 + rng.randint(-400_000, 0),
+                open_sockets=4 + index,
+            )
+            for index in range(1, 21)
+        ]
+
+        trends = make_monitor(samples).trends()
+
+        assert trends["traced_memory"]["leaking"]
+        assert trends["traced_memory"]["per_iteration"] > 700_000
+        assert trends["open_sockets"]["leaking"]
+        assert trends["open_sockets"]["growth"] == 19
+        assert not trends["gc_objects"]["leaking"]
+        assert not trends["open_fds"]["leaking"]
+
+    def test_flat_noisy_trend_is_not_a_leak(self):
+        rng = random.Random(2)
+        samples = [make_sample(index, rng) for index in range(1, 21)]
+        samples[-1]["open_fds"] = 25
+
+        report = make_monitor(samples).report()
+
+        assert not any(trend["leaking"] for trend in report["trends"].values())
+        assert report["iterations"] == 20
+        assert report["top_allocations"] == []
+
+    def test_warm_up_iteration_is_ignored(self):
+        rng = random.Random(3)
+        samples = [make_sample(0, rng, traced_memory=1_000_000, gc_objects=20_000)]
+        samples += [make_sample(index, rng) for index in range(1, 11)]
+
+        trends = make_monitor(samples).trends()
+
+        assert trends["traced_memory"]["first"] > 30_000_000
+        assert not trends["traced_memory"]["leaking"]
+        assert not trends["gc_objects"]["leaking"]
+
+    def test_too_few_samples_are_not_judged(self):
+        rng = random.Random(4)
+        samples = [
+            make_sample(index, rng, open_sockets=4 + 10 * index)
+            for index in range(1, 3)
+        ]
+
+        assert not make_monitor(samples).trends()["open_sockets"]["leaking"]
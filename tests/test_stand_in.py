@@ -0,0 +1,77 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from api.client import APIClient
+from server.runner import StandInServer
+from utils.data_generators import generate_pet_data
+
+WRITE_LAG = 1.0
+
+
+@pytest.mark.parametrize(
+    "stand_in_server",
+    [{"workers": 2, "write_lag": WRITE_LAG}],
+    indirect=True,
+    ids=["two-workers"],
+)
+class TestMultiProcessStandIn:
+    def test_writes_become_visible_to_every_worker_after_the_lag(
+        self, stand_in_server: StandInServer
+    ):
+        pets = [generate_pet_data() for _ in range(16)]
+        writer = APIClient(base_path="/pet")
+        reader = APIClient(base_path="/pet")
+
+        def read(pet: dict) -> int:
+            return reader.get(f"/{pet['id']}", expected_status=None).status_code
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            written = time.perf_counter()
+            list(
+                executor.map(
+                    lambda pet: writer.post(json_data=pet, expected_status=200), pets
+                )
+            )
+            early = list(executor.map(read, pets))
+            read_early = time.perf_counter() - written
+            time.sleep(max(WRITE_LAG - read_early, 0) + 0.2)
+            late = list(executor.map(read, pets))
+        writer.close()
+        reader.close()
+
+        assert read_early < WRITE_LAG
+        assert early == [404] * len(pets)
+        assert late == [200] * len(pets)
+
+    def test_inventory_counts_writes_from_every_worker(
+        self, stand_in_server: StandInServer
+    ):
+        status = f"workers-{uuid.uuid4().hex[:8]}"
+        pets = [generate_pet_data(status=status) for _ in range(20)]
+        pet_client = APIClient(base_path="/pet")
+        store_client = APIClient(base_path="/store")
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(
+                executor.map(
+                    lambda pet: pet_client.post(json_data=pet, expected_status=200),
+                    pets,
+                )
+            )
+            created = store_client.get("/inventory", expected_status=200).json()
+            time.sleep(WRITE_LAG + 0.2)
+            list(
+                executor.map(
+                    lambda pet: pet_client.delete(f"/{pet['id']}", expected_status=200),
+                    pets[:5],
+                )
+            )
+        deleted = store_client.get("/inventory", expected_status=200).json()
+        pet_client.close()
+        store_client.close()
+
+        assert created[status] == 20
+        assert deleted[status] == 15
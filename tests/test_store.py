@@ -1,9 +1,14 @@
+import uuid
+
 import pytest
 
 from api.client import APIClient
-from utils.data_generators import generate_order_data
+from utils.bulk_validators import validate_inventory_bulk
+from utils.data_generators import generate_order_data, generate_pet_data
+from utils.inventory_oracle import InventoryOracle
 from utils.retries import retry_until_condition
 from utils.validators import (
+    PET_STATUSES,
     validate_error_response,
     validate_order_data,
     validate_status_code,
@@ -55,11 +60,81 @@ class TestStoreAPI:
         validate_status_code(response, 200)
         inventory = response.json()
 
-        assert isinstance(inventory, dict)
-        for status in ["available", "pending", "sold"]:
-            if status in inventory:
-                assert isinstance(inventory[status], int)
-                assert inventory[status] >= 0
+        validate_inventory_bulk(inventory, statuses=PET_STATUSES)
+
+    @pytest.mark.positive
+    def test_inventory_tracks_pet_writes(
+        self, pet_client: APIClient, inventory_oracle: InventoryOracle
+    ):
+        status = f"oracle_{uuid.uuid4().hex[:8]}"
+        pet_data = generate_pet_data(status=status)
+        pet_id = pet_data["id"]
+
+        pet_client.post(json_data=pet_data, expected_status=200)
+        assert inventory_oracle.expected() == {status: 1}
+        inventory_oracle.check()
+
+        moved_status = f"{status}_moved"
+        pet_client.put(
+            json_data={**pet_data, "status": moved_status}, expected_status=200
+        )
+        inventory_oracle.check()
+
+        form_status = f"{status}_form"
+        pet_client.post(
+            f"/{pet_id}",
+            data={"status": form_status},
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            retry_on_404=True,
+        )
+        inventory_oracle.check()
+
+        pet_client.delete(f"/{pet_id}", retry_on_404=True, expected_status=200)
+        assert inventory_oracle.expected() == {
+            status: 0,
+            moved_status: 0,
+            form_status: 0,
+        }
+        inventory_oracle.check()
+
+    @pytest.mark.positive
+    def test_inventory_tracks_pets_written_before_start(
+        self, pet_client: APIClient, store_client: APIClient, created_pet: dict
+    ):
+        status = f"oracle_{uuid.uuid4().hex[:8]}"
+        pet_id = created_pet["id"]
+        pet_client.put(json_data={**created_pet, "status": status}, expected_status=200)
+        retry_until_condition(
+            operation=lambda: pet_client.get(f"/{pet_id}", expected_status=None),
+            condition=lambda response: (
+                response.status_code == 200 and response.json()["status"] == status
+            ),
+        )
+        oracle = InventoryOracle(store_client, pet_client)
+        oracle.start()
+        try:
+            moved_status = f"{status}_moved"
+            pet_client.put(
+                json_data={**created_pet, "status": moved_status}, expected_status=200
+            )
+            assert oracle.expected() == {status: 0, moved_status: 1}
+            oracle.check()
+
+            form_status = f"{status}_form"
+            pet_client.post(
+                f"/{pet_id}",
+                data={"status": form_status},
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+                retry_on_404=True,
+            )
+            assert oracle.expected() == {status: 0, moved_status: 0, form_status: 1}
+            oracle.check()
+
+            pet_client.delete(f"/{pet_id}", retry_on_404=True, expected_status=200)
+            assert oracle.expected() == {status: 0, moved_status: 0, form_status: 0}
+            oracle.check()
+        finally:
+            oracle.stop()
 
     @pytest.mark.negative
     def test_get_nonexistent_order(self, store_client: APIClient):
@@ -0,0 +1,106 @@
+import csv
+
+import pytest
+
+from plugins.time_breakdown import COLUMNS, TimeBreakdown
+from utils import hooks
+
+
+def emit_request(elapsed: float, overhead: float) -> None:
+    hooks.emit(
+        "request",
+        method="GET",
+        url="http://petstore.test/v2/pet/1",
+        endpoint="/pet/{id}",
+        status_code=200,
+        response=None,
+        elapsed=elapsed,
+        overhead=overhead,
+    )
+
+
+@pytest.fixture
+def breakdown():
+    recorder = TimeBreakdown()
+    recorder.start()
+    yield recorder
+    recorder.stop()
+
+
+class TestHooks:
+    def test_emit_calls_subscribers_in_order(self):
+        calls = []
+
+        def first(**payload):
+            calls.append(("first", payload))
+
+        def second(**payload):
+            calls.append(("second", payload))
+
+        hooks.subscribe("breakdown_test", first)
+        hooks.subscribe("breakdown_test", second)
+        try:
+            assert hooks.has_subscribers("breakdown_test")
+            hooks.emit("breakdown_test", seconds=1.5)
+        finally:
+            hooks.unsubscribe("breakdown_test", first)
+            hooks.unsubscribe("breakdown_test", second)
+
+        assert calls == [("first", {"seconds": 1.5}), ("second", {"seconds": 1.5})]
+        assert not hooks.has_subscribers("breakdown_test")
+        hooks.emit("breakdown_test", seconds=2.0)
+        assert len(calls) == 2
+
+
+class TestTimeBreakdown:
+    def test_events_land_in_their_buckets(self, breakdown: TimeBreakdown):
+        breakdown.begin_test("tests/test_pet.py::test_a")
+        emit_request(elapsed=0.5, overhead=0.01)
+        emit_request(elapsed=0.25, overhead=0.02)
+        hooks.emit("retry_wait", source="backoff", seconds=0.2)
+        hooks.emit("retry_wait", source="polling", seconds=0.3)
+        hooks.emit("retry_wait", source="unknown", seconds=9.0)
+        breakdown.end_test(wall=1.5)
+
+        record = breakdown.records[0]
+        assert record["requests"] == 2
+        assert record["network"] == pytest.approx(0.55)
+        assert record["backoff"] == pytest.approx(0.2)
+        assert record["polling"] == pytest.approx(0.3)
+        assert record["client"] == pytest.approx(0.03)
+        assert record["other"] == pytest.approx(0.42)
+        assert record["wall"] == 1.5
+
+    def test_events_outside_a_test_are_ignored(self, breakdown: TimeBreakdown):
+        emit_request(elapsed=5.0, overhead=1.0)
+        breakdown.begin_test("tests/test_pet.py::test_b")
+        breakdown.end_test(wall=0.1)
+        hooks.emit("retry_wait", source="backoff", seconds=3.0)
+
+        record = breakdown.records[0]
+        assert [record[column] for column in COLUMNS] == [0.1, 0, 0, 0, 0, 0.1, 0]
+
+    def test_stop_unsubscribes(self):
+        recorder = TimeBreakdown()
+        recorder.start()
+        recorder.stop()
+        recorder.begin_test("tests/test_pet.py::test_c")
+        emit_request(elapsed=1.0, overhead=0.1)
+        recorder.end_test(wall=2.0)
+
+        assert recorder.records[0]["network"] == 0
+        assert recorder.records[0]["requests"] == 0
+
+    def test_csv_is_sorted_by_column(self, breakdown: TimeBreakdown, tmp_path):
+        for nodeid, polling in (("fast", 0.1), ("slow", 0.9)):
+            breakdown.begin_test(nodeid)
+            hooks.emit("retry_wait", source="polling", seconds=polling)
+            breakdown.end_test(wall=1.0)
+        path = tmp_path / "breakdown.csv"
+
+        breakdown.write_csv(str(path), "polling")
+
+        with open(path, encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        assert [row["nodeid"] for row in rows] == ["slow", "fast"]
+        assert rows[0]["polling"] == "0.9"
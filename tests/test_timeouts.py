@@ -0,0 +1,173 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError, ReadTimeoutError
+from urllib3.util.retry import Retry
+
+from api.client import APIClient
+from api.timeouts import TimeoutPolicy, timeout_policy
+from config.settings import Settings, parse_endpoint_timeouts
+from server.app import PetstoreHTTPServer
+from utils.data_generators import generate_pet_data
+
+
+@pytest.fixture
+def adaptive_timeouts(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(Settings, "ADAPTIVE_TIMEOUTS", True)
+    monkeypatch.setattr(Settings, "TIMEOUT_MIN_SAMPLES", 5)
+    monkeypatch.setattr(Settings, "TIMEOUT_FLOOR", 0.2)
+    monkeypatch.setattr(Settings, "TIMEOUT_CEILING", 5.0)
+    timeout_policy.reset()
+    yield
+    timeout_policy.reset()
+
+
+class TestTimeoutPolicy:
+    def test_endpoint_overrides(self, monkeypatch: pytest.MonkeyPatch):
+        overrides = parse_endpoint_timeouts(
+            "get /pet/findByStatus=5, /user/logout=2,POST /pet/{id}/uploadImage=60"
+        )
+        monkeypatch.setattr(Settings, "ENDPOINT_TIMEOUTS", overrides)
+
+        assert overrides == {
+            "GET /pet/findByStatus": 5.0,
+            "/user/logout": 2.0,
+            "POST /pet/{id}/uploadImage": 60.0,
+        }
+        assert Settings.get_timeout("GET /pet/findByStatus") == (10, 5.0)
+        assert Settings.get_timeout("GET /user/logout") == (10, 2.0)
+        assert Settings.get_timeout("DELETE /pet/findByStatus") == (10, 30)
+        assert Settings.get_timeout() == (10, 30)
+        with pytest.raises(ValueError, match="Invalid ENDPOINT_TIMEOUTS entry"):
+            parse_endpoint_timeouts("/pet/findByStatus")
+
+    def test_read_timeout_follows_observed_latency(self, adaptive_timeouts):
+        policy = TimeoutPolicy()
+        key = "GET /pet/{id}"
+        assert policy.timeout(key) == (10, 30)
+
+        for _ in range(5):
+            policy.observe(key, 0.01)
+        assert policy.timeout(key) == (10, 0.2)
+
+        for _ in range(100):
+            policy.observe(key, 0.5)
+        assert policy.timeout(key) == (10, pytest.approx(1.5))
+
+        for _ in range(100):
+            policy.observe(key, 10.0)
+        assert policy.timeout(key) == (10, 5.0)
+
+    def test_only_first_attempt_successes_are_observed(self, adaptive_timeouts):
+        policy = TimeoutPolicy()
+        key = "GET /pet/{id}"
+        first_attempt = requests.Response()
+        first_attempt.raw = SimpleNamespace(retries=Retry(total=3))
+        retried = requests.Response()
+        retried.raw = SimpleNamespace(
+            retries=Retry(total=3).increment(
+                "GET", "/pet/1", error=ReadTimeoutError(None, "/pet/1", "timed out")
+            )
+        )
+
+        def time_out() -> requests.Response:
+            raise requests.exceptions.ReadTimeout("timed out")
+
+        for _ in range(4):
+            assert policy.timed(key, lambda: first_attempt) is first_attempt
+        for _ in range(10):
+            assert policy.timed(key, lambda: retried) is retried
+            with pytest.raises(requests.exceptions.ReadTimeout):
+                policy.timed(key, time_out)
+        assert policy.read_timeout(key) is None
+
+        policy.timed(key, lambda: first_attempt)
+        assert policy.read_timeout(key) == 0.2
+
+    def test_calls_that_timed_out_observe_their_timeout(self, adaptive_timeouts):
+        policy = TimeoutPolicy()
+        key = "GET /pet/{id}"
+        for _ in range(5):
+            policy.observe(key, 0.01)
+
+        def fail(reason: Exception):
+            def send() -> requests.Response:
+                raise requests.ConnectionError(MaxRetryError(None, "/pet/1", reason))
+
+            return send
+
+        timed_out = fail(ReadTimeoutError(None, "/pet/1", "timed out"))
+        refused = fail(NewConnectionError(None, "refused"))
+        with pytest.raises(requests.ConnectionError):
+            policy.timed(key, refused, 0.2)
+        assert policy.read_timeout(key) == 0.2
+
+        with pytest.raises(requests.ConnectionError):
+            policy.timed(key, timed_out, 0.2)
+        assert policy.read_timeout(key) == pytest.approx(3 * (0.01 + 0.95 * 0.19))
+
+    def test_override_wins_over_adaptive(
+        self, adaptive_timeouts, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(Settings, "ENDPOINT_TIMEOUTS", {"/pet/{id}": 7.0})
+        policy = TimeoutPolicy()
+        for _ in range(5):
+            policy.observe("GET /pet/{id}", 0.01)
+        assert policy.timeout("GET /pet/{id}") == (10, 7.0)
+
+
+class TestAdaptiveTimeoutsClient:
+    @pytest.mark.parametrize(
+        "stand_in_server",
+        [{"slow_every": 15, "slow_delay": 3.0}],
+        indirect=True,
+        ids=["hung-requests"],
+    )
+    def test_hung_request_is_retried_early(self, adaptive_timeouts, stand_in_server):
+        pet_client = APIClient(base_path="/pet")
+        pet = generate_pet_data()
+        pet_client.post(json_data=pet, expected_status=200)
+
+        slowest = 0.0
+        for _ in range(300):
+            started = time.perf_counter()
+            pet_client.get(f"/{pet['id']}", expected_status=200)
+            slowest = max(slowest, time.perf_counter() - started)
+        pet_client.close()
+
+        assert 0.2 < slowest < 1.0
+        assert timeout_policy.timeout("GET /pet/{id}")[1] < 0.5
+
+    @pytest.mark.parametrize(
+        "stand_in_server", [{"slow_delay": 0.3}], indirect=True, ids=["step-up"]
+    )
+    def test_timeout_follows_a_latency_step_up(
+        self, adaptive_timeouts, stand_in_server, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(Settings, "MAX_RETRIES", 1)
+        slow = threading.Event()
+        monkeypatch.setattr(
+            PetstoreHTTPServer, "is_slow_request", lambda server: slow.is_set()
+        )
+        pet_client = APIClient(base_path="/pet")
+        pet = generate_pet_data()
+        pet_client.post(json_data=pet, expected_status=200)
+        for _ in range(5):
+            pet_client.get(f"/{pet['id']}", expected_status=200)
+        assert timeout_policy.timeout("GET /pet/{id}")[1] == 0.2
+
+        slow.set()
+        outcomes = []
+        for _ in range(5):
+            try:
+                pet_client.get(f"/{pet['id']}", expected_status=200)
+                outcomes.append("ok")
+            except requests.ConnectionError:
+                outcomes.append("timed out")
+        pet_client.close()
+
+        assert outcomes == ["timed out"] + ["ok"] * 4
+        assert timeout_policy.timeout("GET /pet/{id}")[1] > 0.3
@@ -0,0 +1,94 @@
+import json
+from typing import Any, Dict, List
+
+import pytest
+
+from api.client import APIClient
+from config.settings import Settings
+from utils import tracing
+from utils.retries import retry_until_condition
+from utils.validators import validate_status_code
+
+
+class TraceCapture:
+    def __init__(self, path: str, monkeypatch: pytest.MonkeyPatch):
+        self.path = path
+        self.tracer = tracing.Tracer(path, buffer_size=2)
+        self._monkeypatch = monkeypatch
+        monkeypatch.setattr(tracing, "_tracer", self.tracer)
+
+    def read(self) -> List[Dict[str, Any]]:
+        self._monkeypatch.setattr(tracing, "_tracer", None)
+        self.tracer.close()
+        with open(self.path, encoding="utf-8") as f:
+            events = json.load(f)["traceEvents"]
+        return [event for event in events if event["ph"] == "X"]
+
+
+@pytest.fixture
+def trace_capture(tmp_path, monkeypatch: pytest.MonkeyPatch) -> TraceCapture:
+    capture = TraceCapture(str(tmp_path / "trace.json"), monkeypatch)
+    yield capture
+    if tracing.get_tracer() is capture.tracer:
+        capture.read()
+
+
+class TestTracing:
+    def test_request_spans_with_trace_header(
+        self, pet_client: APIClient, created_pet: dict, trace_capture: TraceCapture
+    ):
+        pet_id = created_pet["id"]
+        scenario = trace_capture.tracer.new_span(
+            "scenario", {"pet_id": pet_id}, root=True
+        )
+        with scenario:
+            response = retry_until_condition(
+                operation=lambda: pet_client.get(f"/{pet_id}", expected_status=None),
+                condition=lambda response: response.status_code == 200,
+            )
+        validate_status_code(response, 200)
+
+        version, trace_id, span_id, flags = response.request.headers[
+            "traceparent"
+        ].split("-")
+        assert (version, trace_id, flags) == ("00", scenario.trace_hex, "01")
+
+        events = {event["name"]: event for event in trace_capture.read()}
+        root = events["scenario"]["args"]
+        attempt = events["retry_until_condition"]["args"]
+        request = events["GET /pet/{id}"]["args"]
+
+        assert root["pet_id"] == pet_id and root["parent_id"] is None
+        assert attempt["parent_id"] == root["span_id"]
+        assert attempt["condition_met"] is True
+        assert request["parent_id"] == attempt["span_id"]
+        assert request["span_id"] == span_id
+        assert request["status_code"] == 200
+        assert {root["trace_id"], attempt["trace_id"], request["trace_id"]} == {
+            trace_id
+        }
+
+    def test_unencodable_body_leaves_no_open_span(
+        self,
+        pet_client: APIClient,
+        trace_capture: TraceCapture,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        monkeypatch.setattr(Settings, "REQUEST_COMPRESSION", True)
+        scenario = trace_capture.tracer.new_span("scenario", {}, root=True)
+
+        with scenario:
+            with pytest.raises(TypeError):
+                pet_client.post(json_data={"id": object()})
+            assert tracing.current_span() is scenario
+
+        assert [event["name"] for event in trace_capture.read()] == ["scenario"]
+
+    def test_disabled_tracing_is_a_noop(self, pet_client: APIClient, created_pet):
+        if tracing.get_tracer() is not None:
+            pytest.skip("tracing is enabled for this run")
+
+        assert tracing.span("scenario") is tracing.NOOP_SPAN
+        response = pet_client.get(f"/{created_pet['id']}", retry_on_404=True)
+
+        assert "traceparent" not in response.request.headers
@@ -1,6 +1,9 @@
 import pytest
 
+from api.bulk_users import create_users_bulk, delete_users_bulk
 from api.client import APIClient
+from utils.clock import VirtualClock
+from utils.data_generators import generate_users_list
 from utils.retries import retry_until_condition
 from utils.validators import (
     validate_error_response,
@@ -100,6 +103,43 @@ class TestUserAPI:
             except Exception:
                 pass
 
+    @pytest.mark.positive
+    @pytest.mark.parametrize("endpoint", ["/createWithList", "/createWithArray"])
+    def test_create_users_in_chunks(self, user_client: APIClient, endpoint: str):
+        users = generate_users_list(12)
+
+        result = create_users_bulk(
+            user_client, users, chunk_size=5, endpoint=endpoint, max_retries=10
+        )
+        try:
+            assert result.all_created, f"Not all users were created: {result}"
+            assert sorted(result.created) == sorted(u["username"] for u in users)
+        finally:
+            delete_users_bulk(user_client, result.created)
+
+    @pytest.mark.negative
+    def test_bulk_create_with_duplicate_usernames(
+        self, stand_in_server, virtual_clock: VirtualClock
+    ):
+        user_client = APIClient(base_path="/user")
+        users = generate_users_list(4)
+        users[3]["username"] = users[1]["username"]
+
+        result = create_users_bulk(
+            user_client, users, chunk_size=2, concurrency=1, max_retries=3
+        )
+        try:
+            assert result.created == [
+                users[0]["username"],
+                users[2]["username"],
+                users[3]["username"],
+            ]
+            assert result.not_visible == [users[1]["username"]]
+            assert not result.all_created
+        finally:
+            delete_users_bulk(user_client, set(result.requested))
+            user_client.close()
+
     @pytest.mark.negative
     def test_get_nonexistent_user(self, user_client: APIClient):
         nonexistent_username = "nonexistent_user_999999"
@@ -0,0 +1,143 @@
+import argparse
+import itertools
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterator, List, Sequence, Tuple
+
+import faker
+
+from api.models import encode
+from utils.data_generators import (
+    fake,
+    generate_order_data,
+    generate_pet_data,
+    generate_user_data,
+    seeded,
+)
+from utils.datasets import DatasetWriter
+from utils.validators import ORDER_STATUSES, PET_STATUSES
+
+CHUNK_SIZE = 10000
+# Faker dates default to ending at "now", which would differ between builds
+SHIP_DATE_END = datetime(2026, 1, 1)
+
+Chunk = Tuple[int, str, int, int, int]
+
+
+def generate_pet(index: int, pets: int) -> Dict[str, Any]:
+    return generate_pet_data(pet_id=index + 1, status=fake.random_element(PET_STATUSES))
+
+
+def generate_user(index: int, pets: int) -> Dict[str, Any]:
+    return generate_user_data(user_id=index + 1, username=f"{fake.user_name()}_{index}")
+
+
+def generate_order(index: int, pets: int) -> Dict[str, Any]:
+    return generate_order_data(
+        order_id=index + 1,
+        pet_id=fake.random_int(min=1, max=max(pets, 1)),
+        quantity=fake.random_int(min=1, max=5),
+        ship_date=fake.iso8601(end_datetime=SHIP_DATE_END),
+        status=fake.random_element(ORDER_STATUSES),
+        complete=fake.boolean(),
+    )
+
+
+GENERATORS = {"pets": generate_pet, "users": generate_user, "orders": generate_order}
+
+
+def build_chunk(chunk: Chunk) -> List[bytes]:
+    seed, kind, start, stop, pets = chunk
+    generate = GENERATORS[kind]
+    with seeded(f"{seed}:{kind}:{start}"):
+        return [encode(generate(index, pets)) for index in range(start, stop)]
+
+
+def build_chunks(
+    executor: Executor, chunks: Sequence[Chunk], window: int
+) -> Iterator[List[bytes]]:
+    # Executor.map submits every chunk up front, and finished chunks would pile up in
+    # memory while the writer catches up; keep at most `window` chunks in flight
+    pending: Deque[Future] = deque()
+    for chunk in chunks:
+        if len(pending) >= window:
+            yield pending.popleft().result()
+        pending.append(executor.submit(build_chunk, chunk))
+    while pending:
+        yield pending.popleft().result()
+
+
+def build_dataset(
+    path: str, seed: int, counts: Dict[str, int], jobs: int = 1
+) -> Dict[str, int]:
+    meta = {"seed": seed, "counts": counts, "faker": faker.VERSION}
+    executor = ProcessPoolExecutor(jobs) if jobs > 1 else None
+    written = {}
+    try:
+        with DatasetWriter(path, meta) as writer:
+            for kind, count in counts.items():
+                chunks = [
+                    (
+                        seed,
+                        kind,
+                        start,
+                        min(start + CHUNK_SIZE, count),
+                        counts.get("pets", 0),
+                    )
+                    for start in range(0, count, CHUNK_SIZE)
+                ]
+                built = (
+                    build_chunks(executor, chunks, jobs * 2)
+                    if executor is not None
+                    else map(build_chunk, chunks)
+                )
+                records = itertools.chain.from_iterable(built)
+                written[kind] = writer.write_section(kind, records)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    return written
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m tools.build_dataset",
+        description="Generate a seeded corpus of pets, users and orders into "
+        "an indexed file that test runs memory-map",
+    )
+    parser.add_argument("output", help="Dataset file to write")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pets", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes; the output does not depend on it",
+    )
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    written = build_dataset(
+        args.output,
+        args.seed,
+        {"pets": args.pets, "users": args.users, "orders": args.orders},
+        args.jobs,
+    )
+    seconds = time.perf_counter() - started
+    size = os.path.getsize(args.output)
+    counts = ", ".join(f"{count} {kind}" for kind, count in written.items())
+    print(
+        f"Wrote {counts} to {args.output} "
+        f"({size / 1024 / 1024:.1f} MiB) in {seconds:.1f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+import argparse
+import heapq
+import html
+import json
+import sys
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from utils.stats import LatencyHistogram
+
+FAILED_OUTCOMES = ("failed", "error")
+
+
+def iter_records(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+class Summary:
+    def __init__(self, top: int):
+        self.top = top
+        self.sessions = 0
+        self.tests = 0
+        self.duration = 0.0
+        self.outcomes: Dict[str, int] = {}
+        self.slowest: List[Tuple[float, str]] = []
+        self.endpoints: Dict[str, LatencyHistogram] = {}
+        self.errors: Dict[str, int] = {}
+
+    def add(self, record: Dict[str, Any]) -> None:
+        kind = record.get("type")
+        if kind == "session":
+            self.sessions += 1
+        if kind != "test":
+            return
+
+        self.tests += 1
+        self.duration += record["duration"]
+        outcome = record["outcome"]
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+
+        entry = (record["duration"], record["nodeid"])
+        if len(self.slowest) < self.top:
+            heapq.heappush(self.slowest, entry)
+        elif entry > self.slowest[0]:
+            heapq.heapreplace(self.slowest, entry)
+
+        for request in record.get("requests", ()):
+            endpoint = request["endpoint"]
+            histogram = self.endpoints.get(endpoint)
+            if histogram is None:
+                histogram = self.endpoints[endpoint] = LatencyHistogram()
+            histogram.add(request["ms"] / 1000)
+            status = request.get("status")
+            if status is None or status >= 500:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def slowest_tests(self) -> List[Tuple[float, str]]:
+        return sorted(self.slowest, reverse=True)
+
+    @property
+    def failed(self) -> int:
+        return sum(self.outcomes.get(outcome, 0) for outcome in FAILED_OUTCOMES)
+
+
+def print_summary(path: str, top: int, out: TextIO) -> int:
+    summary = Summary(top)
+    for record in iter_records(path):
+        summary.add(record)
+        if record.get("type") == "test" and record["outcome"] in FAILED_OUTCOMES:
+            out.write(f"{record['outcome'].upper():<7} {record['nodeid']}\n")
+
+    out.write(
+        f"{summary.tests} tests in {summary.sessions} sessions, "
+        f"{summary.duration:.1f}s of test time: "
+        + ", ".join(
+            f"{count} {outcome}" for outcome, count in sorted(summary.outcomes.items())
+        )
+        + "\n"
+    )
+    out.write(f"slowest {len(summary.slowest)} tests:\n")
+    for duration, nodeid in summary.slowest_tests():
+        out.write(f"  {duration:>8.3f}s  {nodeid}\n")
+    out.write("endpoints:\n")
+    for endpoint, histogram in sorted(summary.endpoints.items()):
+        stats = histogram.summary()
+        out.write(
+            f"  {endpoint:<40} n={stats['count']:<6} p50={stats['p50'] * 1000:.1f}ms "
+            f"p90={stats['p90'] * 1000:.1f}ms p99={stats['p99'] * 1000:.1f}ms "
+            f"errors={summary.errors.get(endpoint, 0)}\n"
+        )
+    return 1 if summary.failed else 0
+
+
+HTML_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: sans-serif; margin: 1em 2em; display: flex; flex-direction: column; }}
+#summary {{ order: -1; }}
+table {{ border-collapse: collapse; margin-bottom: 1em; }}
+td, th {{ border: 1px solid #ccc; padding: 2px 6px; text-align: left; font-size: 13px; }}
+td.num {{ text-align: right; }}
+tr.passed td.outcome {{ color: #2a7d2a; }}
+tr.failed td.outcome, tr.error td.outcome {{ color: #b00020; font-weight: bold; }}
+tr.skipped td.outcome {{ color: #8a6d00; }}
+pre {{ white-space: pre-wrap; font-size: 12px; background: #f6f6f6; padding: 6px; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<section id="tests">
+<h2>Tests</h2>
+<table>
+<tr><th>outcome</th><th>test</th><th>duration, s</th><th>requests</th><th>details</th></tr>
+"""
+
+
+def _cell(value: Any, css: Optional[str] = None) -> str:
+    attribute = f' class="{css}"' if css else ""
+    return f"<td{attribute}>{html.escape(str(value))}</td>"
+
+
+def _details(record: Dict[str, Any], with_requests: bool) -> str:
+    parts = []
+    for key in ("longrepr", "log"):
+        if record.get(key):
+            parts.append(f"<pre>{html.escape(record[key])}</pre>")
+    requests = record.get("requests", ()) if with_requests else ()
+    if requests:
+        rows = "".join(
+            "<tr>"
+            + _cell(request["endpoint"])
+            + _cell(request.get("status"))
+            + _cell(request["ms"], "num")
+            + "</tr>"
+            for request in requests
+        )
+        parts.append(
+            f"<table><tr><th>endpoint</th><th>status</th><th>ms</th></tr>{rows}</table>"
+        )
+    if not parts:
+        return ""
+    label = record.get("phase") or "requests"
+    return f"<details><summary>{label}</summary>{''.join(parts)}</details>"
+
+
+def write_html(
+    path: str,
+    output: str,
+    top: int = 20,
+    failures_only: bool = False,
+    with_requests: bool = True,
+    title: str = "Petstore API tests",
+) -> int:
+    summary = Summary(top)
+    with open(output, "w", encoding="utf-8") as out:
+        out.write(HTML_HEAD.format(title=html.escape(title)))
+        for record in iter_records(path):
+            summary.add(record)
+            if record.get("type") != "test":
+                continue
+            if failures_only and record["outcome"] == "passed":
+                continue
+            out.write(
+                f'<tr class="{html.escape(record["outcome"])}">'
+                + _cell(record["outcome"], "outcome")
+                + _cell(record["nodeid"])
+                + _cell(f"{record['duration']:.3f}", "num")
+                + _cell(record.get("request_count", 0), "num")
+                + f"<td>{_details(record, with_requests)}</td>"
+                + "</tr>\n"
+            )
+        out.write("</table>\n</section>\n")
+
+        out.write('<section id="summary">\n<h2>Summary</h2>\n<p>')
+        out.write(
+            html.escape(
+                f"{summary.tests} tests in {summary.sessions} sessions, "
+                f"{summary.duration:.1f}s of test time: "
+                + ", ".join(
+                    f"{count} {outcome}"
+                    for outcome, count in sorted(summary.outcomes.items())
+                )
+            )
+        )
+        out.write("</p>\n<h3>Slowest tests</h3>\n<table>\n")
+        out.write("<tr><th>duration, s</th><th>test</th></tr>\n")
+        for duration, nodeid in summary.slowest_tests():
+            out.write(f"<tr>{_cell(f'{duration:.3f}', 'num')}{_cell(nodeid)}</tr>\n")
+        out.write("</table>\n<h3>Endpoints</h3>\n<table>\n")
+        out.write(
+            "<tr><th>endpoint</th><th>requests</th><th>p50, ms</th><th>p90, ms</th>"
+            "<th>p99, ms</th><th>max, ms</th><th>errors</th></tr>\n"
+        )
+        for endpoint, histogram in sorted(summary.endpoints.items()):
+            stats = histogram.summary()
+            out.write(
+                "<tr>"
+                + _cell(endpoint)
+                + _cell(stats["count"], "num")
+                + "".join(
+                    _cell(f"{stats[key] * 1000:.1f}", "num")
+                    for key in ("p50", "p90", "p99", "max")
+                )
+                + _cell(summary.errors.get(endpoint, 0), "num")
+                + "</tr>\n"
+            )
+        out.write("</table>\n</section>\n</body>\n</html>\n")
+    return 1 if summary.failed else 0
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m tools.results_report",
+        description="Build summaries and HTML from a --results-jsonl file in one pass",
+    )
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "--exit-zero",
+        action="store_true",
+        help="Exit with 0 even if the results contain failed tests",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    summary_parser = subparsers.add_parser(
+        "summary", parents=[common], help="Print a text summary"
+    )
+    summary_parser.add_argument("path")
+    summary_parser.add_argument("--top", type=int, default=10)
+
+    html_parser = subparsers.add_parser(
+        "html", parents=[common], help="Write an HTML report"
+    )
+    html_parser.add_argument("path")
+    html_parser.add_argument("-o", "--output", default="report.html")
+    html_parser.add_argument("--top", type=int, default=20)
+    html_parser.add_argument(
+        "--failures-only",
+        action="store_true",
+        help="List only failed, errored and skipped tests",
+    )
+    html_parser.add_argument(
+        "--no-requests",
+        action="store_true",
+        help="Do not list the requests of each test",
+    )
+    html_parser.add_argument("--title", default="Petstore API tests")
+
+    args = parser.parse_args(argv)
+    if args.command == "summary":
+        exit_code = print_summary(args.path, args.top, sys.stdout)
+    else:
+        exit_code = write_html(
+            args.path,
+            args.output,
+            args.top,
+            args.failures_only,
+            not args.no_requests,
+            args.title,
+        )
+    return 0 if args.exit_zero else exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
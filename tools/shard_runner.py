@@ -0,0 +1,254 @@
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, List
+
+import pytest
+
+from plugins.sharding import DEFAULT_DURATIONS_PATH, assign_shards, load_durations
+from utils.stats import summarize
+
+RECORDED_OUTCOMES = ("passed", "failed")
+
+
+class _CollectedItems:
+    def __init__(self):
+        self.nodeids: List[str] = []
+
+    def pytest_collection_finish(self, session: pytest.Session) -> None:
+        self.nodeids = [item.nodeid for item in session.items]
+
+
+def collect_nodeids(pytest_args: List[str]) -> List[str]:
+    collector = _CollectedItems()
+    exit_code = pytest.main(
+        ["--collect-only", "-qq", "-p", "no:cacheprovider", *pytest_args],
+        plugins=[collector],
+    )
+    if exit_code not in (pytest.ExitCode.OK, pytest.ExitCode.NO_TESTS_COLLECTED):
+        raise SystemExit(f"Test collection failed with exit code {exit_code}")
+    return collector.nodeids
+
+
+def plan(args: argparse.Namespace) -> int:
+    nodeids = collect_nodeids(args.pytest_args)
+    durations = load_durations(args.durations)
+    assignment = assign_shards(nodeids, durations, args.nodes)
+
+    for shard in range(args.nodes):
+        shard_nodeids = sorted(n for n, s in assignment.items() if s == shard)
+        cost = sum(durations.get(nodeid, 0.0) for nodeid in shard_nodeids)
+        print(f"shard {shard}: {len(shard_nodeids)} tests, known cost {cost:.2f}s")
+        if args.verbose:
+            for nodeid in shard_nodeids:
+                print(f"    {nodeid}")
+    return 0
+
+
+def run_local(args: argparse.Namespace) -> int:
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    processes = []
+    for shard in range(args.nodes):
+        env = dict(os.environ, SHARD_INDEX=str(shard), SHARD_COUNT=str(args.nodes))
+        command = [
+            sys.executable,
+            "-m",
+            "pytest",
+            *args.pytest_args,
+            f"--shard-id={shard}",
+            f"--num-shards={args.nodes}",
+            f"--shard-durations={args.durations}",
+            f"--shard-results={os.path.join(args.output_dir, f'node-{shard}.json')}",
+            f"--junitxml={os.path.join(args.output_dir, f'node-{shard}.xml')}",
+            "-p",
+            "no:cacheprovider",
+        ]
+        log = open(os.path.join(args.output_dir, f"node-{shard}.log"), "w")
+        processes.append(
+            (shard, log, subprocess.Popen(command, env=env, stdout=log, stderr=log))
+        )
+
+    exit_codes = {}
+    for shard, log, process in processes:
+        exit_codes[shard] = process.wait()
+        log.close()
+        print(f"node {shard} finished with exit code {exit_codes[shard]}")
+
+    merge_code = merge_results([args.output_dir], args.output_dir, args.durations)
+    return max([merge_code, *exit_codes.values()])
+
+
+def merge_junit(paths: List[str], output: str) -> None:
+    merged = ET.Element("testsuites")
+    totals = {"tests": 0, "failures": 0, "errors": 0, "skipped": 0}
+    total_time = 0.0
+
+    for path in paths:
+        root = ET.parse(path).getroot()
+        suites = [root] if root.tag == "testsuite" else root.findall("testsuite")
+        for suite in suites:
+            suite.set("name", f"{suite.get('name', 'pytest')}@{os.path.basename(path)}")
+            for key in totals:
+                totals[key] += int(suite.get(key, 0))
+            total_time += float(suite.get("time", 0))
+            merged.append(suite)
+
+    for key, value in totals.items():
+        merged.set(key, str(value))
+    merged.set("time", f"{total_time:.3f}")
+    ET.ElementTree(merged).write(output, encoding="utf-8", xml_declaration=True)
+
+
+def update_durations(path: str, tests: Dict[str, Dict[str, Any]]) -> None:
+    durations = load_durations(path)
+    durations.update(
+        {
+            nodeid: round(result["duration"], 3)
+            for nodeid, result in tests.items()
+            if result["outcome"] in RECORDED_OUTCOMES
+        }
+    )
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(durations.items())), f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def merge_results(directories: List[str], output_dir: str, durations_path: str) -> int:
+    node_files = sorted(
+        path
+        for directory in directories
+        for path in glob.glob(
+            os.path.join(directory, "**", "node-*.json"), recursive=True
+        )
+    )
+    if not node_files:
+        print(f"No node-*.json results found in {', '.join(directories)}")
+        return 1
+
+    nodes = []
+    for path in node_files:
+        with open(path, encoding="utf-8") as f:
+            nodes.append(json.load(f))
+
+    tests: Dict[str, Dict[str, Any]] = {}
+    latency: Dict[str, List[float]] = {}
+    problems = []
+    for node in nodes:
+        for nodeid, result in node["tests"].items():
+            if nodeid in tests:
+                problems.append(f"{nodeid} ran on more than one node")
+            tests[nodeid] = dict(result, shard_id=node["shard_id"])
+        for endpoint, samples in node["latency"].items():
+            latency.setdefault(endpoint, []).extend(samples)
+
+    expected_shards = set(range(nodes[0]["num_shards"]))
+    missing = expected_shards - {node["shard_id"] for node in nodes}
+    if missing:
+        problems.append(f"missing results for shards {sorted(missing)}")
+
+    outcomes: Dict[str, int] = {}
+    for result in tests.values():
+        outcomes[result["outcome"]] = outcomes.get(result["outcome"], 0) + 1
+
+    merged = {
+        "nodes": [
+            {
+                "shard_id": node["shard_id"],
+                "hostname": node["hostname"],
+                "duration": node["duration"],
+                "tests": len(node["tests"]),
+            }
+            for node in sorted(nodes, key=lambda node: node["shard_id"])
+        ],
+        "outcomes": outcomes,
+        "problems": problems,
+        "latency": {
+            endpoint: summarize(samples)
+            for endpoint, samples in sorted(latency.items())
+        },
+        "tests": tests,
+    }
+
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, "merged.json"), "w", encoding="utf-8") as f:
+        json.dump(merged, f, indent=2)
+
+    junit_files = sorted(
+        path
+        for directory in directories
+        for path in glob.glob(
+            os.path.join(directory, "**", "node-*.xml"), recursive=True
+        )
+    )
+    if junit_files:
+        merge_junit(junit_files, os.path.join(output_dir, "junit.xml"))
+
+    update_durations(durations_path, tests)
+
+    for node in merged["nodes"]:
+        print(
+            f"shard {node['shard_id']} ({node['hostname']}): "
+            f"{node['tests']} tests in {node['duration']:.1f}s"
+        )
+    print(
+        ", ".join(f"{count} {outcome}" for outcome, count in sorted(outcomes.items()))
+    )
+    for endpoint, stats in merged["latency"].items():
+        print(
+            f"{endpoint:<40} n={stats['count']:<5} p50={stats['p50'] * 1000:.1f}ms "
+            f"p90={stats['p90'] * 1000:.1f}ms p99={stats['p99'] * 1000:.1f}ms"
+        )
+    for problem in problems:
+        print(f"WARNING: {problem}")
+
+    failed = outcomes.get("failed", 0) + outcomes.get("error", 0)
+    return 1 if failed or problems else 0
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m tools.shard_runner",
+        description="Split the suite into deterministic shards and merge node results",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    plan_parser = subparsers.add_parser("plan", help="Show the shard assignment")
+    plan_parser.add_argument("--nodes", type=int, required=True)
+    plan_parser.add_argument("--durations", default=DEFAULT_DURATIONS_PATH)
+    plan_parser.add_argument("-v", "--verbose", action="store_true")
+    plan_parser.add_argument("pytest_args", nargs=argparse.REMAINDER)
+
+    local_parser = subparsers.add_parser(
+        "local", help="Run every shard as a local process and merge the results"
+    )
+    local_parser.add_argument("--nodes", type=int, required=True)
+    local_parser.add_argument("--output-dir", default="shard_results")
+    local_parser.add_argument("--durations", default=DEFAULT_DURATIONS_PATH)
+    local_parser.add_argument("pytest_args", nargs=argparse.REMAINDER)
+
+    merge_parser = subparsers.add_parser(
+        "merge", help="Merge node-*.json and node-*.xml results from several nodes"
+    )
+    merge_parser.add_argument("directories", nargs="+")
+    merge_parser.add_argument("--output-dir", default="shard_results")
+    merge_parser.add_argument("--durations", default=DEFAULT_DURATIONS_PATH)
+
+    args = parser.parse_args(argv)
+    if getattr(args, "pytest_args", None) and args.pytest_args[0] == "--":
+        args.pytest_args = args.pytest_args[1:]
+
+    if args.command == "plan":
+        return plan(args)
+    if args.command == "local":
+        return run_local(args)
+    return merge_results(args.directories, args.output_dir, args.durations)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+import operator
+from itertools import repeat
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from utils.validators import ORDER_STATUSES, PET_STATUSES
+
+
+class _Missing:
+    pass
+
+
+_MISSING = _Missing()
+
+
+def _column(items: Sequence[Mapping[str, Any]], field: str) -> List[Any]:
+    return [item.get(field, _MISSING) for item in items]
+
+
+def _mask(values: map, count: int) -> np.ndarray:
+    return np.fromiter(values, dtype=bool, count=count)
+
+
+def _indices(mask: np.ndarray) -> List[int]:
+    return np.flatnonzero(mask).tolist()
+
+
+class _Column:
+    def __init__(self, items: Sequence[Mapping[str, Any]], field: str):
+        self.values = _column(items, field)
+        self.count = len(self.values)
+        self.kinds = set(map(type, self.values))
+
+    def missing(self) -> np.ndarray:
+        if _Missing not in self.kinds:
+            return np.zeros(self.count, dtype=bool)
+        return _mask(map(operator.is_, self.values, repeat(_MISSING)), self.count)
+
+    def present(self) -> np.ndarray:
+        return ~self.missing()
+
+    def wrong_type(self, expected_type: type, nullable: bool = False) -> np.ndarray:
+        allowed = {expected_type, _Missing, type(None)} if nullable else {expected_type}
+        if self.kinds <= allowed | {_Missing}:
+            return np.zeros(self.count, dtype=bool)
+        kinds = list(map(type, self.values))
+        mask = _mask(map(operator.is_not, kinds, repeat(expected_type)), self.count)
+        mask &= _mask(map(operator.is_not, kinds, repeat(_Missing)), self.count)
+        if nullable:
+            mask &= _mask(map(operator.is_not, kinds, repeat(type(None))), self.count)
+        return mask
+
+    def not_in(self, allowed: Sequence[Any]) -> np.ndarray:
+        allowed = set(allowed)
+        if self.kinds <= {str, _Missing} and set(self.values) - {_MISSING} <= allowed:
+            return np.zeros(self.count, dtype=bool)
+        hashable = self.kinds <= {str, int, float, bool, type(None), _Missing}
+        if hashable:
+            contained = _mask(map(allowed.__contains__, self.values), self.count)
+        else:
+            contained = _mask(
+                map(operator.contains, repeat(list(allowed)), self.values), self.count
+            )
+        return ~contained & self.present()
+
+    def not_equal(self, value: Any) -> np.ndarray:
+        if self.kinds <= {type(value), _Missing}:
+            if set(self.values) - {_MISSING} <= {value}:
+                return np.zeros(self.count, dtype=bool)
+        return (
+            _mask(map(operator.ne, self.values, repeat(value)), self.count)
+            & self.present()
+        )
+
+    def duplicates(self, expected_type: type = int) -> np.ndarray:
+        valid = _mask(
+            map(operator.is_, map(type, self.values), repeat(expected_type)),
+            self.count,
+        )
+        positions = np.flatnonzero(valid)
+        duplicated = np.zeros(self.count, dtype=bool)
+        if positions.size < 2:
+            return duplicated
+
+        values = (
+            [self.values[index] for index in positions]
+            if not valid.all()
+            else self.values
+        )
+        try:
+            array = np.array(values, dtype=np.int64 if expected_type is int else None)
+        except OverflowError:
+            array = np.array(values, dtype=object)
+
+        ordered = np.sort(array)
+        if not (ordered[1:] == ordered[:-1]).any():
+            return duplicated
+
+        order = np.argsort(array, kind="stable")
+        ordered = array[order]
+        repeated = ordered[1:] == ordered[:-1]
+
+        flags = np.zeros(positions.size, dtype=bool)
+        flags[1:] |= repeated
+        flags[:-1] |= repeated
+        duplicated[positions[order[flags]]] = True
+        return duplicated
+
+
+def find_entity_violations(
+    items: Sequence[Mapping[str, Any]],
+    types: Dict[str, type],
+    enums: Optional[Dict[str, Sequence[Any]]] = None,
+    required_fields: Optional[Sequence[str]] = None,
+    expected: Optional[Dict[str, Any]] = None,
+    unique_field: Optional[str] = "id",
+) -> Dict[str, List[int]]:
+    enums = enums or {}
+    expected = expected or {}
+    required_fields = list(types) if required_fields is None else list(required_fields)
+    fields = dict.fromkeys(
+        [
+            *required_fields,
+            *types,
+            *enums,
+            *expected,
+            *([unique_field] if unique_field else []),
+        ]
+    )
+    columns = {field: _Column(items, field) for field in fields}
+
+    violations: Dict[str, List[int]] = {}
+
+    def record(check: str, mask: np.ndarray) -> None:
+        indices = _indices(mask)
+        if indices:
+            violations[check] = indices
+
+    for field in required_fields:
+        record(f"missing '{field}'", columns[field].missing())
+
+    for field, expected_type in types.items():
+        record(
+            f"'{field}' is not {expected_type.__name__}",
+            columns[field].wrong_type(
+                expected_type, nullable=field not in required_fields
+            ),
+        )
+
+    for field, allowed in enums.items():
+        record(f"'{field}' not in {list(allowed)}", columns[field].not_in(allowed))
+
+    for field, value in expected.items():
+        record(f"'{field}' != {value!r}", columns[field].not_equal(value))
+
+    if unique_field is not None:
+        record(
+            f"duplicate '{unique_field}'",
+            columns[unique_field].duplicates(types.get(unique_field, int)),
+        )
+
+    return violations
+
+
+def _assert_no_violations(
+    kind: str, count: int, violations: Dict[str, List[int]]
+) -> bool:
+    assert not violations, f"{kind} validation failed for {count} items:\n" + "\n".join(
+        f"  {check}: indices {indices}" for check, indices in violations.items()
+    )
+    return True
+
+
+PET_TYPES = {"id": int, "name": str}
+
+
+def validate_pets_bulk(
+    pets: Sequence[Mapping[str, Any]],
+    expected_status: Optional[str] = None,
+    required_fields: Optional[Sequence[str]] = ("id", "name", "status"),
+    unique_ids: bool = True,
+    types: Optional[Dict[str, type]] = None,
+) -> bool:
+    assert isinstance(pets, list), f"Expected a list of pets, got {type(pets).__name__}"
+    violations = find_entity_violations(
+        pets,
+        types=PET_TYPES if types is None else types,
+        enums={"status": PET_STATUSES},
+        required_fields=required_fields,
+        expected={"status": expected_status} if expected_status is not None else None,
+        unique_field="id" if unique_ids else None,
+    )
+    return _assert_no_violations("Pet", len(pets), violations)
+
+
+def validate_orders_bulk(
+    orders: Sequence[Mapping[str, Any]], unique_ids: bool = True
+) -> bool:
+    assert isinstance(orders, list), (
+        f"Expected a list of orders, got {type(orders).__name__}"
+    )
+    violations = find_entity_violations(
+        orders,
+        types={"id": int, "petId": int, "quantity": int},
+        enums={"status": ORDER_STATUSES},
+        required_fields=["id", "petId", "quantity", "status"],
+        unique_field="id" if unique_ids else None,
+    )
+    return _assert_no_violations("Order", len(orders), violations)
+
+
+def validate_inventory_bulk(
+    inventory: Dict[str, Any], statuses: Optional[Sequence[str]] = None
+) -> bool:
+    assert isinstance(inventory, dict), (
+        f"Expected inventory dict, got {type(inventory).__name__}"
+    )
+    keys = [key for key in (statuses or inventory) if key in inventory]
+    counts = [inventory[key] for key in keys]
+
+    wrong_type = _mask(
+        map(operator.is_not, map(type, counts), repeat(int)), len(counts)
+    )
+    negative = np.zeros(len(counts), dtype=bool)
+    if not wrong_type.all():
+        integers = np.array(
+            [count for count in counts if type(count) is int], dtype=object
+        )
+        negative[~wrong_type] = integers < 0
+
+    invalid = [keys[index] for index in _indices(wrong_type | negative)]
+    assert not invalid, "Inventory counts must be non-negative integers: " + ", ".join(
+        f"{key}={inventory[key]!r}" for key in invalid
+    )
+    return True
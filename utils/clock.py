@@ -0,0 +1,92 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Generator
+
+
+class Clock:
+    def time(self) -> float:
+        return time.time()
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def perf_counter(self) -> float:
+        return time.perf_counter()
+
+    def sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+class VirtualClock(Clock):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._offset = 0.0
+        self.slept = 0.0
+        self.sleeps = 0
+
+    @property
+    def offset(self) -> float:
+        return self._offset
+
+    def time(self) -> float:
+        return time.time() + self._offset
+
+    def monotonic(self) -> float:
+        return time.monotonic() + self._offset
+
+    def perf_counter(self) -> float:
+        return time.perf_counter() + self._offset
+
+    def advance(self, seconds: float) -> None:
+        if seconds <= 0:
+            return
+        with self._lock:
+            self._offset += seconds
+
+    def sleep(self, seconds: float) -> None:
+        if seconds <= 0:
+            return
+        with self._lock:
+            self._offset += seconds
+            self.slept += seconds
+            self.sleeps += 1
+
+
+_clock: Clock = Clock()
+
+
+def get_clock() -> Clock:
+    return _clock
+
+
+def set_clock(clock: Clock) -> Clock:
+    global _clock
+    previous, _clock = _clock, clock
+    return previous
+
+
+@contextmanager
+def use_clock(clock: Clock) -> Generator[Clock, None, None]:
+    previous = set_clock(clock)
+    try:
+        yield clock
+    finally:
+        set_clock(previous)
+
+
+def now() -> float:
+    return _clock.time()
+
+
+def monotonic() -> float:
+    return _clock.monotonic()
+
+
+def perf_counter() -> float:
+    return _clock.perf_counter()
+
+
+def sleep(seconds: float) -> None:
+    _clock.sleep(seconds)
@@ -1,10 +1,38 @@
-from typing import Any, Dict, List
+import random
+from contextlib import contextmanager
+from typing import Any, Dict, Generator, List, Union
 
 from faker import Faker
 
+from api.models import Order, Pet, User
+from config.settings import Settings
+
 fake = Faker()
 
 
+@contextmanager
+def seeded(seed: Union[int, str]) -> Generator[None, None, None]:
+    previous = fake.random
+    fake.random = random.Random(seed)
+    try:
+        yield
+    finally:
+        fake.random = previous
+
+
+def generate_entity_id() -> int:
+    count = Settings.SHARD_COUNT
+    slot = fake.random_int(min=0, max=999999 // count - 1)
+    return slot * count + Settings.SHARD_INDEX + 1
+
+
+def generate_username() -> str:
+    username = fake.user_name()
+    if Settings.SHARD_COUNT > 1:
+        username = f"{username}_n{Settings.SHARD_INDEX}"
+    return username
+
+
 def generate_pet_data(
     pet_id: int = None,
     name: str = None,
@@ -15,7 +43,7 @@ def generate_pet_data(
     photo_urls: List[str] = None,
 ) -> Dict[str, Any]:
     if pet_id is None:
-        pet_id = fake.random_int(min=1, max=999999)
+        pet_id = generate_entity_id()
 
     if name is None:
         name = fake.first_name()
@@ -54,10 +82,10 @@ def generate_user_data(
     user_status: int = 0,
 ) -> Dict[str, Any]:
     if user_id is None:
-        user_id = fake.random_int(min=1, max=999999)
+        user_id = generate_entity_id()
 
     if username is None:
-        username = fake.user_name()
+        username = generate_username()
 
     if first_name is None:
         first_name = fake.first_name()
@@ -95,10 +123,10 @@ def generate_order_data(
     complete: bool = False,
 ) -> Dict[str, Any]:
     if order_id is None:
-        order_id = fake.random_int(min=1, max=999999)
+        order_id = generate_entity_id()
 
     if pet_id is None:
-        pet_id = fake.random_int(min=1, max=999999)
+        pet_id = generate_entity_id()
 
     if ship_date is None:
         ship_date = fake.iso8601()
@@ -114,4 +142,19 @@ def generate_order_data(
 
 
 def generate_users_list(count: int = 3) -> List[Dict[str, Any]]:
-    return [generate_user_data() for _ in range(count)]
+    return [
+        generate_user_data(username=f"{generate_username()}_{index}")
+        for index in range(count)
+    ]
+
+
+def generate_pet(**kwargs: Any) -> Pet:
+    return Pet.from_dict(generate_pet_data(**kwargs))
+
+
+def generate_user(**kwargs: Any) -> User:
+    return User.from_dict(generate_user_data(**kwargs))
+
+
+def generate_order(**kwargs: Any) -> Order:
+    return Order.from_dict(generate_order_data(**kwargs))
@@ -0,0 +1,150 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+MAGIC = b"PSDSET01"
+FORMAT_VERSION = 1
+
+_TRAILER = struct.Struct("<8sQ")
+_OFFSETS = struct.Struct("<2Q")
+
+
+class DatasetWriter:
+    def __init__(self, path: str, meta: Optional[Dict[str, Any]] = None):
+        self.path = path
+        self.meta = dict(meta or {})
+        self._tmp_path = f"{path}.tmp"
+        self._file = open(self._tmp_path, "wb")
+        self._sections: Dict[str, Dict[str, Any]] = {}
+
+    def write_section(self, kind: str, records: Iterable[bytes]) -> int:
+        if kind in self._sections:
+            raise ValueError(f"Section {kind!r} is already written")
+        data = self._file.tell()
+        offsets = array("Q", [0])
+        end = 0
+        for record in records:
+            self._file.write(record)
+            end += len(record)
+            offsets.append(end)
+        self._sections[kind] = {"data": data, "offsets": offsets}
+        return len(offsets) - 1
+
+    def close(self) -> None:
+        sections = {}
+        for kind, section in self._sections.items():
+            offsets = section["offsets"]
+            if sys.byteorder == "big":
+                offsets.byteswap()
+            sections[kind] = {
+                "count": len(offsets) - 1,
+                "data": section["data"],
+                "index": self._file.tell(),
+            }
+            offsets.tofile(self._file)
+
+        footer = self._file.tell()
+        header = {"version": FORMAT_VERSION, "meta": self.meta, "sections": sections}
+        self._file.write(json.dumps(header, separators=(",", ":")).encode("utf-8"))
+        self._file.write(_TRAILER.pack(MAGIC, footer))
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        self._file.close()
+        os.remove(self._tmp_path)
+
+    def __enter__(self) -> "DatasetWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class DatasetSection(Sequence):
+    def __init__(self, buffer: mmap.mmap, count: int, data: int, index: int):
+        self._buffer = buffer
+        self._count = count
+        self._data = data
+        self._index = index
+
+    def __len__(self) -> int:
+        return self._count
+
+    def raw(self, index: int) -> bytes:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("dataset index out of range")
+        start, end = _OFFSETS.unpack_from(self._buffer, self._index + index * 8)
+        return self._buffer[self._data + start : self._data + end]
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        return json.loads(self.raw(index))
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.iter()
+
+    def iter(
+        self, start: int = 0, stop: Optional[int] = None, step: int = 1
+    ) -> Iterator[Dict[str, Any]]:
+        for index in range(*slice(start, stop, step).indices(self._count)):
+            yield json.loads(self.raw(index))
+
+
+class Dataset:
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        size = len(self._buffer)
+        magic, footer = (None, 0)
+        if size >= _TRAILER.size:
+            magic, footer = _TRAILER.unpack_from(self._buffer, size - _TRAILER.size)
+        if magic != MAGIC or footer > size - _TRAILER.size:
+            self._buffer.close()
+            raise ValueError(f"{path} is not a dataset file or is truncated")
+
+        try:
+            header = json.loads(self._buffer[footer : size - _TRAILER.size])
+            version = header["version"]
+            if version == FORMAT_VERSION:
+                self.meta: Dict[str, Any] = header["meta"]
+                self.sections = {
+                    kind: DatasetSection(self._buffer, **section)
+                    for kind, section in header["sections"].items()
+                }
+        except Exception as e:
+            self._buffer.close()
+            raise ValueError(f"{path} has a corrupt dataset header") from e
+        if version != FORMAT_VERSION:
+            self._buffer.close()
+            raise ValueError(
+                f"{path} has dataset format version {version}, "
+                f"expected {FORMAT_VERSION}"
+            )
+
+    def __getitem__(self, kind: str) -> DatasetSection:
+        return self.sections[kind]
+
+    def __repr__(self) -> str:
+        counts = ", ".join(f"{kind}={len(s)}" for kind, s in self.sections.items())
+        return f"<Dataset {self.path} ({counts})>"
+
+    def close(self) -> None:
+        self._buffer.close()
+
+    def __enter__(self) -> "Dataset":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -0,0 +1,24 @@
+from typing import Any, Callable, Dict, List
+
+_subscribers: Dict[str, List[Callable[..., None]]] = {}
+
+
+def subscribe(event: str, callback: Callable[..., None]) -> None:
+    _subscribers.setdefault(event, []).append(callback)
+
+
+def unsubscribe(event: str, callback: Callable[..., None]) -> None:
+    callbacks = _subscribers.get(event, [])
+    if callback in callbacks:
+        callbacks.remove(callback)
+    if not callbacks:
+        _subscribers.pop(event, None)
+
+
+def has_subscribers(event: str) -> bool:
+    return event in _subscribers
+
+
+def emit(event: str, **payload: Any) -> None:
+    for callback in tuple(_subscribers.get(event, ())):
+        callback(**payload)
@@ -0,0 +1,182 @@
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from api.client import APIClient
+from utils import hooks
+from utils.logger import logger
+from utils.retries import retry_until_condition
+
+
+class InventoryOracle:
+    def __init__(self, store_client: APIClient, pet_client: APIClient):
+        self.store_client = store_client
+        self.pet_client = pet_client
+        self._lock = threading.Lock()
+        self._baseline: Dict[str, int] = {}
+        self._delta: Dict[str, int] = {}
+        self._pets: Dict[int, Optional[str]] = {}
+
+    def start(self) -> None:
+        self.reset()
+        hooks.subscribe("request_start", self.on_request_start)
+        hooks.subscribe("request", self.on_request)
+
+    def stop(self) -> None:
+        hooks.unsubscribe("request_start", self.on_request_start)
+        hooks.unsubscribe("request", self.on_request)
+
+    def reset(self) -> Dict[str, int]:
+        inventory = self.fetch()
+        with self._lock:
+            self._baseline = dict(inventory)
+            self._delta = {}
+            self._pets = {}
+        return inventory
+
+    def fetch(self) -> Dict[str, int]:
+        return self.store_client.get("/inventory", expected_status=200).json()
+
+    def on_request_start(
+        self,
+        method: str,
+        url: str,
+        endpoint: str,
+        json_data: Any = None,
+        data: Any = None,
+        **_: Any,
+    ) -> None:
+        pet_id = self._written_pet_id(method, url, endpoint, json_data, data)
+        if pet_id is None:
+            return
+        with self._lock:
+            if pet_id in self._pets:
+                return
+        status = self.lookup_status(pet_id)
+        with self._lock:
+            self._pets.setdefault(pet_id, status)
+
+    def on_request(
+        self,
+        method: str,
+        url: str,
+        endpoint: str,
+        status_code: Optional[int],
+        json_data: Any = None,
+        data: Any = None,
+        response: Optional[requests.Response] = None,
+        **_: Any,
+    ) -> None:
+        if status_code != 200:
+            return
+
+        if endpoint == "/pet" and method in ("POST", "PUT"):
+            pet = self._response_json(response) or json_data
+            if isinstance(pet, Mapping) and isinstance(pet.get("id"), int):
+                self.record_upsert(pet["id"], pet.get("status"))
+        elif endpoint == "/pet/{id}":
+            pet_id = self._url_pet_id(url)
+            if method == "DELETE":
+                self.record_delete(pet_id)
+            elif method == "POST" and isinstance(data, Mapping) and "status" in data:
+                self.record_status_change(pet_id, data["status"])
+
+    def lookup_status(self, pet_id: int) -> Optional[str]:
+        try:
+            response = self.pet_client.get(f"/{pet_id}", expected_status=None)
+        except requests.RequestException as e:
+            logger.warning(f"Inventory oracle could not read pet {pet_id}: {str(e)}")
+            return None
+        if response.status_code != 200:
+            return None
+        pet = self._response_json(response)
+        return pet.get("status") if isinstance(pet, Mapping) else None
+
+    @classmethod
+    def _written_pet_id(
+        cls, method: str, url: str, endpoint: str, json_data: Any, data: Any
+    ) -> Optional[int]:
+        if endpoint == "/pet" and method in ("POST", "PUT"):
+            if isinstance(json_data, Mapping) and isinstance(json_data.get("id"), int):
+                return json_data["id"]
+        elif endpoint == "/pet/{id}":
+            if method == "DELETE" or (
+                method == "POST" and isinstance(data, Mapping) and "status" in data
+            ):
+                return cls._url_pet_id(url)
+        return None
+
+    @staticmethod
+    def _url_pet_id(url: str) -> int:
+        return int(urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1])
+
+    @staticmethod
+    def _response_json(response: Optional[requests.Response]) -> Any:
+        if response is None:
+            return None
+        try:
+            return response.json()
+        except ValueError:
+            return None
+
+    def _move(self, pet_id: int, status: Optional[str]) -> None:
+        previous = self._pets.get(pet_id)
+        if previous is not None:
+            self._delta[previous] = self._delta.get(previous, 0) - 1
+        if status is not None:
+            self._delta[status] = self._delta.get(status, 0) + 1
+        self._pets[pet_id] = status
+
+    def record_upsert(self, pet_id: int, status: Optional[str]) -> None:
+        with self._lock:
+            self._move(pet_id, status)
+
+    def record_status_change(self, pet_id: int, status: str) -> None:
+        with self._lock:
+            self._move(pet_id, status)
+
+    def record_delete(self, pet_id: int) -> None:
+        with self._lock:
+            self._move(pet_id, None)
+
+    def touched_statuses(self) -> List[str]:
+        with self._lock:
+            return list(self._delta)
+
+    def expected(self, statuses: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        with self._lock:
+            statuses = list(self._delta) if statuses is None else list(statuses)
+            return {
+                status: self._baseline.get(status, 0) + self._delta.get(status, 0)
+                for status in statuses
+            }
+
+    def matches(
+        self,
+        inventory: Dict[str, int],
+        statuses: Optional[Iterable[str]] = None,
+        tolerance: int = 0,
+    ) -> bool:
+        return all(
+            abs(inventory.get(status, 0) - count) <= tolerance
+            for status, count in self.expected(statuses).items()
+        )
+
+    def check(
+        self,
+        statuses: Optional[Iterable[str]] = None,
+        tolerance: int = 0,
+        max_retries: Optional[int] = None,
+    ) -> Dict[str, int]:
+        statuses = self.touched_statuses() if statuses is None else list(statuses)
+        return retry_until_condition(
+            operation=self.fetch,
+            condition=lambda inventory: self.matches(inventory, statuses, tolerance),
+            max_retries=max_retries,
+            error_message=(
+                f"Inventory does not match tracked writes, expected {self.expected(statuses)}"
+            ),
+        )
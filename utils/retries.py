@@ -1,10 +1,16 @@
-import time
 from typing import Any, Callable, Optional
 
 from config.settings import Settings
+from utils import clock, hooks, tracing
 from utils.logger import logger
 
 
+def _wait(delay: float) -> None:
+    started = clock.perf_counter()
+    clock.sleep(delay)
+    hooks.emit("retry_wait", source="polling", seconds=clock.perf_counter() - started)
+
+
 def retry_until_condition(
     operation: Callable[[], Any],
     condition: Callable[[Any], bool],
@@ -21,10 +27,15 @@ def retry_until_condition(
 
     for attempt in range(1, max_retries + 1):
         try:
-            result = operation()
-            last_result = result
+            with tracing.span(
+                "retry_until_condition", attempt=attempt, max_retries=max_retries
+            ) as span:
+                result = operation()
+                last_result = result
+                met = condition(result)
+                span.set("condition_met", met)
 
-            if condition(result):
+            if met:
                 if attempt > 1:
                     logger.info(f"Condition met on attempt {attempt}")
                 return result
@@ -33,7 +44,7 @@ def retry_until_condition(
                     logger.debug(
                         f"Condition not met on attempt {attempt}/{max_retries}, retrying in {delay}s..."
                     )
-                    time.sleep(delay)
+                    _wait(delay)
                 else:
                     logger.warning(f"Condition not met after {max_retries} attempts")
 
@@ -43,7 +54,7 @@ def retry_until_condition(
                 logger.debug(
                     f"Operation failed on attempt {attempt}/{max_retries}: {str(e)}, retrying in {delay}s..."
                 )
-                time.sleep(delay)
+                _wait(delay)
             else:
                 logger.error(f"Operation failed after {max_retries} attempts: {str(e)}")
 
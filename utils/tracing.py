@@ -0,0 +1,226 @@
+import json
+import os
+import queue
+import random
+import threading
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils import clock
+
+_ids = random.Random()
+_current: ContextVar[Optional["Span"]] = ContextVar("span", default=None)
+
+
+class Span:
+    __slots__ = (
+        "tracer",
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "attributes",
+        "started",
+        "thread",
+        "_token",
+    )
+    recording = True
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        parent: Optional["Span"],
+        attributes: Dict[str, Any],
+    ):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = parent.trace_id if parent else _ids.getrandbits(128)
+        self.span_id = _ids.getrandbits(64)
+        self.parent_id = parent.span_id if parent else 0
+        self.attributes = attributes
+        self.started = 0.0
+        self.thread = 0
+        self._token = None
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id:032x}-{self.span_id:016x}-01"
+
+    @property
+    def trace_hex(self) -> str:
+        return f"{self.trace_id:032x}"
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def update(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def start(self) -> "Span":
+        self.thread = threading.get_native_id()
+        self._token = _current.set(self)
+        self.started = clock.perf_counter()
+        return self
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        finished = clock.perf_counter()
+        if error is not None:
+            self.attributes["error"] = type(error).__name__
+        if self._token is not None:
+            _current.reset(self._token)
+            self._token = None
+        self.tracer.record(self, finished)
+
+    def __enter__(self) -> "Span":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.finish(exc)
+
+
+class _NoopSpan:
+    __slots__ = ()
+    recording = False
+    traceparent = None
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def update(self, **attributes: Any) -> None:
+        pass
+
+    def start(self) -> "_NoopSpan":
+        return self
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    def __init__(self, path: str, buffer_size: int = 1024):
+        self.path = path
+        self.buffer_size = buffer_size
+        self.root: Optional[Span] = None
+        self.spans = 0
+        self._pid = os.getpid()
+        self._buffer: List[Tuple[Span, float]] = []
+        self._lock = threading.Lock()
+        self._batches: "queue.SimpleQueue[Optional[List[Tuple[Span, float]]]]" = (
+            queue.SimpleQueue()
+        )
+        self._writer = threading.Thread(
+            target=self._write, name="trace-writer", daemon=True
+        )
+        self._writer.start()
+
+    def new_span(
+        self, name: str, attributes: Dict[str, Any], root: bool = False
+    ) -> Span:
+        parent = None if root else (_current.get() or self.root)
+        return Span(self, name, parent, attributes)
+
+    def record(self, span: Span, finished: float) -> None:
+        with self._lock:
+            self.spans += 1
+            self._buffer.append((span, finished))
+            if len(self._buffer) < self.buffer_size:
+                return
+            batch, self._buffer = self._buffer, []
+        self._batches.put(batch)
+
+    def close(self) -> None:
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if batch:
+            self._batches.put(batch)
+        self._batches.put(None)
+        self._writer.join()
+
+    def _event(self, span: Span, finished: float) -> Dict[str, Any]:
+        args = {
+            "trace_id": f"{span.trace_id:032x}",
+            "span_id": f"{span.span_id:016x}",
+            "parent_id": f"{span.parent_id:016x}" if span.parent_id else None,
+        }
+        args.update(span.attributes)
+        return {
+            "name": span.name,
+            "ph": "X",
+            "ts": round(span.started * 1e6, 3),
+            "dur": round((finished - span.started) * 1e6, 3),
+            "pid": self._pid,
+            "tid": span.thread,
+            "args": args,
+        }
+
+    def _write(self) -> None:
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write('{"displayTimeUnit":"ms","traceEvents":[\n')
+            f.write(
+                json.dumps(
+                    {
+                        "name": "process_name",
+                        "ph": "M",
+                        "pid": self._pid,
+                        "args": {"name": "petstore-tests"},
+                    }
+                )
+            )
+            while True:
+                batch = self._batches.get()
+                if batch is None:
+                    break
+                for span, finished in batch:
+                    f.write(",\n")
+                    f.write(json.dumps(self._event(span, finished), default=str))
+            f.write("\n]}\n")
+
+
+_tracer: Optional[Tracer] = None
+
+
+def enable(path: str, buffer_size: int = 1024) -> Tracer:
+    global _tracer
+    disable()
+    _tracer = Tracer(path, buffer_size)
+    return _tracer
+
+
+def disable() -> Optional[Tracer]:
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is not None:
+        tracer.close()
+    return tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
+
+
+def span(name: str, **attributes: Any):
+    tracer = _tracer
+    if tracer is None:
+        return NOOP_SPAN
+    return tracer.new_span(name, attributes)
+
+
+def start_span(name: str, **attributes: Any):
+    tracer = _tracer
+    if tracer is None:
+        return NOOP_SPAN
+    return tracer.new_span(name, attributes).start()
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
@@ -1,7 +1,10 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, List, Mapping, Optional
 
 import requests
 
+PET_STATUSES = ["available", "pending", "sold"]
+ORDER_STATUSES = ["placed", "approved", "delivered"]
+
 
 def validate_status_code(response: requests.Response, expected_code: int) -> bool:
     assert response.status_code == expected_code, (
@@ -19,7 +22,9 @@ def validate_response_time(response: requests.Response, max_time: float = 5.0) -
     return True
 
 
-def validate_json_structure(data: Dict[str, Any], required_fields: List[str]) -> bool:
+def validate_json_structure(
+    data: Mapping[str, Any], required_fields: List[str]
+) -> bool:
     missing_fields = [field for field in required_fields if field not in data]
     assert not missing_fields, (
         f"Missing required fields: {', '.join(missing_fields)}. "
@@ -28,20 +33,18 @@ def validate_json_structure(data: Dict[str, Any], required_fields: List[str]) ->
     return True
 
 
-def validate_pet_data(pet_data: Dict[str, Any]) -> bool:
+def validate_pet_data(pet_data: Mapping[str, Any]) -> bool:
     required_fields = ["id", "name", "status"]
     validate_json_structure(pet_data, required_fields)
 
     assert isinstance(pet_data["id"], int), "Pet ID must be an integer"
     assert isinstance(pet_data["name"], str), "Pet name must be a string"
-    assert pet_data["status"] in ["available", "pending", "sold"], (
-        f"Invalid status: {pet_data['status']}"
-    )
+    assert pet_data["status"] in PET_STATUSES, f"Invalid status: {pet_data['status']}"
 
     return True
 
 
-def validate_user_data(user_data: Dict[str, Any]) -> bool:
+def validate_user_data(user_data: Mapping[str, Any]) -> bool:
     required_fields = ["id", "username"]
     validate_json_structure(user_data, required_fields)
 
@@ -51,14 +54,14 @@ def validate_user_data(user_data: Dict[str, Any]) -> bool:
     return True
 
 
-def validate_order_data(order_data: Dict[str, Any]) -> bool:
+def validate_order_data(order_data: Mapping[str, Any]) -> bool:
     required_fields = ["id", "petId", "quantity", "status"]
     validate_json_structure(order_data, required_fields)
 
     assert isinstance(order_data["id"], int), "Order ID must be an integer"
     assert isinstance(order_data["petId"], int), "Pet ID must be an integer"
     assert isinstance(order_data["quantity"], int), "Quantity must be an integer"
-    assert order_data["status"] in ["placed", "approved", "delivered"], (
+    assert order_data["status"] in ORDER_STATUSES, (
         f"Invalid order status: {order_data['status']}"
     )
 